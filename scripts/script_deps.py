@@ -11,20 +11,30 @@
 
 from __future__ import annotations
 
+import http.client
 import json
 import os
 import re
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal, Self
 from urllib.error import HTTPError, URLError
 from urllib.parse import quote
-from urllib.request import urlopen
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
 
 from packaging.requirements import InvalidRequirement, Requirement
-from packaging.utils import canonicalize_name
+from packaging.utils import (
+    InvalidSdistFilename,
+    InvalidWheelFilename,
+    canonicalize_name,
+    parse_sdist_filename,
+    parse_wheel_filename,
+)
 from packaging.version import InvalidVersion, Version
 from rich.console import Console
 from rich.table import Table
@@ -33,7 +43,15 @@ import typer
 console = Console()
 app = typer.Typer(add_completion=False, no_args_is_help=False)
 
-SCRIPT_BLOCK_RE = re.compile(r"(?m)^# /// script\s*\n(?P<body>(?:#.*\n)*?)^# ///\s*$")
+SCRIPT_BLOCK_START_RE = re.compile(r"^# /// script\s*$")
+SCRIPT_BLOCK_END_RE = re.compile(r"^# ///\s*$")
+PYPI_HOST = "pypi.org"
+DEFAULT_LOOKUP_WORKERS = 8
+DEFAULT_CACHE_TTL = 3600.0
+DEFAULT_UPGRADE_WORKERS = 4
+SIMPLE_API_CONTENT_TYPE = "application/vnd.pypi.simple.v1+json"
+
+IndexApi = Literal["json", "simple"]
 
 
 @dataclass(frozen=True)
@@ -72,31 +90,100 @@ class UpgradeAction:
     requirement: str
 
 
+@dataclass(frozen=True)
+class UpgradeResult:
+    path: Path
+    command: list[str]
+    returncode: int
+    output: str
+    duration: float
+
+
 def read_script_metadata(path: Path) -> dict[str, Any] | None:
-    """读取 PEP 723 script metadata。"""
+    """读取 PEP 723 script metadata；只扫描文件开头的注释区，遇到代码即停止。"""
+    body: list[str] = []
+    in_block = False
     try:
-        text = path.read_text(encoding="utf-8")
+        with path.open(encoding="utf-8") as file:
+            for raw_line in file:
+                line = raw_line.rstrip("\r\n")
+                if not in_block:
+                    if SCRIPT_BLOCK_START_RE.match(line):
+                        in_block = True
+                    elif line.strip() and not line.startswith("#"):
+                        return None
+                    continue
+                if SCRIPT_BLOCK_END_RE.match(line):
+                    break
+                if not line.startswith("#"):
+                    return None
+                body.append(line[2:] if line.startswith("# ") else line[1:])
+            else:
+                return None
     except UnicodeDecodeError:
         return None
 
-    match = SCRIPT_BLOCK_RE.search(text)
-    if match is None:
-        return None
-
-    body = []
-    for line in match.group("body").splitlines():
-        if line.startswith("# "):
-            body.append(line[2:])
-        elif line.startswith("#"):
-            body.append(line[1:])
-        else:
-            body.append(line)
-
     import tomllib
 
     return tomllib.loads("\n".join(body))
 
 
+class ScanIndex:
+    """按路径、mtime 与 size 缓存每个文件解析出的 dependencies，跳过未变化的文件。"""
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._seen: set[str] = set()
+        if path is None:
+            return
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and isinstance(data.get("files"), dict):
+            self._entries = data["files"]
+
+    def dependencies(self, path: Path) -> list[str] | None:
+        """返回文件声明的 dependencies；没有 script 块时返回 None。"""
+        key = str(path)
+        self._seen.add(key)
+        stat = path.stat()
+        entry = self._entries.get(key)
+        if (
+            isinstance(entry, dict)
+            and entry.get("mtime_ns") == stat.st_mtime_ns
+            and entry.get("size") == stat.st_size
+        ):
+            return entry.get("dependencies")
+
+        metadata = read_script_metadata(path)
+        dependencies = (
+            None if metadata is None else list(metadata.get("dependencies", []))
+        )
+        self._entries[key] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "dependencies": dependencies,
+        }
+        return dependencies
+
+    def save(self, root: Path) -> None:
+        """写回索引；同一 root 下本次未出现的文件视为已删除并移除。"""
+        if self.path is None:
+            return
+        prefix = f"{root}{os.sep}"
+        entries = {
+            key: value
+            for key, value in self._entries.items()
+            if key in self._seen or not key.startswith(prefix)
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps({"files": entries}, sort_keys=True), "utf-8")
+        temp_path.replace(self.path)
+
+
 def list_python_files(root: Path) -> list[Path]:
     """优先扫描 Git 跟踪文件，避免虚拟环境和缓存目录。"""
     try:
@@ -119,17 +206,20 @@ def list_python_files(root: Path) -> list[Path]:
     return sorted(root / line for line in result.stdout.splitlines() if line)
 
 
-def collect_dependencies(root: Path) -> tuple[dict[str, PackageReport], list[str]]:
+def collect_dependencies(
+    root: Path, index: ScanIndex | None = None
+) -> tuple[dict[str, PackageReport], list[str]]:
     """收集所有 uv script 依赖声明。"""
     reports: dict[str, PackageReport] = {}
     errors: list[str] = []
+    index = index or ScanIndex(None)
 
     for path in list_python_files(root):
-        metadata = read_script_metadata(path)
-        if metadata is None:
+        dependencies = index.dependencies(path)
+        if dependencies is None:
             continue
 
-        for raw in metadata.get("dependencies", []):
+        for raw in dependencies:
             rel_path = path.relative_to(root)
             try:
                 requirement = Requirement(raw)
@@ -150,19 +240,215 @@ def collect_dependencies(root: Path) -> tuple[dict[str, PackageReport], list[str
     return reports, errors
 
 
-def fetch_latest_version(package: str, timeout: float) -> tuple[str | None, str | None]:
-    """从 PyPI JSON API 读取最新版本。"""
-    url = f"https://pypi.org/pypi/{quote(package)}/json"
+class PyPIConnectionPool:
+    """每个工作线程复用一条到 PyPI 的 keep-alive HTTPS 连接。"""
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections: list[http.client.HTTPSConnection] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _connection(self, *, fresh: bool = False) -> http.client.HTTPSConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and not fresh:
+            return connection
+        if connection is not None:
+            connection.close()
+        connection = http.client.HTTPSConnection(PYPI_HOST, timeout=self.timeout)
+        self._local.connection = connection
+        with self._lock:
+            self._connections.append(connection)
+        return connection
+
+    def get(
+        self, path: str, headers: dict[str, str]
+    ) -> tuple[int, http.client.HTTPMessage, bytes]:
+        """GET 一个 PyPI 路径；200/304 以外的状态抛出 HTTPError。"""
+        headers = {"User-Agent": "script-deps", **headers}
+        if getproxies().get("https") and not proxy_bypass(PYPI_HOST):
+            return self._get_via_proxy(path, headers)
+        try:
+            connection = self._connection()
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+        except (http.client.HTTPException, ConnectionError):
+            # 空闲的 keep-alive 连接可能已被服务端关闭，换新连接重试一次。
+            connection = self._connection(fresh=True)
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+
+        body = response.read()
+        if response.will_close:
+            connection.close()
+        if response.status not in {200, 304}:
+            raise HTTPError(
+                f"https://{PYPI_HOST}{path}",
+                response.status,
+                response.reason,
+                response.headers,
+                None,
+            )
+        return response.status, response.headers, body
+
+    def _get_via_proxy(
+        self, path: str, headers: dict[str, str]
+    ) -> tuple[int, http.client.HTTPMessage, bytes]:
+        """配置了代理时交给 urllib 处理，放弃连接复用。"""
+        request = Request(f"https://{PYPI_HOST}{path}", headers=headers)
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return response.status, response.headers, response.read()
+        except HTTPError as exc:
+            if exc.code == 304:
+                return exc.code, exc.headers, b""
+            raise
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+
+
+class VersionCache:
+    """按包名缓存 PyPI 最新版本与 ETag，落盘为 JSON。"""
+
+    def __init__(self, path: Path, ttl: float) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        self._entries: dict[str, dict[str, Any]] = (
+            data.get("packages", {}) if isinstance(data, dict) else {}
+        )
+
+    def lookup(self, package: str, api: IndexApi) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(f"{api}:{package}")
+        return dict(entry) if isinstance(entry, dict) else None
+
+    def is_fresh(self, entry: dict[str, Any]) -> bool:
+        fetched_at = entry.get("fetched_at")
+        return (
+            isinstance(fetched_at, (int, float)) and time.time() - fetched_at < self.ttl
+        )
+
+    def store(self, package: str, api: IndexApi, latest: str, etag: str | None) -> None:
+        with self._lock:
+            self._entries[f"{api}:{package}"] = {
+                "latest": latest,
+                "etag": etag,
+                "fetched_at": time.time(),
+            }
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"packages": self._entries}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(payload, indent=2, sort_keys=True), "utf-8")
+        temp_path.replace(self.path)
+
+
+def default_cache_dir() -> Path:
+    cache_root = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_root) / "script-deps"
+
+
+def latest_from_json_api(payload: dict[str, Any]) -> str | None:
+    version = payload.get("info", {}).get("version")
+    return version if isinstance(version, str) and version else None
+
+
+def latest_from_simple_api(payload: dict[str, Any]) -> str | None:
+    """从 PEP 691/700 Simple JSON 中选出最新的未 yank 版本，优先正式版。"""
+    yanked_only: dict[Version, bool] = {}
+    for file in payload.get("files", []):
+        filename = file.get("filename", "")
+        try:
+            if filename.endswith(".whl"):
+                version = parse_wheel_filename(filename)[1]
+            else:
+                version = parse_sdist_filename(filename)[1]
+        except (InvalidVersion, InvalidSdistFilename, InvalidWheelFilename):
+            continue
+        yanked_only[version] = yanked_only.get(version, True) and bool(
+            file.get("yanked")
+        )
+
+    versions: list[Version] = []
+    for raw in payload.get("versions", []):
+        try:
+            version = Version(raw)
+        except InvalidVersion:
+            continue
+        if not yanked_only.get(version, False):
+            versions.append(version)
+    if not versions:
+        return None
+    stable = [version for version in versions if not version.is_prerelease]
+    return str(max(stable or versions))
+
+
+def fetch_latest_version(
+    package: str,
+    pool: PyPIConnectionPool,
+    cache: VersionCache | None = None,
+    api: IndexApi = "json",
+) -> tuple[str | None, str | None]:
+    """从 PyPI 读取最新版本；有缓存时在 TTL 内直接复用，过期后用 ETag 条件请求。"""
+    entry = cache.lookup(package, api) if cache else None
+    if entry and cache and cache.is_fresh(entry):
+        return entry["latest"], None
+
+    if api == "simple":
+        path = f"/simple/{quote(package)}/"
+        headers = {"Accept": SIMPLE_API_CONTENT_TYPE}
+    else:
+        path = f"/pypi/{quote(package)}/json"
+        headers = {"Accept": "application/json"}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+
     try:
-        with urlopen(url, timeout=timeout) as response:
-            payload = json.load(response)
-    except (HTTPError, URLError, TimeoutError, OSError) as exc:
+        status, response_headers, body = pool.get(path, headers)
+        content_type = response_headers.get_content_type()
+        if status == 304 and entry:
+            latest = entry["latest"]
+        elif api == "simple" and content_type != SIMPLE_API_CONTENT_TYPE:
+            return None, f"PyPI Simple API returned {content_type}, not PEP 691 JSON"
+        else:
+            payload = json.loads(body)
+            latest = (
+                latest_from_simple_api(payload)
+                if api == "simple"
+                else latest_from_json_api(payload)
+            )
+    except (
+        HTTPError,
+        URLError,
+        TimeoutError,
+        OSError,
+        http.client.HTTPException,
+        ValueError,
+    ) as exc:
         return None, str(exc)
 
-    version = payload.get("info", {}).get("version")
-    if not isinstance(version, str) or not version:
-        return None, "missing info.version in PyPI response"
-    return version, None
+    if latest is None:
+        return None, f"missing latest version in PyPI {api} API response"
+    if cache:
+        cache.store(package, api, latest, response_headers.get("ETag") or None)
+    return latest, None
 
 
 def declared_versions(report: PackageReport) -> list[Version]:
@@ -218,11 +504,34 @@ def needs_attention(status: str) -> bool:
     return status != "ok"
 
 
-def build_reports(root: Path, timeout: float) -> tuple[list[PackageReport], list[str]]:
-    reports, errors = collect_dependencies(root)
-    for report in reports.values():
-        report.latest, report.latest_error = fetch_latest_version(report.name, timeout)
-    return sorted(reports.values(), key=lambda item: item.name), errors
+def build_reports(
+    root: Path,
+    timeout: float,
+    workers: int = DEFAULT_LOOKUP_WORKERS,
+    cache: VersionCache | None = None,
+    api: IndexApi = "json",
+    index: ScanIndex | None = None,
+) -> tuple[list[PackageReport], list[str]]:
+    reports, errors = collect_dependencies(root, index)
+    ordered = sorted(reports.values(), key=lambda item: item.name)
+    with (
+        PyPIConnectionPool(timeout) as pool,
+        ThreadPoolExecutor(max_workers=workers) as executor,
+    ):
+        results = executor.map(
+            lambda report: fetch_latest_version(report.name, pool, cache, api),
+            ordered,
+        )
+        for report, (latest, latest_error) in zip(ordered, results):
+            report.latest, report.latest_error = latest, latest_error
+    try:
+        if cache:
+            cache.save()
+        if index:
+            index.save(root)
+    except OSError as exc:
+        console.print(f"[yellow]Failed to write cache: {exc}[/yellow]")
+    return ordered, errors
 
 
 def upgrade_requirement(report: PackageReport, requirement: Requirement) -> str | None:
@@ -270,23 +579,94 @@ def collect_upgrade_actions(
     return sorted(actions.values(), key=lambda item: (item.path, item.package)), skipped
 
 
-def run_upgrade_actions(actions: list[UpgradeAction], *, dry_run: bool) -> None:
-    """调用 uv add --script 更新依赖声明。"""
+def group_upgrade_actions(
+    actions: list[UpgradeAction],
+) -> list[tuple[Path, list[UpgradeAction]]]:
+    """按文件分组，同一文件的升级放进一次 uv add，避免并发写同一脚本。"""
+    grouped: dict[Path, list[UpgradeAction]] = {}
+    for action in actions:
+        grouped.setdefault(action.path, []).append(action)
+    return sorted(grouped.items())
+
+
+def upgrade_command(path: Path, actions: list[UpgradeAction]) -> list[str]:
+    return [
+        "uv",
+        "add",
+        "--script",
+        str(path),
+        *(action.requirement for action in actions),
+    ]
+
+
+def run_upgrade_command(path: Path, command: list[str]) -> UpgradeResult:
+    """执行单个文件的 uv add，并逐行带文件前缀输出。"""
+    started = time.monotonic()
+    output: list[str] = []
+    try:
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+    except OSError as exc:
+        return UpgradeResult(path, command, 127, str(exc), 0.0)
+
+    assert process.stdout is not None
+    for line in process.stdout:
+        output.append(line)
+        console.print(f"{path}: {line.rstrip()}", markup=False, highlight=False)
+    returncode = process.wait()
+    return UpgradeResult(
+        path, command, returncode, "".join(output), time.monotonic() - started
+    )
+
+
+def run_upgrade_actions(
+    actions: list[UpgradeAction],
+    *,
+    dry_run: bool,
+    workers: int = DEFAULT_UPGRADE_WORKERS,
+) -> list[UpgradeResult]:
+    """按文件并发调用 uv add --script 更新依赖声明。"""
     if not actions:
         console.print("[green]No upgrade actions needed.[/green]")
-        return
+        return []
+
+    grouped = group_upgrade_actions(actions)
+    commands = [(path, upgrade_command(path, items)) for path, items in grouped]
+    if dry_run:
+        for _path, command in commands:
+            console.print(f"Would run: {' '.join(command)}")
+        return []
+
+    for _path, command in commands:
+        console.print(f"Running: {' '.join(command)}")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda item: run_upgrade_command(*item), commands))
+    render_upgrade_summary(results)
+    return results
+
+
+def render_upgrade_summary(results: list[UpgradeResult]) -> None:
+    table = Table(title="uv add --script results")
+    table.add_column("script")
+    table.add_column("requirements")
+    table.add_column("seconds", justify="right")
+    table.add_column("status")
 
-    for action in actions:
-        command = [
-            "uv",
-            "add",
-            "--script",
-            str(action.path),
-            action.requirement,
-        ]
-        console.print(f"{'Would run' if dry_run else 'Running'}: {' '.join(command)}")
-        if not dry_run:
-            subprocess.run(command, check=True)
+    for result in results:
+        table.add_row(
+            str(result.path),
+            ", ".join(result.command[4:]),
+            f"{result.duration:.1f}",
+            "[green]ok[/green]"
+            if result.returncode == 0
+            else f"[red]exit {result.returncode}[/red]",
+        )
+
+    console.print(table)
 
 
 def report_to_payload(
@@ -381,6 +761,28 @@ def render_markdown(reports: list[PackageReport], errors: list[str]) -> str:
 def main(
     root: Annotated[Path, typer.Option("--root", "-C", help="仓库根目录")] = Path("."),
     timeout: Annotated[float, typer.Option(help="PyPI 请求超时时间，单位秒")] = 10.0,
+    workers: Annotated[
+        int, typer.Option(min=1, help="并发查询 PyPI 的线程数")
+    ] = DEFAULT_LOOKUP_WORKERS,
+    index_api: Annotated[
+        IndexApi,
+        typer.Option(
+            "--index-api", help="PyPI 查询接口：json 或更轻量的 simple（PEP 691）"
+        ),
+    ] = "json",
+    cache_file: Annotated[
+        Path | None,
+        typer.Option(
+            help="最新版本缓存文件，默认 ~/.cache/script-deps/pypi-versions.json"
+        ),
+    ] = None,
+    cache_ttl: Annotated[
+        float,
+        typer.Option(min=0.0, help="缓存有效期，单位秒；过期后用 ETag 条件请求"),
+    ] = DEFAULT_CACHE_TTL,
+    no_cache: Annotated[
+        bool, typer.Option("--no-cache", help="不读写最新版本缓存与文件扫描索引")
+    ] = False,
     json_output: Annotated[
         bool, typer.Option("--json", "-j", help="输出 JSON")
     ] = False,
@@ -404,23 +806,42 @@ def main(
         bool,
         typer.Option("--dry-run", help="配合 --upgrade 使用，只输出将执行的命令"),
     ] = False,
+    upgrade_workers: Annotated[
+        int,
+        typer.Option(min=1, help="配合 --upgrade 使用，并发执行 uv add 的文件数"),
+    ] = DEFAULT_UPGRADE_WORKERS,
 ) -> None:
     resolved_root = root.expanduser().resolve()
-    reports, errors = build_reports(resolved_root, timeout)
+    cache = (
+        None
+        if no_cache
+        else VersionCache(
+            (cache_file or default_cache_dir() / "pypi-versions.json").expanduser(),
+            cache_ttl,
+        )
+    )
+    index = None if no_cache else ScanIndex(default_cache_dir() / "scan-index.json")
+    reports, errors = build_reports(
+        resolved_root, timeout, workers, cache, index_api, index
+    )
     payload = report_to_payload(reports, errors)
 
     if dry_run and not upgrade:
         raise typer.BadParameter("--dry-run 必须和 --upgrade 一起使用")
 
+    upgrade_failed = False
     if upgrade:
         actions, skipped = collect_upgrade_actions(resolved_root, reports)
-        run_upgrade_actions(actions, dry_run=dry_run)
+        results = run_upgrade_actions(actions, dry_run=dry_run, workers=upgrade_workers)
+        upgrade_failed = any(result.returncode != 0 for result in results)
         if skipped:
             console.print("[yellow]Skipped automatic upgrades:[/yellow]")
             for item in skipped:
                 console.print(f"- {item}")
         if not dry_run:
-            reports, errors = build_reports(resolved_root, timeout)
+            reports, errors = build_reports(
+                resolved_root, timeout, workers, cache, index_api, index
+            )
             payload = report_to_payload(reports, errors)
 
     if json_output:
@@ -436,7 +857,11 @@ def main(
         else:
             console.print(summary)
 
-    if errors or (fail_on_attention and payload["attention_count"]):
+    if (
+        errors
+        or (upgrade and upgrade_failed)
+        or (fail_on_attention and payload["attention_count"])
+    ):
         raise typer.Exit(code=1)
 
 
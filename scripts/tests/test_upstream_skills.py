@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import subprocess
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
+from urllib.error import HTTPError
 
 from scripts import upstream_skills
 
@@ -60,6 +63,206 @@ commit = "1111111111111111111111111111111111111111"
         self.assertTrue(reports[0].needs_attention)
         self.assertEqual(reports[0].error, "rate limited")
 
+    def test_graphql_query_groups_paths_by_repository(self) -> None:
+        keys = [
+            ("mattpocock/skills", "skills/productivity/grilling"),
+            ("mattpocock/skills", "skills/engineering/domain-modeling"),
+            ("other/repo", "skills/x"),
+        ]
+
+        query, variables, aliases = upstream_skills.build_graphql_query(keys)
+        payload = {
+            "data": {
+                "r0": {
+                    "defaultBranchRef": {
+                        "target": {
+                            "p0": {"nodes": [{"oid": "a" * 40}]},
+                            "p1": {"nodes": []},
+                        }
+                    }
+                },
+                "r1": None,
+            }
+        }
+        results = upstream_skills.parse_graphql_commits(payload, aliases)
+
+        self.assertEqual(query.count("repository("), 2)
+        self.assertEqual(variables["r0_owner"], "mattpocock")
+        self.assertEqual(variables["r0_p1"], "skills/engineering/domain-modeling")
+        self.assertEqual(results[keys[0]], "a" * 40)
+        self.assertIsInstance(results[keys[1]], upstream_skills.UpstreamLookupError)
+        self.assertIsInstance(results[keys[2]], upstream_skills.UpstreamLookupError)
+
+    def test_prefetch_deduplicates_and_falls_back_to_rest(self) -> None:
+        skills = [
+            upstream_skills.TrackedSkill(
+                name=name,
+                repository="mattpocock/skills",
+                path="skills/productivity/grilling",
+                commit="a" * 40,
+            )
+            for name in ("grill-me", "grill-me-copy")
+        ]
+        rest_calls: list[str] = []
+
+        def broken_graphql(_: object) -> dict[upstream_skills.LookupKey, str]:
+            raise upstream_skills.UpstreamLookupError("HTTP 502")
+
+        def rest(skill: upstream_skills.TrackedSkill) -> str:
+            rest_calls.append(skill.name)
+            return "b" * 40
+
+        with mock.patch.dict("os.environ", {"GITHUB_TOKEN": "token"}):
+            fetcher = upstream_skills.prefetch_latest_commits(
+                skills,
+                mode="auto",
+                workers=2,
+                graphql_fetcher=broken_graphql,
+                rest_fetcher=rest,
+            )
+        reports = upstream_skills.check_skills(skills, fetcher)
+
+        self.assertEqual(rest_calls, ["grill-me"])
+        self.assertEqual([report.status for report in reports], ["changed"] * 2)
+
+    def test_rest_lookup_reuses_cached_sha_on_not_modified(self) -> None:
+        skill = upstream_skills.TrackedSkill(
+            name="grill-me",
+            repository="mattpocock/skills",
+            path="skills/productivity/grilling",
+            commit="a" * 40,
+        )
+        responses = [
+            (200, {"ETag": '"v1"'}, b'[{"sha": "' + b"b" * 40 + b'"}]'),
+            (304, {}, b""),
+        ]
+        sent_headers: list[dict[str, str]] = []
+
+        def fake_request(*_: object, **kwargs: object) -> tuple[int, dict, bytes]:
+            sent_headers.append(dict(kwargs["headers"]))
+            return responses.pop(0)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_path = Path(tmpdir) / "cache.json"
+            with mock.patch.object(upstream_skills, "github_request", fake_request):
+                cache = upstream_skills.CommitCache(cache_path)
+                first = upstream_skills.fetch_latest_commit(
+                    skill, timeout=1, cache=cache
+                )
+                cache.save()
+                second = upstream_skills.fetch_latest_commit(
+                    skill, timeout=1, cache=upstream_skills.CommitCache(cache_path)
+                )
+
+        self.assertEqual([first, second], ["b" * 40, "b" * 40])
+        self.assertNotIn("If-None-Match", sent_headers[0])
+        self.assertEqual(sent_headers[1]["If-None-Match"], '"v1"')
+
+    def test_github_request_uses_urllib_behind_proxy(self) -> None:
+        not_modified = HTTPError(
+            "https://api.github.com/repos/o/r/commits", 304, "Not Modified", {}, None
+        )
+        with (
+            mock.patch.object(
+                upstream_skills,
+                "getproxies",
+                return_value={"https": "http://proxy.example:3128"},
+            ),
+            mock.patch.object(upstream_skills, "proxy_bypass", return_value=False),
+            mock.patch.object(
+                upstream_skills, "urlopen", side_effect=not_modified
+            ) as urlopen,
+            mock.patch.object(upstream_skills.http.client, "HTTPSConnection") as conn,
+        ):
+            status, _headers, body = upstream_skills.github_request(
+                "GET", "/repos/o/r/commits", timeout=1, headers={}
+            )
+
+        self.assertEqual((status, body), (304, b""))
+        self.assertEqual(
+            urlopen.call_args.args[0].full_url,
+            "https://api.github.com/repos/o/r/commits",
+        )
+        conn.assert_not_called()
+
+    def test_exhausted_rate_limit_defers_instead_of_failing(self) -> None:
+        skill = upstream_skills.TrackedSkill(
+            name="grill-me",
+            repository="mattpocock/skills",
+            path="skills/productivity/grilling",
+            commit="a" * 40,
+        )
+        scheduler = upstream_skills.RateLimitScheduler(
+            60, clock=lambda: 1000.0, sleep=lambda _: None
+        )
+        scheduler.observe({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "5000"})
+
+        reports = upstream_skills.check_skills(
+            [skill],
+            lambda item: upstream_skills.fetch_latest_commit(
+                item, timeout=1, scheduler=scheduler
+            ),
+        )
+
+        self.assertEqual(reports[0].status, "deferred")
+        self.assertTrue(reports[0].needs_attention)
+
+    def test_git_mirror_checks_paths_from_local_clone(self) -> None:
+        def git(*args: str, cwd: Path) -> str:
+            return subprocess.run(
+                ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+                cwd=cwd,
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.strip()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            work = Path(tmpdir) / "work"
+            (work / "skills" / "a").mkdir(parents=True)
+            (work / "skills" / "b").mkdir(parents=True)
+            git("init", "-q", "-b", "main", cwd=Path(tmpdir) / "work")
+            (work / "skills" / "a" / "SKILL.md").write_text("1\n", encoding="utf-8")
+            (work / "skills" / "b" / "SKILL.md").write_text("1\n", encoding="utf-8")
+            git("add", ".", cwd=work)
+            git("commit", "-qm", "one", cwd=work)
+            first = git("rev-parse", "HEAD", cwd=work)
+            (work / "skills" / "a" / "SKILL.md").write_text("2\n", encoding="utf-8")
+            git("commit", "-qam", "two", cwd=work)
+            second = git("rev-parse", "HEAD", cwd=work)
+            upstream = Path(tmpdir) / "upstream" / "owner"
+            upstream.mkdir(parents=True)
+            git("clone", "-q", "--bare", str(work), "repo.git", cwd=upstream)
+
+            keys = [("owner/repo", "skills/a"), ("owner/repo", "skills/b")]
+            cache_dir = Path(tmpdir) / "cache"
+            online = upstream_skills.GitMirror(
+                cache_dir, base_url=f"{upstream.parent}/"
+            )
+            upstream_skills.fetch_latest_commits_git(keys, online, workers=2)
+            offline = upstream_skills.GitMirror(cache_dir, offline=True)
+            results = upstream_skills.fetch_latest_commits_git(keys, offline, workers=2)
+
+        self.assertEqual(results, {keys[0]: second, keys[1]: first})
+
+    def test_git_only_flags_are_rejected_outside_git_mode(self) -> None:
+        for argv in (
+            ["--offline"],
+            ["--diff"],
+            ["--mode", "rest", "--diff"],
+            ["--mode", "git", "--diff", "--json"],
+        ):
+            with (
+                self.subTest(argv=argv),
+                mock.patch("sys.stderr"),
+                self.assertRaises(SystemExit) as raised,
+            ):
+                upstream_skills.parse_args(argv)
+            self.assertEqual(raised.exception.code, 2)
+
+        args = upstream_skills.parse_args(["--mode", "git", "--offline", "--diff"])
+        self.assertTrue(args.offline and args.diff)
+
 
 if __name__ == "__main__":
     unittest.main()
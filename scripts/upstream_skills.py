@@ -8,27 +8,48 @@
 from __future__ import annotations
 
 import argparse
+import http.client
 import json
 import os
 import re
+import subprocess
 import sys
+import threading
+import time
 import tomllib
 from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 from urllib.error import HTTPError, URLError
 from urllib.parse import quote
-from urllib.request import Request, urlopen
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
 
 SHA_RE = re.compile(r"^[0-9a-f]{40}$")
 DEFAULT_MANIFEST = Path(__file__).resolve().parents[1] / "upstream-skills.toml"
+GITHUB_API_HOST = "api.github.com"
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_RATE_LIMIT_WAIT = 60.0
+LOOKUP_MODES = ("auto", "graphql", "rest", "git")
+DEFAULT_GIT_BASE_URL = "https://github.com/"
+UPSTREAM_HEAD_REF = "refs/upstream/HEAD"
+
+LookupKey = tuple[str, str]
+LookupResult = str | Exception
+
+_THREAD_STATE = threading.local()
 
 
 class UpstreamLookupError(RuntimeError):
     """表示无法读取上游 skill 状态。"""
 
 
+class RateLimitDeferred(UpstreamLookupError):
+    """表示 GitHub 限流额度耗尽，查询被推迟到额度重置之后。"""
+
+
 @dataclass(frozen=True)
 class TrackedSkill:
     """描述一个固定到特定上游 commit 的 skill。"""
@@ -50,6 +71,7 @@ class SkillReport:
 
     @property
     def needs_attention(self) -> bool:
+        # deferred 表示没有真正查到上游，不能当作检查通过。
         return self.status != "current"
 
 
@@ -94,28 +116,237 @@ def load_manifest(path: Path) -> list[TrackedSkill]:
     return skills
 
 
-def fetch_latest_commit(skill: TrackedSkill, *, timeout: float) -> str:
-    """读取上游路径最近一次变更的 commit。"""
-    encoded_path = quote(skill.path, safe="/")
-    url = (
-        f"https://api.github.com/repos/{skill.repository}/commits"
-        f"?path={encoded_path}&per_page=1"
-    )
+def github_token() -> str | None:
+    return os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
+
+
+def github_headers() -> dict[str, str]:
     headers = {
         "Accept": "application/vnd.github+json",
         "User-Agent": "DCjanus-prompts-upstream-skill-check",
         "X-GitHub-Api-Version": "2022-11-28",
     }
-    token = os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
+    token = github_token()
     if token:
         headers["Authorization"] = f"Bearer {token}"
-
+    return headers
+
+
+def github_request(
+    method: str,
+    path: str,
+    *,
+    timeout: float,
+    headers: dict[str, str],
+    body: bytes | None = None,
+) -> tuple[int, http.client.HTTPMessage, bytes]:
+    """通过线程内复用的 keep-alive 连接请求 GitHub API。"""
+    if getproxies().get("https") and not proxy_bypass(GITHUB_API_HOST):
+        return github_request_via_proxy(
+            method, path, timeout=timeout, headers=headers, body=body
+        )
+    for _attempt in range(2):
+        connection = getattr(_THREAD_STATE, "connection", None)
+        reused = connection is not None
+        if connection is None:
+            connection = http.client.HTTPSConnection(GITHUB_API_HOST, timeout=timeout)
+            _THREAD_STATE.connection = connection
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            payload = response.read()
+        except (http.client.HTTPException, OSError) as exc:
+            connection.close()
+            _THREAD_STATE.connection = None
+            # 复用的空闲连接可能已被服务端关闭，换新连接重发一次。
+            if reused and isinstance(exc, (ConnectionError, http.client.HTTPException)):
+                continue
+            raise UpstreamLookupError(str(exc)) from exc
+        if response.will_close:
+            connection.close()
+            _THREAD_STATE.connection = None
+        return response.status, response.headers, payload
+    raise UpstreamLookupError("GitHub API connection was closed repeatedly")
+
+
+def github_request_via_proxy(
+    method: str,
+    path: str,
+    *,
+    timeout: float,
+    headers: dict[str, str],
+    body: bytes | None = None,
+) -> tuple[int, http.client.HTTPMessage, bytes]:
+    """配置了代理时交给 urllib 处理，放弃连接复用。"""
+    request = Request(
+        f"https://{GITHUB_API_HOST}{path}", data=body, headers=headers, method=method
+    )
     try:
-        with urlopen(Request(url, headers=headers), timeout=timeout) as response:
-            payload = json.load(response)
+        with urlopen(request, timeout=timeout) as response:
+            return response.status, response.headers, response.read()
     except HTTPError as exc:
-        raise UpstreamLookupError(f"GitHub API returned HTTP {exc.code}") from exc
-    except (URLError, TimeoutError, OSError, json.JSONDecodeError) as exc:
+        return exc.code, exc.headers, exc.read()
+    except (URLError, OSError) as exc:
+        raise UpstreamLookupError(str(exc)) from exc
+
+
+class CommitCache:
+    """按 (repository, path) 保存上次 REST 查询的 ETag 与 commit，落盘为 JSON。"""
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, str]] = {}
+        if path is None:
+            return
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(payload, dict) and isinstance(payload.get("paths"), dict):
+            self._entries = payload["paths"]
+
+    @staticmethod
+    def _key(skill: TrackedSkill) -> str:
+        return f"{skill.repository}:{skill.path}"
+
+    def lookup(self, skill: TrackedSkill) -> dict[str, str] | None:
+        with self._lock:
+            entry = self._entries.get(self._key(skill))
+        if not isinstance(entry, dict) or not SHA_RE.fullmatch(entry.get("sha", "")):
+            return None
+        return entry
+
+    def store(self, skill: TrackedSkill, etag: str | None, sha: str) -> None:
+        with self._lock:
+            self._entries[self._key(skill)] = {"etag": etag or "", "sha": sha}
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            payload = {"paths": self._entries}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(payload, indent=2, sort_keys=True), "utf-8")
+        temp_path.replace(self.path)
+
+
+def default_cache_path() -> Path:
+    cache_root = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_root) / "upstream-skills" / "rest-commits.json"
+
+
+class RateLimitScheduler:
+    """根据 X-RateLimit-* 与 Retry-After 头在线程间共享限流状态。
+
+    额度耗尽且 reset 在 max_wait 内时等待；否则把后续查询标记为推迟。
+    """
+
+    def __init__(
+        self,
+        max_wait: float,
+        *,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._remaining: int | None = None
+        self._reset_at: float | None = None
+
+    def _deferred(self, reset_at: float) -> RateLimitDeferred:
+        reset = datetime.fromtimestamp(reset_at, UTC).strftime("%Y-%m-%d %H:%M:%S UTC")
+        return RateLimitDeferred(f"GitHub rate limit exhausted until {reset}")
+
+    def before_request(self) -> None:
+        """额度耗尽时等待 reset，或在等待过久时抛出 RateLimitDeferred。"""
+        with self._lock:
+            if self._remaining is None or self._remaining > 0 or self._reset_at is None:
+                return
+            wait = self._reset_at - self._clock()
+            if wait > self.max_wait:
+                raise self._deferred(self._reset_at)
+            # 持锁等待，让其它线程一起排在 reset 之后。
+            if wait > 0:
+                self._sleep(wait)
+            self._remaining = None
+
+    def observe(self, headers: Any) -> None:
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining_value, reset_value = int(remaining), float(reset)
+        except ValueError:
+            return
+        with self._lock:
+            self._remaining = remaining_value
+            self._reset_at = reset_value
+
+    def retry_delay(self, status: int, headers: Any) -> float | None:
+        """403/429 限流响应需要等待的秒数；不是限流响应时返回 None。"""
+        if status not in {403, 429}:
+            return None
+        retry_after = headers.get("Retry-After")
+        if retry_after and retry_after.strip().isdigit():
+            return float(retry_after)
+        if headers.get("X-RateLimit-Remaining") == "0" and headers.get(
+            "X-RateLimit-Reset"
+        ):
+            try:
+                return max(float(headers["X-RateLimit-Reset"]) - self._clock(), 0.0)
+            except ValueError:
+                return None
+        return None
+
+    def wait_or_defer(self, delay: float) -> None:
+        if delay > self.max_wait:
+            raise self._deferred(self._clock() + delay)
+        self._sleep(delay)
+
+
+def fetch_latest_commit(
+    skill: TrackedSkill,
+    *,
+    timeout: float,
+    cache: CommitCache | None = None,
+    scheduler: RateLimitScheduler | None = None,
+) -> str:
+    """读取上游路径最近一次变更的 commit；有缓存时用 ETag 条件请求。"""
+    encoded_path = quote(skill.path, safe="/")
+    url = f"/repos/{skill.repository}/commits?path={encoded_path}&per_page=1"
+    headers = github_headers()
+    cached = cache.lookup(skill) if cache else None
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+
+    for attempt in range(2):
+        if scheduler:
+            scheduler.before_request()
+        status, response_headers, body = github_request(
+            "GET", url, timeout=timeout, headers=headers
+        )
+        if scheduler:
+            scheduler.observe(response_headers)
+            delay = scheduler.retry_delay(status, response_headers)
+            if delay is not None and attempt == 0:
+                scheduler.wait_or_defer(delay)
+                continue
+            if delay is not None:
+                raise RateLimitDeferred("GitHub API is still rate limiting requests")
+        break
+
+    if status == 304 and cached:
+        return cached["sha"]
+    if status >= 400:
+        raise UpstreamLookupError(f"GitHub API returned HTTP {status}")
+    try:
+        payload = json.loads(body)
+    except json.JSONDecodeError as exc:
         raise UpstreamLookupError(str(exc)) from exc
 
     if not isinstance(payload, list) or not payload:
@@ -123,9 +354,307 @@ def fetch_latest_commit(skill: TrackedSkill, *, timeout: float) -> str:
     sha = payload[0].get("sha") if isinstance(payload[0], dict) else None
     if not isinstance(sha, str) or not SHA_RE.fullmatch(sha):
         raise UpstreamLookupError("GitHub API returned an invalid commit SHA")
+    if cache:
+        cache.store(skill, response_headers.get("ETag"), sha)
     return sha
 
 
+def unique_lookups(skills: Sequence[TrackedSkill]) -> dict[LookupKey, TrackedSkill]:
+    """按 (repository, path) 去重，保留首次出现的 skill 作为代表。"""
+    lookups: dict[LookupKey, TrackedSkill] = {}
+    for skill in skills:
+        lookups.setdefault((skill.repository, skill.path), skill)
+    return lookups
+
+
+def build_graphql_query(
+    keys: Sequence[LookupKey],
+) -> tuple[str, dict[str, str], dict[str, dict[str, LookupKey]]]:
+    """把多个 (repository, path) 合成一个 aliased GraphQL 查询，每个仓库只出现一次。"""
+    repositories: dict[str, list[str]] = {}
+    for repository, path in keys:
+        repositories.setdefault(repository, []).append(path)
+
+    declarations: list[str] = []
+    fields: list[str] = []
+    variables: dict[str, str] = {}
+    aliases: dict[str, dict[str, LookupKey]] = {}
+    for repo_index, (repository, paths) in enumerate(repositories.items()):
+        owner, name = repository.split("/", 1)
+        repo_alias = f"r{repo_index}"
+        variables[f"{repo_alias}_owner"] = owner
+        variables[f"{repo_alias}_name"] = name
+        declarations.extend(
+            [f"${repo_alias}_owner: String!", f"${repo_alias}_name: String!"]
+        )
+        histories: list[str] = []
+        aliases[repo_alias] = {}
+        for path_index, path in enumerate(paths):
+            path_alias = f"p{path_index}"
+            variable = f"{repo_alias}_{path_alias}"
+            variables[variable] = path
+            declarations.append(f"${variable}: String!")
+            histories.append(
+                f"{path_alias}: history(first: 1, path: ${variable}) {{ nodes {{ oid }} }}"
+            )
+            aliases[repo_alias][path_alias] = (repository, path)
+        fields.append(
+            f"{repo_alias}: repository(owner: ${repo_alias}_owner, name: ${repo_alias}_name) "
+            "{ defaultBranchRef { target { ... on Commit { "
+            + " ".join(histories)
+            + " } } } }"
+        )
+
+    query = f"query({', '.join(declarations)}) {{ {' '.join(fields)} }}"
+    return query, variables, aliases
+
+
+def parse_graphql_commits(
+    payload: Any, aliases: dict[str, dict[str, LookupKey]]
+) -> dict[LookupKey, LookupResult]:
+    """把 GraphQL 响应映射回 (repository, path)；缺失的条目记为查询失败。"""
+    data = payload.get("data") if isinstance(payload, dict) else None
+    if not isinstance(data, dict):
+        errors = payload.get("errors") if isinstance(payload, dict) else None
+        raise UpstreamLookupError(f"GitHub GraphQL returned no data: {errors}")
+
+    results: dict[LookupKey, LookupResult] = {}
+    for repo_alias, paths in aliases.items():
+        repository = data.get(repo_alias)
+        target = None
+        if isinstance(repository, dict):
+            branch = repository.get("defaultBranchRef")
+            if isinstance(branch, dict):
+                target = branch.get("target")
+        for path_alias, key in paths.items():
+            history = target.get(path_alias) if isinstance(target, dict) else None
+            nodes = history.get("nodes") if isinstance(history, dict) else None
+            if target is None:
+                results[key] = UpstreamLookupError(
+                    "GitHub GraphQL could not resolve the repository default branch"
+                )
+            elif not nodes:
+                results[key] = UpstreamLookupError(
+                    "GitHub API returned no commits for the path"
+                )
+            elif not SHA_RE.fullmatch(str(nodes[0].get("oid"))):
+                results[key] = UpstreamLookupError(
+                    "GitHub API returned an invalid commit SHA"
+                )
+            else:
+                results[key] = nodes[0]["oid"]
+    return results
+
+
+def fetch_latest_commits_graphql(
+    keys: Sequence[LookupKey], *, timeout: float
+) -> dict[LookupKey, LookupResult]:
+    """用一次 GraphQL 请求读取所有路径的最新 commit。"""
+    query, variables, aliases = build_graphql_query(keys)
+    body = json.dumps({"query": query, "variables": variables}).encode()
+    headers = {**github_headers(), "Content-Type": "application/json"}
+    status, _headers, response_body = github_request(
+        "POST", "/graphql", timeout=timeout, headers=headers, body=body
+    )
+    if status >= 400:
+        raise UpstreamLookupError(f"GitHub GraphQL returned HTTP {status}")
+    try:
+        payload = json.loads(response_body)
+    except json.JSONDecodeError as exc:
+        raise UpstreamLookupError(str(exc)) from exc
+    return parse_graphql_commits(payload, aliases)
+
+
+def fetch_latest_commits_rest(
+    lookups: dict[LookupKey, TrackedSkill],
+    fetcher: Callable[[TrackedSkill], str],
+    *,
+    workers: int,
+) -> dict[LookupKey, LookupResult]:
+    """用有界线程池并发执行逐路径的 REST 查询。"""
+
+    def run(skill: TrackedSkill) -> LookupResult:
+        try:
+            return fetcher(skill)
+        except UpstreamLookupError as exc:
+            return exc
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(run, lookups.values())
+        return dict(zip(lookups, results))
+
+
+class GitMirror:
+    """在本地缓存目录维护上游仓库的 bare partial clone，用 git log 代替 GitHub API。"""
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        *,
+        base_url: str = DEFAULT_GIT_BASE_URL,
+        offline: bool = False,
+        timeout: float = 300.0,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.base_url = base_url
+        self.offline = offline
+        self.timeout = timeout
+
+    def repository_dir(self, repository: str) -> Path:
+        return self.cache_dir / f"{repository}.git"
+
+    def _git(self, *args: str, cwd: Path | None = None) -> str:
+        command = ["git", *args]
+        if cwd is not None:
+            command = ["git", "-C", str(cwd), *args]
+        try:
+            result = subprocess.run(
+                command,
+                check=True,
+                capture_output=True,
+                text=True,
+                timeout=self.timeout,
+            )
+        except subprocess.CalledProcessError as exc:
+            detail = exc.stderr.strip() or exc.stdout.strip() or str(exc)
+            raise UpstreamLookupError(f"git {args[0]} failed: {detail}") from exc
+        except (OSError, subprocess.TimeoutExpired) as exc:
+            raise UpstreamLookupError(f"git {args[0]} failed: {exc}") from exc
+        return result.stdout
+
+    def sync(self, repository: str) -> Path:
+        """首次使用时 clone，之后每个仓库只执行一次 git fetch；offline 时只读缓存。"""
+        directory = self.repository_dir(repository)
+        if self.offline:
+            if not directory.exists():
+                raise UpstreamLookupError(
+                    f"no cached clone for {repository} in offline mode"
+                )
+            return directory
+
+        fetch_args = ("--filter=blob:none", "--no-tags", "--quiet", "origin")
+        if not directory.exists():
+            directory.parent.mkdir(parents=True, exist_ok=True)
+            self._git(
+                "clone",
+                "--bare",
+                "--filter=blob:none",
+                "--no-tags",
+                "--quiet",
+                f"{self.base_url}{repository}.git",
+                str(directory),
+            )
+        self._git("fetch", *fetch_args, f"+HEAD:{UPSTREAM_HEAD_REF}", cwd=directory)
+        return directory
+
+    def latest_commit(self, repository: str, path: str) -> str:
+        sha = self._git(
+            "log",
+            "-1",
+            "--format=%H",
+            UPSTREAM_HEAD_REF,
+            "--",
+            path,
+            cwd=self.repository_dir(repository),
+        ).strip()
+        if not sha:
+            raise UpstreamLookupError("git log returned no commits for the path")
+        if not SHA_RE.fullmatch(sha):
+            raise UpstreamLookupError("git log returned an invalid commit SHA")
+        return sha
+
+    def diff(self, skill: TrackedSkill) -> str:
+        """pinned commit 到上游 HEAD 之间该路径的变更（需要时按需拉取 blob）。"""
+        return self._git(
+            "diff",
+            "--stat",
+            "--patch",
+            skill.commit,
+            UPSTREAM_HEAD_REF,
+            "--",
+            skill.path,
+            cwd=self.repository_dir(skill.repository),
+        )
+
+
+def default_git_cache_dir() -> Path:
+    cache_root = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_root) / "upstream-skills" / "repos"
+
+
+def fetch_latest_commits_git(
+    keys: Sequence[LookupKey], mirror: GitMirror, *, workers: int
+) -> dict[LookupKey, LookupResult]:
+    """每个仓库同步一次，再在本地对每个路径执行 git log。"""
+    repositories: dict[str, list[str]] = {}
+    for repository, path in keys:
+        repositories.setdefault(repository, []).append(path)
+
+    def check_repository(item: tuple[str, list[str]]) -> dict[LookupKey, LookupResult]:
+        repository, paths = item
+        try:
+            mirror.sync(repository)
+        except UpstreamLookupError as exc:
+            return {(repository, path): exc for path in paths}
+        results: dict[LookupKey, LookupResult] = {}
+        for path in paths:
+            try:
+                results[(repository, path)] = mirror.latest_commit(repository, path)
+            except UpstreamLookupError as exc:
+                results[(repository, path)] = exc
+        return results
+
+    results: dict[LookupKey, LookupResult] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(check_repository, repositories.items()):
+            results.update(partial)
+    return results
+
+
+def prefetch_latest_commits(
+    skills: Sequence[TrackedSkill],
+    *,
+    mode: str,
+    workers: int,
+    graphql_fetcher: Callable[[Sequence[LookupKey]], dict[LookupKey, LookupResult]],
+    rest_fetcher: Callable[[TrackedSkill], str],
+    git_fetcher: Callable[[Sequence[LookupKey]], dict[LookupKey, LookupResult]]
+    | None = None,
+) -> Callable[[TrackedSkill], str]:
+    """批量读取所有 skill 的上游 commit，返回供 check_skills 使用的查表 fetcher。
+
+    GraphQL 需要 token；auto 模式在没有 token 或 GraphQL 整体失败时回退到并发 REST。
+    git 模式完全不访问 GitHub API，只使用本地 clone。
+    """
+    lookups = unique_lookups(skills)
+    results: dict[LookupKey, LookupResult] = {}
+    if mode == "git":
+        if git_fetcher is None:
+            raise ValueError("git mode requires a git_fetcher")
+        results = git_fetcher(list(lookups))
+    elif mode == "graphql" or (mode == "auto" and github_token()):
+        try:
+            results = graphql_fetcher(list(lookups))
+        except UpstreamLookupError as exc:
+            if mode == "graphql":
+                results = dict.fromkeys(lookups, exc)
+    pending = {key: skill for key, skill in lookups.items() if key not in results}
+    if pending:
+        results.update(
+            fetch_latest_commits_rest(pending, rest_fetcher, workers=workers)
+        )
+
+    def lookup(skill: TrackedSkill) -> str:
+        result = results[(skill.repository, skill.path)]
+        if isinstance(result, UpstreamLookupError):
+            raise result
+        if isinstance(result, Exception):
+            raise UpstreamLookupError(str(result))
+        return result
+
+    return lookup
+
+
 def check_skills(
     skills: Sequence[TrackedSkill],
     fetcher: Callable[[TrackedSkill], str],
@@ -140,7 +669,9 @@ def check_skills(
                 SkillReport(
                     skill=skill,
                     latest_commit=None,
-                    status="lookup failed",
+                    status="deferred"
+                    if isinstance(exc, RateLimitDeferred)
+                    else "lookup failed",
                     error=str(exc),
                 )
             )
@@ -236,13 +767,72 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         default=10.0,
         help="GitHub API 请求超时时间，单位秒",
     )
+    parser.add_argument(
+        "--mode",
+        choices=LOOKUP_MODES,
+        default="auto",
+        help="查询方式：auto 有 token 时用 GraphQL 批量查询，失败回退 REST",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="REST 查询的并发数",
+    )
+    parser.add_argument(
+        "--cache-file",
+        type=Path,
+        default=None,
+        help=(
+            "REST 查询的 ETag/commit 缓存，默认 ~/.cache/upstream-skills/rest-commits.json；"
+            "GraphQL 批量查询不支持条件请求，不使用该缓存"
+        ),
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="不读写 ETag/commit 缓存"
+    )
+    parser.add_argument(
+        "--max-rate-limit-wait",
+        type=float,
+        default=DEFAULT_MAX_RATE_LIMIT_WAIT,
+        help="限流时最多等待的秒数，超过则把剩余查询标记为 deferred",
+    )
+    parser.add_argument(
+        "--git-cache-dir",
+        type=Path,
+        default=None,
+        help="git 模式的 bare partial clone 目录，默认 ~/.cache/upstream-skills/repos",
+    )
+    parser.add_argument(
+        "--git-base-url",
+        default=DEFAULT_GIT_BASE_URL,
+        help="git 模式 clone 上游仓库使用的 URL 前缀",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="git 模式下不执行 clone/fetch，只读取已有缓存",
+    )
+    parser.add_argument(
+        "--diff",
+        action="store_true",
+        help="git 模式下输出有变更的 skill 从 pinned commit 到上游 HEAD 的 diff",
+    )
     parser.add_argument("--json", action="store_true", help="输出 JSON")
     parser.add_argument(
         "--github-summary",
         action="store_true",
         help="写入 GitHub Actions step summary",
     )
-    return parser.parse_args(argv)
+    args = parser.parse_args(argv)
+    if args.mode != "git":
+        if args.offline:
+            parser.error("--offline requires --mode git")
+        if args.diff:
+            parser.error("--diff requires --mode git")
+    if args.diff and args.json:
+        parser.error("--diff cannot be combined with --json")
+    return args
 
 
 def main(argv: Sequence[str] | None = None) -> int:
@@ -254,14 +844,49 @@ def main(argv: Sequence[str] | None = None) -> int:
         print(f"failed to load manifest: {exc}", file=sys.stderr)
         return 1
 
-    reports = check_skills(
+    cache = CommitCache(
+        None
+        if args.no_cache
+        else (args.cache_file or default_cache_path()).expanduser()
+    )
+    scheduler = RateLimitScheduler(args.max_rate_limit_wait)
+    mirror = GitMirror(
+        (args.git_cache_dir or default_git_cache_dir()).expanduser(),
+        base_url=args.git_base_url,
+        offline=args.offline,
+    )
+    fetcher = prefetch_latest_commits(
         skills,
-        lambda skill: fetch_latest_commit(skill, timeout=args.timeout),
+        mode=args.mode,
+        workers=max(args.workers, 1),
+        graphql_fetcher=lambda keys: fetch_latest_commits_graphql(
+            keys, timeout=args.timeout
+        ),
+        rest_fetcher=lambda skill: fetch_latest_commit(
+            skill, timeout=args.timeout, cache=cache, scheduler=scheduler
+        ),
+        git_fetcher=lambda keys: fetch_latest_commits_git(
+            keys, mirror, workers=max(args.workers, 1)
+        ),
     )
+    reports = check_skills(skills, fetcher)
+    try:
+        cache.save()
+    except OSError as exc:
+        print(f"failed to write cache: {exc}", file=sys.stderr)
     if args.json:
         print(json.dumps(report_payload(reports), ensure_ascii=False, indent=2))
     else:
         print(render_console(reports), end="")
+        if args.diff:
+            for report in reports:
+                if report.status != "changed":
+                    continue
+                try:
+                    diff = mirror.diff(report.skill)
+                except UpstreamLookupError as exc:
+                    diff = f"{exc}\n"
+                print(f"\n## {report.skill.name}\n{diff}", end="")
 
     if args.github_summary:
         summary = render_markdown(reports)
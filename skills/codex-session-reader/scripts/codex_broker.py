@@ -0,0 +1,67 @@
+"""codex-session-reader app-server broker 的 socket 约定与客户端调用。
+
+只依赖标准库：broker 本身与其他 skill 的 helper 都从这里计算 socket 路径并发起请求。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any
+
+BROKER_CONNECT_TIMEOUT_SECONDS = 1.0
+
+
+def broker_socket_path(codex_bin: str) -> Path:
+    """计算与 Codex binary、CODEX_HOME 绑定的 broker socket 路径。"""
+
+    explicit = os.environ.get("CODEX_APP_SERVER_BROKER_SOCKET", "").strip()
+    if explicit:
+        return Path(explicit).expanduser()
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR", "").strip()
+    base_dir = Path(runtime_dir) if runtime_dir else Path.home() / ".cache"
+    identity = f"{codex_bin}\0{os.environ.get('CODEX_HOME', '')}"
+    key = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:16]
+    return base_dir / "codex-app-server-broker" / f"{key}.sock"
+
+
+def broker_disabled() -> bool:
+    """是否通过 `CODEX_APP_SERVER_BROKER=off` 关闭 broker。"""
+
+    value = os.environ.get("CODEX_APP_SERVER_BROKER", "").strip().lower()
+    return value in {"0", "off", "false", "no"}
+
+
+def call_broker(
+    codex_bin: str, method: str, params: dict[str, Any], *, timeout: float
+) -> dict[str, Any] | None:
+    """向 broker 发送单个请求并返回原始回复；broker 不可用时返回 None。
+
+    回复形如 `{"result": ...}` 或 `{"error": ..., "kind": "broker" | "codex"}`。
+    """
+
+    if broker_disabled():
+        return None
+    path = broker_socket_path(codex_bin)
+    if not path.exists():
+        return None
+    message = json.dumps({"method": method, "params": params}, ensure_ascii=False)
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(BROKER_CONNECT_TIMEOUT_SECONDS)
+            conn.connect(str(path))
+            conn.settimeout(timeout)
+            conn.sendall(message.encode("utf-8") + b"\n")
+            with conn.makefile("rb") as reader:
+                line = reader.readline()
+    except OSError:
+        return None
+
+    try:
+        reply = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return reply if isinstance(reply, dict) else None
@@ -19,17 +19,33 @@ import json
 import os
 import re
 import shutil
+import socket
+import socketserver
 import sys
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from datetime import UTC, datetime
-from typing import Annotated, Any, Literal, TypeVar
+from pathlib import Path
+from typing import Annotated, Any, Literal, Self, TypeVar
 
 import typer
 from openai_codex import CodexConfig
 from openai_codex.client import CodexClient
-from openai_codex.errors import CodexError
+from openai_codex.errors import CodexError, TransportClosedError
 from pydantic import BaseModel, ConfigDict, Field, ValidationError
 from rich.console import Console
 
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+from codex_broker import (
+    BROKER_CONNECT_TIMEOUT_SECONDS,
+    broker_socket_path,
+    call_broker,
+)
+
 
 def to_camel(value: str) -> str:
     """将 snake_case 字段名转换为 camelCase。"""
@@ -130,6 +146,17 @@ class ThreadReadResponse(AppModel):
     thread: Thread
 
 
+class RawAppServerResponse(BaseModel):
+    """原样保留 app-server 响应，供 broker 透传。"""
+
+    model_config = ConfigDict(extra="allow")
+
+    def payload(self) -> dict[str, Any]:
+        """返回未经复制的原始响应字段。"""
+
+        return dict(self.model_extra or {})
+
+
 class CodexSessionReaderError(RuntimeError):
     """skill 运行失败时的统一异常。"""
 
@@ -171,19 +198,212 @@ def resolve_codex_bin() -> str:
     )
 
 
-def read_thread_via_sdk(thread_id: str, include_turns: bool) -> ThreadReadResponse:
-    """通过官方 Codex Python SDK 调用 `thread/read`。"""
+BROKER_METHODS = frozenset({"thread/read", "thread/list", "thread/turns/list"})
+BROKER_REQUEST_TIMEOUT_SECONDS = 300.0
+TURN_PAGE_SIZE = 200
+TURN_COUNT_PAGE_SIZE = 1000
+
 
-    config = CodexConfig(
-        codex_bin=resolve_codex_bin(),
+def codex_client_config(codex_bin: str) -> CodexConfig:
+    """构造本 skill 使用的 app-server 客户端配置。"""
+
+    return CodexConfig(
+        codex_bin=codex_bin,
         client_name="codex-session-reader",
         client_title="Codex Session Reader",
         experimental_api=False,
     )
+
+
+def request_via_broker(
+    codex_bin: str, method: str, params: dict[str, Any]
+) -> dict[str, Any] | None:
+    """通过常驻 broker 转发只读请求；broker 不可用时返回 None。"""
+
+    reply = call_broker(
+        codex_bin, method, params, timeout=BROKER_REQUEST_TIMEOUT_SECONDS
+    )
+    if reply is None:
+        return None
+    result = reply.get("result")
+    if isinstance(result, dict):
+        return result
+    if reply.get("kind") == "codex":
+        raise CodexSessionReaderError(f"Codex SDK 调用失败：{reply.get('error')}")
+    return None
+
+
+class AppServerSession:
+    """在一次 CLI 调用内复用同一个 app-server 连接。
+
+    优先把请求转发给常驻 broker；broker 不可用时只启动一次 app-server，
+    后续请求都复用这个已初始化的 CodexClient。
+    """
+
+    def __init__(self) -> None:
+        self.codex_bin = resolve_codex_bin()
+        self._client: CodexClient | None = None
+        self._use_broker = True
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """关闭本会话启动的 app-server。"""
+
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def request(self, method: str, params: dict[str, Any]) -> dict[str, Any]:
+        """发送只读请求并返回原始响应。"""
+
+        if self._use_broker:
+            result = request_via_broker(self.codex_bin, method, params)
+            if result is not None:
+                return result
+            self._use_broker = False
+
+        try:
+            if self._client is None:
+                client = CodexClient(codex_client_config(self.codex_bin))
+                client.start()
+                self._client = client
+                client.initialize()
+            response = self._client.request(
+                method, params, response_model=RawAppServerResponse
+            )
+        except CodexError as exc:
+            raise CodexSessionReaderError(f"Codex SDK 调用失败：{exc}") from exc
+        except OSError as exc:
+            reason = exc.strerror or str(exc)
+            raise CodexSessionReaderError(
+                f"无法启动 Codex SDK app-server：{reason}"
+            ) from exc
+        return response.payload()
+
+
+class BrokerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """持有一个已初始化 CodexClient 的 Unix socket 服务。"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, client: CodexClient, idle_timeout: float):
+        super().__init__(str(socket_path), BrokerRequestHandler)
+        self.client = client
+        self.timeout = idle_timeout
+        self.stopped = False
+
+    def handle_timeout(self) -> None:
+        """空闲超时后退出。"""
+
+        self.stopped = True
+
+    def stop(self) -> None:
+        """标记退出，并用一次自连接唤醒阻塞在 accept 上的主循环。"""
+
+        if self.stopped:
+            return
+        self.stopped = True
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                conn.settimeout(BROKER_CONNECT_TIMEOUT_SECONDS)
+                conn.connect(self.server_address)
+        except OSError:
+            return
+
+
+def drain_notifications(client: CodexClient, server: BrokerServer) -> None:
+    """持续取走 app-server 的全局通知，传输断开时立即让 broker 退出。"""
+
     try:
-        with CodexClient(config) as client:
+        while True:
+            client.next_notification()
+    except Exception:  # noqa: BLE001
+        server.stop()
+
+
+class BrokerRequestHandler(socketserver.StreamRequestHandler):
+    """处理一行 JSON 请求并返回一行 JSON 响应。"""
+
+    server: BrokerServer
+
+    def handle(self) -> None:
+        """转发单个请求。"""
+
+        raw = self.rfile.readline()
+        if not raw:
+            # stop() 的唤醒连接不携带请求。
+            return
+        try:
+            request = json.loads(raw)
+            method = request["method"]
+            params = request.get("params") or {}
+        except (json.JSONDecodeError, KeyError, TypeError):
+            self.reply({"error": "invalid broker request", "kind": "broker"})
+            return
+        if method not in BROKER_METHODS or not isinstance(params, dict):
+            self.reply({"error": f"unsupported method: {method}", "kind": "broker"})
+            return
+        try:
+            response = self.server.client.request(
+                method, params, response_model=RawAppServerResponse
+            )
+        except TransportClosedError as exc:
+            # app-server 已退出：让调用方回退到临时进程，broker 立即退出。
+            self.reply({"error": str(exc), "kind": "broker"})
+            self.server.stop()
+            return
+        except CodexError as exc:
+            self.reply({"error": str(exc), "kind": "codex"})
+            return
+        self.reply({"result": response.payload()})
+
+    def reply(self, payload: dict[str, Any]) -> None:
+        """写回单行 JSON。"""
+
+        line = json.dumps(payload, ensure_ascii=False) + "\n"
+        self.wfile.write(line.encode("utf-8"))
+
+
+def prepare_broker_socket(path: Path) -> None:
+    """创建私有 socket 目录，并清理残留 socket。"""
+
+    path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    if not path.exists():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        probe.settimeout(BROKER_CONNECT_TIMEOUT_SECONDS)
+        try:
+            probe.connect(str(path))
+        except OSError:
+            path.unlink()
+            return
+    raise CodexSessionReaderError(f"broker 已在运行：{path}")
+
+
+def serve_broker(idle_timeout: float) -> None:
+    """启动常驻 app-server 并在 Unix socket 上提供只读请求转发。"""
+
+    codex_bin = resolve_codex_bin()
+    socket_path = broker_socket_path(codex_bin)
+    prepare_broker_socket(socket_path)
+    try:
+        with CodexClient(codex_client_config(codex_bin)) as client:
             client.initialize()
-            sdk_result = client.thread_read(thread_id, include_turns=include_turns)
+            with BrokerServer(socket_path, client, idle_timeout) as server:
+                socket_path.chmod(0o600)
+                threading.Thread(
+                    target=drain_notifications, args=(client, server), daemon=True
+                ).start()
+                try:
+                    while not server.stopped:
+                        server.handle_request()
+                finally:
+                    socket_path.unlink(missing_ok=True)
     except CodexError as exc:
         raise CodexSessionReaderError(f"Codex SDK 调用失败：{exc}") from exc
     except OSError as exc:
@@ -192,8 +412,140 @@ def read_thread_via_sdk(thread_id: str, include_turns: bool) -> ThreadReadRespon
             f"无法启动 Codex SDK app-server：{reason}"
         ) from exc
 
-    payload = sdk_result.model_dump(by_alias=True, mode="json")
-    return validate_model_or_raise(ThreadReadResponse, payload, "thread/read 响应")
+
+def list_turn_page(
+    session: AppServerSession,
+    thread_id: str,
+    *,
+    direction: Literal["asc", "desc"],
+    items_view: Literal["notLoaded", "full"],
+    limit: int,
+    cursor: str | None,
+) -> tuple[list[Any], str | None]:
+    """调用一次 `thread/turns/list`，返回 `(turns, next_cursor)`。"""
+
+    params: dict[str, Any] = {
+        "threadId": thread_id,
+        "sortDirection": direction,
+        "itemsView": items_view,
+        "limit": limit,
+    }
+    if cursor:
+        params["cursor"] = cursor
+    payload = session.request("thread/turns/list", params)
+    data = payload.get("data")
+    if not isinstance(data, list):
+        raise CodexSessionReaderError("thread/turns/list 响应结构不合法。")
+    next_cursor = payload.get("nextCursor")
+    return data, next_cursor if isinstance(next_cursor, str) else None
+
+
+def count_turns(session: AppServerSession, thread_id: str) -> int:
+    """不加载 items，只翻页统计 turn 总数。"""
+
+    total = 0
+    cursor = None
+    while True:
+        data, cursor = list_turn_page(
+            session,
+            thread_id,
+            direction="asc",
+            items_view="notLoaded",
+            limit=TURN_COUNT_PAGE_SIZE,
+            cursor=cursor,
+        )
+        total += len(data)
+        if cursor is None or not data:
+            return total
+
+
+def fetch_turn_window(
+    session: AppServerSession, thread_id: str, start: int, end: int, total: int
+) -> list[Any]:
+    """从离窗口更近的一端翻页，只加载 `[start, end)` 所需的 turns。"""
+
+    descending = total - start < end
+    needed = total - start if descending else end
+    collected: list[Any] = []
+    cursor = None
+    while len(collected) < needed:
+        data, cursor = list_turn_page(
+            session,
+            thread_id,
+            direction="desc" if descending else "asc",
+            items_view="full",
+            limit=min(TURN_PAGE_SIZE, needed - len(collected)),
+            cursor=cursor,
+        )
+        collected.extend(data)
+        if cursor is None or not data:
+            break
+    offset = 0
+    if descending:
+        collected.reverse()
+        offset = total - len(collected)
+    return collected[max(start - offset, 0) : max(end - offset, 0)]
+
+
+def read_thread_window(
+    session: AppServerSession, thread_id: str, turns_expr: str
+) -> tuple[ThreadReadResponse, int, int, int] | None:
+    """只加载 `--turns` 需要的 turns；app-server 不支持分页时返回 None。"""
+
+    payload = session.request(
+        "thread/read", {"threadId": thread_id, "includeTurns": False}
+    )
+    try:
+        total_turns = count_turns(session, thread_id)
+    except CodexSessionReaderError:
+        return None
+    start, end = resolve_turn_window(total_turns, True, turns_expr)
+    turns = (
+        fetch_turn_window(session, thread_id, start, end, total_turns)
+        if end > start
+        else []
+    )
+    thread_payload = payload.get("thread")
+    if isinstance(thread_payload, dict):
+        payload = {**payload, "thread": {**thread_payload, "turns": turns}}
+    result = validate_model_or_raise(ThreadReadResponse, payload, "thread/read 响应")
+    return result, start, end, total_turns
+
+
+def read_thread_via_sdk(
+    thread_id: str, include_turns: bool, turns_expr: str | None = None
+) -> tuple[ThreadReadResponse, int, int, int]:
+    """调用 `thread/read`，先裁剪 turns 再做 schema 校验。
+
+    指定 `--turns` 时优先用 `thread/turns/list` 只加载窗口内的 turns。
+    返回 `(只含选中 turns 的结果, start, end, 总 turn 数)`。
+    """
+
+    with AppServerSession() as session:
+        if include_turns and turns_expr is not None:
+            parse_turn_slice_expr(turns_expr)
+            windowed = read_thread_window(session, thread_id, turns_expr)
+            if windowed is not None:
+                return windowed
+
+        payload = session.request(
+            "thread/read", {"threadId": thread_id, "includeTurns": include_turns}
+        )
+    thread_payload = payload.get("thread")
+    turns_payload = (
+        thread_payload.get("turns") if isinstance(thread_payload, dict) else None
+    )
+    if not isinstance(turns_payload, list):
+        turns_payload = []
+    total_turns = len(turns_payload)
+    start, end = resolve_turn_window(total_turns, include_turns, turns_expr)
+    if isinstance(thread_payload, dict):
+        payload = {
+            **payload,
+            "thread": {**thread_payload, "turns": turns_payload[start:end]},
+        }
+    result = validate_model_or_raise(ThreadReadResponse, payload, "thread/read 响应")
+    return result, start, end, total_turns
 
 
 def unix_ts_to_text(value: int) -> str:
@@ -202,6 +554,20 @@ def unix_ts_to_text(value: int) -> str:
     return datetime.fromtimestamp(value, tz=UTC).isoformat()
 
 
+def rollout_timestamp_to_text(value: object) -> str | None:
+    """把 rollout 中的 ISO 时间转成与 `unix_ts_to_text` 相同的秒级 UTC 格式。"""
+
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return unix_ts_to_text(int(parsed.timestamp()))
+
+
 def format_source(source: str | dict[str, Any]) -> str:
     """格式化 session source 字段。"""
 
@@ -230,7 +596,18 @@ def render_user_input(item: UserInput) -> str:
     )
 
 
-def render_item_markdown(item: ThreadItem) -> list[str]:
+def truncate_command_output(output: str, max_chars: int | None) -> str:
+    """按字符数截断单条命令输出，并注明省略了多少。"""
+
+    if max_chars is None or len(output) <= max_chars:
+        return output
+    omitted = len(output) - max_chars
+    return f"{output[:max_chars]}\n... [truncated {omitted} chars]"
+
+
+def render_item_markdown(
+    item: ThreadItem, max_command_output: int | None = None
+) -> list[str]:
     """将单个 thread item 渲染成 Markdown 片段。"""
 
     item_type = item.type
@@ -275,7 +652,10 @@ def render_item_markdown(item: ThreadItem) -> list[str]:
             lines.append(f"- duration_ms: `{item.duration_ms}`")
         lines.append("")
         if item.aggregated_output:
-            lines.extend(["```text", item.aggregated_output.rstrip(), "```", ""])
+            output = truncate_command_output(
+                item.aggregated_output.rstrip(), max_command_output
+            )
+            lines.extend(["```text", output, "```", ""])
         return lines
 
     if item_type == "fileChange":
@@ -359,38 +739,34 @@ def resolve_slice_index(index: int | None, total_turns: int, *, default: int) ->
     return min(index, total_turns)
 
 
-def select_turns_by_expr(
-    turns: list[Turn],
+def resolve_turn_window(
+    total_turns: int,
     include_turns: bool,
     turns_expr: str | None,
-) -> tuple[list[Turn], int, int]:
-    """根据 `--turns` 表达式选择要输出的 turns。"""
-
-    if not include_turns:
-        return [], 0, 0
-
-    total_turns = len(turns)
-    if total_turns == 0:
-        return [], 0, 0
+) -> tuple[int, int]:
+    """根据 `--turns` 表达式计算要输出的 `[start, end)` 区间。"""
 
+    if not include_turns or total_turns == 0:
+        return 0, 0
     if turns_expr is None:
-        return turns, 0, total_turns
+        return 0, total_turns
 
     raw_start, raw_end = parse_turn_slice_expr(turns_expr)
     start_index = resolve_slice_index(raw_start, total_turns, default=0)
     end_index = resolve_slice_index(raw_end, total_turns, default=total_turns)
-    if end_index < start_index:
-        return [], start_index, end_index
-    selected = turns[start_index:end_index]
-    return selected, start_index, end_index
+    return start_index, end_index
 
 
-def render_thread_markdown(
+def iter_thread_markdown_lines(
     result: ThreadReadResponse,
     include_turns: bool,
-    turns_expr: str | None,
-) -> str:
-    """将 thread/read 结果渲染成 Markdown。"""
+    *,
+    start: int,
+    end: int,
+    total_turns: int,
+    max_command_output: int | None = None,
+) -> Iterator[str]:
+    """逐段产出已按 `[start, end)` 裁剪的 thread/read Markdown 行。"""
 
     thread = result.thread
     lines = ["# Codex Thread", ""]
@@ -415,42 +791,110 @@ def render_thread_markdown(
     if thread.preview:
         lines.extend(["## Preview", "", thread.preview, ""])
 
-    selected_turns, selected_start, selected_end = select_turns_by_expr(
-        thread.turns,
-        include_turns=include_turns,
-        turns_expr=turns_expr,
-    )
+    selected_turns = thread.turns
 
     if not include_turns:
-        return "\n".join(lines).rstrip() + "\n"
+        yield from lines
+        return
 
     lines.append("## Turns")
     lines.append("")
     if not selected_turns:
         lines.append("_No turns loaded._")
-        return "\n".join(lines).rstrip() + "\n"
-    if len(selected_turns) != len(thread.turns):
-        lines.append(
-            f"_Showing turns [{selected_start}:{selected_end}] of {len(thread.turns)}._"
-        )
-        lines.append("")
-
-    for index, turn in enumerate(selected_turns, start=selected_start):
-        lines.append(f"### Turn {index}")
-        lines.append("")
-        lines.append(f"- id: `{turn.id}`")
-        lines.append(f"- status: `{turn.status}`")
+        yield from lines
+        return
+    if len(selected_turns) != total_turns:
+        lines.append(f"_Showing turns [{start}:{end}] of {total_turns}._")
         lines.append("")
+    yield from lines
+
+    for index, turn in enumerate(selected_turns, start=start):
+        yield f"### Turn {index}"
+        yield ""
+        yield f"- id: `{turn.id}`"
+        yield f"- status: `{turn.status}`"
+        yield ""
         for item in turn.items:
-            lines.extend(render_item_markdown(item))
+            yield from render_item_markdown(item, max_command_output)
 
-    return "\n".join(lines).rstrip() + "\n"
+
+def iter_thread_markdown(
+    result: ThreadReadResponse,
+    include_turns: bool,
+    *,
+    start: int,
+    end: int,
+    total_turns: int,
+    max_command_output: int | None = None,
+) -> Iterator[str]:
+    """把 Markdown 行转成可逐块写出的文本，结果等价于整段拼接后 `rstrip()`。"""
+
+    # 只留住最后一个非空白块：它之后的空白行与它自身的尾部空白都要被裁掉。
+    pending_whitespace = ""
+    held: str | None = None
+    for line in iter_thread_markdown_lines(
+        result,
+        include_turns,
+        start=start,
+        end=end,
+        total_turns=total_turns,
+        max_command_output=max_command_output,
+    ):
+        if not line.strip():
+            pending_whitespace += line + "\n"
+            continue
+        if held is not None:
+            yield held + "\n"
+        held = pending_whitespace + line
+        pending_whitespace = ""
+    yield (held or "").rstrip() + "\n"
+
+
+def iter_thread_json(
+    result: ThreadReadResponse,
+    include_turns: bool,
+    *,
+    start: int,
+    end: int,
+    total_turns: int,
+    turns_expr: str | None,
+) -> Iterator[str]:
+    """逐块产出 JSON 输出。"""
+
+    is_truncated = include_turns and (start != 0 or end != total_turns)
+    document = result.model_dump(by_alias=True)
+    document["truncated"] = (
+        {
+            "totalTurnCount": total_turns,
+            "includedTurnCount": len(result.thread.turns),
+            "startTurn": start,
+            "endTurn": end,
+            "turns": turns_expr,
+        }
+        if is_truncated
+        else None
+    )
+    encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+    yield from encoder.iterencode(document)
+    yield "\n"
 
 
-def emit_output(payload: str) -> None:
-    """统一输出结果。"""
+def emit_output(chunks: Iterable[str], output_path: Path | None = None) -> None:
+    """逐块写出结果到 stdout 或指定文件，不在内存中拼接完整输出。"""
 
-    sys.stdout.write(payload)
+    if output_path is None:
+        for chunk in chunks:
+            sys.stdout.write(chunk)
+        return
+    try:
+        with output_path.open("w", encoding="utf-8") as output:
+            for chunk in chunks:
+                output.write(chunk)
+    except OSError as exc:
+        reason = exc.strerror or str(exc)
+        raise CodexSessionReaderError(
+            f"无法写入输出文件 {output_path}：{reason}"
+        ) from exc
 
 
 def validate_thread_id(thread_id: str) -> str:
@@ -466,6 +910,239 @@ def validate_thread_id(thread_id: str) -> str:
     return value
 
 
+SEARCH_SNIPPET_RADIUS = 80
+ROLLOUT_PREVIEW_CHARS = 200
+THREAD_ID_IN_NAME_PATTERN = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+ROLLOUT_MESSAGE_ROLES = {"user_message": "user", "agent_message": "assistant"}
+
+
+def compile_search_pattern(
+    pattern: str, *, use_regex: bool, ignore_case: bool
+) -> re.Pattern[str]:
+    """把搜索词编译成正则；非 `--regex` 时按字面量匹配。"""
+
+    flags = re.IGNORECASE if ignore_case else 0
+    try:
+        return re.compile(pattern if use_regex else re.escape(pattern), flags)
+    except re.error as exc:
+        raise CodexSessionReaderError(f"搜索正则不合法：{exc}") from exc
+
+
+def search_snippet(text: str, match: re.Match[str]) -> str:
+    """截取命中位置附近的单行片段。"""
+
+    start = max(match.start() - SEARCH_SNIPPET_RADIUS, 0)
+    end = min(match.end() + SEARCH_SNIPPET_RADIUS, len(text))
+    snippet = " ".join(text[start:end].split())
+    prefix = "..." if start > 0 else ""
+    suffix = "..." if end < len(text) else ""
+    return f"{prefix}{snippet}{suffix}"
+
+
+def iter_turn_messages(turns: list[Turn]) -> Iterator[tuple[int, str, str]]:
+    """产出 `(turn 下标, role, 文本)`，只包含用户与助手消息。"""
+
+    for index, turn in enumerate(turns):
+        for item in turn.items:
+            if item.type == "userMessage":
+                text = "\n".join(
+                    entry.text or "" for entry in item.content or [] if entry.text
+                )
+                yield index, "user", text
+            elif item.type == "agentMessage" and item.text:
+                yield index, "assistant", item.text
+
+
+def summarize_thread(session: AppServerSession, thread_id: str) -> dict[str, Any]:
+    """通过 app-server 生成单个 thread 的摘要记录。"""
+
+    payload = session.request(
+        "thread/read", {"threadId": thread_id, "includeTurns": False}
+    )
+    thread = validate_model_or_raise(
+        ThreadReadResponse, payload, "thread/read 响应"
+    ).thread
+    try:
+        turn_count: int | None = count_turns(session, thread_id)
+    except CodexSessionReaderError:
+        turn_count = None
+    return {
+        "threadId": thread.id,
+        "name": thread.name,
+        "preview": thread.preview,
+        "status": thread.status.type,
+        "cwd": thread.cwd,
+        "createdAt": unix_ts_to_text(thread.created_at),
+        "updatedAt": unix_ts_to_text(thread.updated_at),
+        "turnCount": turn_count,
+        "path": thread.path,
+    }
+
+
+def search_thread(
+    session: AppServerSession, thread_id: str, matcher: re.Pattern[str]
+) -> list[dict[str, Any]]:
+    """通过 app-server 读取完整 thread 并在消息中搜索。"""
+
+    payload = session.request(
+        "thread/read", {"threadId": thread_id, "includeTurns": True}
+    )
+    thread = validate_model_or_raise(
+        ThreadReadResponse, payload, "thread/read 响应"
+    ).thread
+    hits = []
+    for turn_index, role, text in iter_turn_messages(thread.turns):
+        for match in matcher.finditer(text):
+            hits.append(
+                {
+                    "threadId": thread.id,
+                    "turn": turn_index,
+                    "role": role,
+                    "snippet": search_snippet(text, match),
+                    "path": thread.path,
+                }
+            )
+    return hits
+
+
+def scan_rollout_file(
+    path_text: str, search: tuple[str, int] | None
+) -> list[dict[str, Any]]:
+    """解析单个 rollout；`search` 为 `(正则, flags)` 时返回命中，否则返回摘要。
+
+    该函数会在进程池中执行，因此只接收可 pickle 的参数。
+    """
+
+    matcher = re.compile(search[0], search[1]) if search else None
+    path = Path(path_text)
+    match_id = THREAD_ID_IN_NAME_PATTERN.search(path.name)
+    thread_id = match_id.group(0) if match_id else None
+    meta: dict[str, Any] = {}
+    turn_index = -1
+    preview = ""
+    message_count = 0
+    hits: list[dict[str, Any]] = []
+    try:
+        with path.open(encoding="utf-8") as rollout:
+            for line in rollout:
+                if not line.endswith("\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(record, dict):
+                    continue
+                payload = record.get("payload")
+                if not isinstance(payload, dict):
+                    continue
+                record_type = record.get("type")
+                if record_type == "session_meta":
+                    meta = payload
+                    thread_id = str(payload.get("id") or thread_id)
+                    continue
+                if record_type == "turn_context":
+                    turn_index += 1
+                    continue
+                if record_type != "event_msg":
+                    continue
+                role = ROLLOUT_MESSAGE_ROLES.get(str(payload.get("type")))
+                text = payload.get("message")
+                if role is None or not isinstance(text, str):
+                    continue
+                message_count += 1
+                if role == "user" and not preview:
+                    preview = " ".join(text.split())[:ROLLOUT_PREVIEW_CHARS]
+                if matcher is None:
+                    continue
+                for match in matcher.finditer(text):
+                    hits.append(
+                        {
+                            "threadId": thread_id,
+                            "turn": max(turn_index, 0),
+                            "role": role,
+                            "snippet": search_snippet(text, match),
+                            "path": path_text,
+                        }
+                    )
+    except OSError as exc:
+        return [{"path": path_text, "error": exc.strerror or str(exc)}]
+
+    if matcher is not None:
+        return hits
+    return [
+        {
+            "threadId": thread_id,
+            "preview": preview,
+            "cwd": meta.get("cwd"),
+            "createdAt": rollout_timestamp_to_text(meta.get("timestamp")),
+            "turnCount": turn_index + 1,
+            "messageCount": message_count,
+            "path": path_text,
+        }
+    ]
+
+
+def find_rollout_files(directory: Path) -> list[Path]:
+    """递归列出目录下的 rollout JSONL。"""
+
+    if not directory.is_dir():
+        raise CodexSessionReaderError(f"rollout 目录不存在：{directory}")
+    return sorted(directory.rglob("rollout-*.jsonl"))
+
+
+def iter_rollout_records(
+    directory: Path, search: tuple[str, int] | None, workers: int
+) -> Iterator[dict[str, Any]]:
+    """按文件顺序产出 rollout 解析结果；`workers > 1` 时用进程池并行解析。"""
+
+    paths = [str(path) for path in find_rollout_files(directory)]
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield from scan_rollout_file(path, search)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            scan_rollout_file, paths, [search] * len(paths), chunksize=8
+        )
+        for records in results:
+            yield from records
+
+
+def iter_batch_records(
+    thread_ids: list[str],
+    rollout_dir: Path | None,
+    *,
+    matcher: re.Pattern[str] | None,
+    workers: int,
+) -> Iterator[dict[str, Any]]:
+    """先处理显式 thread id（共用一个 app-server），再处理 rollout 目录。"""
+
+    normalized_ids = [validate_thread_id(thread_id) for thread_id in thread_ids]
+    if normalized_ids:
+        with AppServerSession() as session:
+            for thread_id in normalized_ids:
+                try:
+                    if matcher is None:
+                        yield summarize_thread(session, thread_id)
+                    else:
+                        yield from search_thread(session, thread_id, matcher)
+                except CodexSessionReaderError as exc:
+                    yield {"threadId": thread_id, "error": str(exc)}
+    if rollout_dir is not None:
+        search = (matcher.pattern, matcher.flags) if matcher is not None else None
+        yield from iter_rollout_records(rollout_dir, search, workers)
+
+
+def iter_ndjson(records: Iterable[dict[str, Any]]) -> Iterator[str]:
+    """把记录编码成 NDJSON 行。"""
+
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
 app = typer.Typer(add_completion=False, no_args_is_help=True)
 
 
@@ -494,55 +1171,124 @@ def read_thread_command(
             help="0-based turns 切片，如 `:5`、`-5:`、`10:-1`、`13:15`、`13`。",
         ),
     ] = None,
+    max_command_output: Annotated[
+        int | None,
+        typer.Option(
+            "--max-command-output",
+            min=0,
+            help="Markdown 中每条命令输出最多保留的字符数。",
+        ),
+    ] = None,
+    output_path: Annotated[
+        Path | None,
+        typer.Option("--output", "-o", help="写入文件而不是 stdout。"),
+    ] = None,
 ) -> None:
     """读取单个 Codex thread。"""
 
     normalized_thread_id = validate_thread_id(thread_id)
 
-    result = read_thread_via_sdk(normalized_thread_id, include_turns=include_turns)
+    result, start, end, total_turns = read_thread_via_sdk(
+        normalized_thread_id, include_turns=include_turns, turns_expr=turns_expr
+    )
 
     if format_name == "json":
-        selected_turns, selected_start, selected_end = select_turns_by_expr(
-            result.thread.turns,
+        chunks = iter_thread_json(
+            result,
             include_turns=include_turns,
+            start=start,
+            end=end,
+            total_turns=total_turns,
             turns_expr=turns_expr,
         )
-        effective_result = result.model_copy(deep=True)
-        if include_turns:
-            effective_result.thread.turns = selected_turns
-        else:
-            effective_result.thread.turns = []
-        is_truncated = include_turns and (
-            selected_start != 0 or selected_end != len(result.thread.turns)
-        )
-        payload = (
-            json.dumps(
-                {
-                    **effective_result.model_dump(by_alias=True),
-                    "truncated": (
-                        {
-                            "totalTurnCount": len(result.thread.turns),
-                            "includedTurnCount": len(selected_turns),
-                            "startTurn": selected_start,
-                            "endTurn": selected_end,
-                            "turns": turns_expr,
-                        }
-                        if is_truncated
-                        else None
-                    ),
-                },
-                ensure_ascii=False,
-                indent=2,
-            )
-            + "\n"
-        )
     else:
-        payload = render_thread_markdown(
+        chunks = iter_thread_markdown(
             result,
             include_turns=include_turns,
-            turns_expr=turns_expr,
+            start=start,
+            end=end,
+            total_turns=total_turns,
+            max_command_output=max_command_output,
         )
-    emit_output(payload)
+    emit_output(chunks, output_path)
+
+
+@app.command("read-many")
+def read_many_command(
+    thread_ids: Annotated[
+        list[str] | None, typer.Argument(help="要读取的 thread id 列表。")
+    ] = None,
+    rollout_dir: Annotated[
+        Path | None,
+        typer.Option("--rollout-dir", help="直接解析该目录下的 rollout JSONL。"),
+    ] = None,
+    workers: Annotated[
+        int,
+        typer.Option("--workers", min=1, help="解析 rollout 目录的进程数。"),
+    ] = 1,
+    output_path: Annotated[
+        Path | None,
+        typer.Option("--output", "-o", help="写入文件而不是 stdout。"),
+    ] = None,
+) -> None:
+    """批量输出多个 thread 的 NDJSON 摘要。"""
+
+    if not thread_ids and rollout_dir is None:
+        raise CodexSessionReaderError("至少需要提供 thread id 或 `--rollout-dir`。")
+    records = iter_batch_records(
+        thread_ids or [], rollout_dir, matcher=None, workers=workers
+    )
+    emit_output(iter_ndjson(records), output_path)
+
+
+@app.command("search")
+def search_command(
+    pattern: Annotated[str, typer.Argument(help="要搜索的文本。")],
+    thread_ids: Annotated[
+        list[str] | None, typer.Argument(help="要搜索的 thread id 列表。")
+    ] = None,
+    rollout_dir: Annotated[
+        Path | None,
+        typer.Option("--rollout-dir", help="直接搜索该目录下的 rollout JSONL。"),
+    ] = None,
+    use_regex: Annotated[
+        bool, typer.Option("--regex", help="把搜索词当作正则表达式。")
+    ] = False,
+    ignore_case: Annotated[
+        bool, typer.Option("--ignore-case", "-i", help="忽略大小写。")
+    ] = False,
+    workers: Annotated[
+        int,
+        typer.Option("--workers", min=1, help="解析 rollout 目录的进程数。"),
+    ] = 1,
+    output_path: Annotated[
+        Path | None,
+        typer.Option("--output", "-o", help="写入文件而不是 stdout。"),
+    ] = None,
+) -> None:
+    """在用户与助手消息中全文搜索，输出 NDJSON 命中。"""
+
+    if not thread_ids and rollout_dir is None:
+        raise CodexSessionReaderError("至少需要提供 thread id 或 `--rollout-dir`。")
+    matcher = compile_search_pattern(
+        pattern, use_regex=use_regex, ignore_case=ignore_case
+    )
+    records = iter_batch_records(
+        thread_ids or [], rollout_dir, matcher=matcher, workers=workers
+    )
+    emit_output(iter_ndjson(records), output_path)
+
+
+@app.command("broker")
+def broker_command(
+    idle_timeout: Annotated[
+        float,
+        typer.Option("--idle-timeout", min=1.0, help="空闲多少秒后自动退出。"),
+    ] = 900.0,
+) -> None:
+    """常驻一个 Codex app-server，供本 skill 与其他 helper 复用。"""
+
+    serve_broker(idle_timeout)
 
 
 def main() -> None:
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import re
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "codex_session_reader.py"
+SPEC = importlib.util.spec_from_file_location("codex_session_reader", SCRIPT_PATH)
+assert SPEC is not None
+codex_session_reader = importlib.util.module_from_spec(SPEC)
+assert SPEC.loader is not None
+sys.modules[SPEC.name] = codex_session_reader
+SPEC.loader.exec_module(codex_session_reader)
+
+
+@pytest.mark.parametrize(
+    "lines",
+    [
+        ["# Thread", "", "hello\n"],
+        ["# Thread", "", "hello\n", "", ""],
+        ["# Thread", "", "hello", "  ", ""],
+        ["# Thread", "", "", "body", "", "tail \n\n"],
+        [],
+    ],
+)
+def test_iter_thread_markdown_matches_joined_rstrip(
+    monkeypatch, lines: list[str]
+) -> None:
+    monkeypatch.setattr(
+        codex_session_reader,
+        "iter_thread_markdown_lines",
+        lambda *args, **kwargs: iter(lines),
+    )
+
+    streamed = "".join(
+        codex_session_reader.iter_thread_markdown(
+            None, True, start=0, end=0, total_turns=0
+        )
+    )
+
+    assert streamed == "\n".join(lines).rstrip() + "\n"
+
+
+class ClosedTransportClient:
+    def next_notification(self):
+        raise codex_session_reader.TransportClosedError("app-server exited")
+
+
+def test_broker_stops_when_notification_stream_fails() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        socket_path = Path(temp_dir) / "broker.sock"
+        client = ClosedTransportClient()
+        with codex_session_reader.BrokerServer(socket_path, client, 60.0) as server:
+
+            def serve() -> None:
+                while not server.stopped:
+                    server.handle_request()
+
+            loop = threading.Thread(target=serve)
+            loop.start()
+            codex_session_reader.drain_notifications(client, server)
+            loop.join(timeout=5)
+
+            assert server.stopped
+            assert not loop.is_alive()
+
+
+FIRST_THREAD = "019a0000-0000-7000-8000-000000000001"
+SECOND_THREAD = "019a0000-0000-7000-8000-000000000002"
+
+
+def write_rollout(path: Path, thread_id: str, messages: list[tuple[str, str]]) -> None:
+    records = [
+        {
+            "type": "session_meta",
+            "payload": {
+                "id": thread_id,
+                "cwd": "/work",
+                "timestamp": "2025-06-01T08:09:10.123Z",
+            },
+        }
+    ]
+    for kind, text in messages:
+        if kind == "turn":
+            records.append({"type": "turn_context", "payload": {"model": "gpt"}})
+        else:
+            records.append(
+                {"type": "event_msg", "payload": {"type": kind, "message": text}}
+            )
+    truncated = json.dumps(
+        {"type": "event_msg", "payload": {"type": "user_message", "message": "parser"}}
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        "".join(json.dumps(record) + "\n" for record in records) + truncated[:40],
+        encoding="utf-8",
+    )
+
+
+def rollout_fixture(tmp_path: Path) -> Path:
+    write_rollout(
+        tmp_path / "2025" / f"rollout-2025-06-01-{FIRST_THREAD}.jsonl",
+        FIRST_THREAD,
+        [
+            ("turn", ""),
+            ("user_message", "fix the   parser"),
+            ("agent_message", "Parser fixed."),
+            ("turn", ""),
+            ("user_message", "add tests"),
+        ],
+    )
+    write_rollout(
+        tmp_path / "2025" / f"rollout-2025-06-02-{SECOND_THREAD}.jsonl",
+        SECOND_THREAD,
+        [("turn", ""), ("user_message", "parser again")],
+    )
+    return tmp_path
+
+
+def test_scan_rollout_file_summarizes_complete_lines(tmp_path: Path) -> None:
+    path = next(rollout_fixture(tmp_path).rglob(f"*{FIRST_THREAD}.jsonl"))
+
+    records = codex_session_reader.scan_rollout_file(str(path), None)
+
+    assert records == [
+        {
+            "threadId": FIRST_THREAD,
+            "preview": "fix the parser",
+            "cwd": "/work",
+            "createdAt": "2025-06-01T08:09:10+00:00",
+            "turnCount": 2,
+            "messageCount": 3,
+            "path": str(path),
+        }
+    ]
+
+
+def test_scan_rollout_file_search_skips_truncated_last_line(tmp_path: Path) -> None:
+    path = next(rollout_fixture(tmp_path).rglob(f"*{FIRST_THREAD}.jsonl"))
+
+    hits = codex_session_reader.scan_rollout_file(str(path), ("parser", re.IGNORECASE))
+    misses = codex_session_reader.scan_rollout_file(str(path), ("missing", 0))
+
+    assert [(hit["turn"], hit["role"], hit["snippet"]) for hit in hits] == [
+        (0, "user", "fix the parser"),
+        (0, "assistant", "Parser fixed."),
+    ]
+    assert misses == []
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_search_rollout_dir_keeps_file_order(tmp_path: Path, workers: str) -> None:
+    rollout_dir = rollout_fixture(tmp_path)
+
+    result = CliRunner().invoke(
+        codex_session_reader.app,
+        ["search", "parser", "--rollout-dir", str(rollout_dir), "--workers", workers],
+    )
+
+    assert result.exit_code == 0, result.output
+    hits = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [(hit["threadId"], hit["role"]) for hit in hits] == [
+        (FIRST_THREAD, "user"),
+        (SECOND_THREAD, "user"),
+    ]
+
+
+class FakeTurnSession:
+    """按 `thread/turns/list` 的游标语义分页返回 turns 的假 app-server。"""
+
+    def __init__(self, total: int) -> None:
+        self.turn_ids = [f"turn-{index}" for index in range(total)]
+        self.pages: list[tuple[str, str, int]] = []
+
+    def request(self, method: str, params: dict[str, object]) -> dict[str, object]:
+        if method == "thread/read":
+            return {
+                "thread": {
+                    "id": FIRST_THREAD,
+                    "preview": "",
+                    "ephemeral": False,
+                    "modelProvider": "openai",
+                    "createdAt": 0,
+                    "updatedAt": 0,
+                    "status": {"type": "idle"},
+                    "cwd": "/work",
+                    "cliVersion": "0.0.0",
+                    "source": "cli",
+                }
+            }
+        assert method == "thread/turns/list"
+        ordered = self.turn_ids
+        if params["sortDirection"] == "desc":
+            ordered = ordered[::-1]
+        position = int(str(params.get("cursor") or 0))
+        limit = int(str(params["limit"]))
+        self.pages.append(
+            (str(params["itemsView"]), str(params["sortDirection"]), position)
+        )
+        data = [
+            {"id": turn_id, "status": "completed"}
+            for turn_id in ordered[position : position + limit]
+        ]
+        next_position = position + len(data)
+        return {
+            "data": data,
+            "nextCursor": str(next_position) if next_position < len(ordered) else None,
+        }
+
+
+@pytest.mark.parametrize(
+    ("turns_expr", "expected_ids", "expected_pages"),
+    [
+        ("0:2", ["turn-0", "turn-1"], [("full", "asc", 0)]),
+        (
+            "2:8",
+            [f"turn-{index}" for index in range(2, 8)],
+            [("full", "asc", 0), ("full", "asc", 3), ("full", "asc", 6)],
+        ),
+        (
+            "-4:-1",
+            ["turn-6", "turn-7", "turn-8"],
+            [("full", "desc", 0), ("full", "desc", 3)],
+        ),
+        ("20:30", [], []),
+    ],
+)
+def test_read_thread_window_pages_only_the_needed_turns(
+    monkeypatch,
+    turns_expr: str,
+    expected_ids: list[str],
+    expected_pages: list[tuple[str, str, int]],
+) -> None:
+    monkeypatch.setattr(codex_session_reader, "TURN_PAGE_SIZE", 3)
+    monkeypatch.setattr(codex_session_reader, "TURN_COUNT_PAGE_SIZE", 4)
+    session = FakeTurnSession(10)
+
+    windowed = codex_session_reader.read_thread_window(
+        session, FIRST_THREAD, turns_expr
+    )
+
+    assert windowed is not None
+    result, start, end, total = windowed
+    assert total == 10
+    assert [turn.id for turn in result.thread.turns] == expected_ids
+    assert end - start == len(expected_ids)
+    full_pages = [page for page in session.pages if page[0] == "full"]
+    count_pages = [page for page in session.pages if page[0] == "notLoaded"]
+    assert full_pages == expected_pages
+    assert [page[2] for page in count_pages] == [0, 4, 8]
@@ -12,15 +12,29 @@
 
 from __future__ import annotations
 
+import codecs
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field, replace
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+import http.client
 import json
 import os
 from pathlib import Path
 import re
+import ssl
+import sys
+import threading
+from time import monotonic, sleep, time
 from typing import Any, Literal
-from time import monotonic
-from urllib.error import URLError
-from urllib.parse import urlparse
-from urllib.request import Request, urlopen
+from urllib.error import HTTPError, URLError
+from urllib.parse import urldefrag, urljoin, urlparse, urlsplit, urlunsplit
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
+from urllib.robotparser import RobotFileParser
+import zlib
 
 import typer
 from playwright.sync_api import Error as PlaywrightError
@@ -31,6 +45,7 @@ from rich.panel import Panel
 import trafilatura
 
 APP = typer.Typer(add_completion=False)
+CRAWL_APP = typer.Typer(add_completion=False)
 CONSOLE = Console()
 
 OutputFormat = Literal[
@@ -46,6 +61,9 @@ TWITTER_HOSTS = {
     "mobile.twitter.com",
 }
 FXTWITTER_API_ROOT = "https://api.fxtwitter.com/2/status"
+FXTWITTER_EXPAND_WORKERS = 4
+FXTWITTER_EXPAND_MAX_STATUSES = 200
+FXTWITTER_CACHE_TTL_SECONDS = 24 * 3600
 JINA_READER_API_ROOT = "https://r.jina.ai/"
 JINA_API_KEY_ENV = "JINA_API_KEY"
 JINA_BLOCK_PAGE_SIGNALS = (
@@ -56,6 +74,74 @@ JINA_BLOCK_PAGE_SIGNALS = (
     ("request limit reached", "jina"),
     ("security verification", "jina"),
 )
+HTTP_READ_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_RESPONSE_BYTES = 20 * 1024 * 1024
+# urllib 不会自动解压；这里只声明脚本能自行增量解码的编码。
+HTTP_ACCEPT_ENCODING = "zstd, gzip, deflate"
+HTTP_MAX_ATTEMPTS = 3
+HTTP_MAX_REDIRECTS = 5
+HTTP_MAX_RETRY_WAIT = 30.0
+HTTP_RETRY_BASE_DELAY = 2.0
+HTTP_RETRY_STATUSES = {429, 503}
+HTTP_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+HTTP_MAX_IDLE_PER_HOST = 4
+HTTP_DRAIN_LIMIT = 64 * 1024
+DOM_SETTLE_QUIET_MS = 250
+DOM_SETTLE_MAX_MS = 2000
+DOM_SETTLE_SCRIPT = """
+([quietMs, maxMs]) => new Promise((resolve) => {
+  const root = document.documentElement;
+  if (!root) {
+    resolve("no-document");
+    return;
+  }
+  let quietTimer = null;
+  let maxTimer = null;
+  let observer = null;
+  const finish = (reason) => {
+    if (observer) observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(maxTimer);
+    resolve(reason);
+  };
+  const armQuietTimer = () => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => finish("quiet"), quietMs);
+  };
+  observer = new MutationObserver(armQuietTimer);
+  observer.observe(root, {
+    attributes: true,
+    characterData: true,
+    childList: true,
+    subtree: true,
+  });
+  armQuietTimer();
+  maxTimer = setTimeout(() => finish("max-wait"), maxMs);
+})
+"""
+CRAWL_USER_AGENT = "fetch-url"
+CRAWL_MAX_ROBOTS_BYTES = 512 * 1024
+CRAWL_MARKDOWN_LINK_RE = re.compile(r"\]\(\s*<?([^)\s>]+)>?(?:\s+\"[^\"]*\")?\s*\)")
+CRAWL_SKIPPED_SUFFIXES = (
+    ".7z",
+    ".css",
+    ".gif",
+    ".gz",
+    ".ico",
+    ".jpeg",
+    ".jpg",
+    ".js",
+    ".mp3",
+    ".mp4",
+    ".pdf",
+    ".png",
+    ".svg",
+    ".tar",
+    ".webp",
+    ".woff",
+    ".woff2",
+    ".zip",
+)
 # FxTwitter source repository: https://github.com/allnodes/FxTwitter
 
 
@@ -91,37 +177,34 @@ def detect_browser_path() -> str | None:
     return None
 
 
-def render_html(
+def launch_browser(playwright: Any, browser_path: str | None, verbose: bool) -> Any:
+    """启动 headless Chromium；提供 browser_path 时复用本地浏览器。"""
+
+    launch_options: dict[str, Any] = {"headless": True}
+    if browser_path:
+        launch_options["executable_path"] = browser_path
+        if verbose:
+            CONSOLE.print(
+                f"[cyan]Using browser path[/cyan] {browser_path}",
+                highlight=False,
+            )
+    elif verbose:
+        CONSOLE.print("[cyan]Using Playwright-managed Chromium[/cyan]", highlight=False)
+
+    return playwright.chromium.launch(**launch_options)
+
+
+def render_page_html(
+    browser: Any,
     url: str,
     timeout_ms: int,
-    browser_path: str | None,
     verbose: bool,
+    wait_network_idle: bool = False,
 ) -> str:
-    """使用 Playwright 渲染页面并返回完整 HTML。"""
-
-    if verbose:
-        CONSOLE.print(
-            f"[cyan]Launching browser[/cyan] "
-            f"(strategy=domcontentloaded+load+stability, timeout_ms={timeout_ms})",
-            highlight=False,
-        )
+    """在已启动的浏览器中新开 context 渲染页面并返回完整 HTML。"""
 
-    with sync_playwright() as playwright:
-        launch_options: dict[str, Any] = {"headless": True}
-        if browser_path:
-            launch_options["executable_path"] = browser_path
-            if verbose:
-                CONSOLE.print(
-                    f"[cyan]Using browser path[/cyan] {browser_path}",
-                    highlight=False,
-                )
-        elif verbose:
-            CONSOLE.print(
-                "[cyan]Using Playwright-managed Chromium[/cyan]", highlight=False
-            )
-
-        browser = playwright.chromium.launch(**launch_options)
-        context = browser.new_context()
+    context = browser.new_context()
+    try:
         page = context.new_page()
         if verbose:
             CONSOLE.print(f"[cyan]Navigating[/cyan] {url}", highlight=False)
@@ -137,27 +220,30 @@ def render_html(
                     highlight=False,
                 )
 
-        # Wait briefly for client-side rendering to settle without risking long hangs.
-        deadline = monotonic() + 2.0
-        previous_size: int | None = None
-        stable_rounds = 0
-        while monotonic() < deadline:
-            current_size = page.evaluate(
-                "() => document.body ? document.body.innerHTML.length : 0"
-            )
-            if previous_size is not None and abs(current_size - previous_size) <= 64:
-                stable_rounds += 1
-            else:
-                stable_rounds = 0
-            if stable_rounds >= 2:
+        if wait_network_idle:
+            try:
+                page.wait_for_load_state("networkidle", timeout=min(timeout_ms, 5000))
                 if verbose:
-                    CONSOLE.print("[cyan]DOM stabilized[/cyan]", highlight=False)
-                break
-            previous_size = current_size
-            page.wait_for_timeout(300)
+                    CONSOLE.print("[cyan]Network idle reached[/cyan]", highlight=False)
+            except PlaywrightTimeoutError:
+                if verbose:
+                    CONSOLE.print(
+                        "[yellow]Network idle wait timed out, continue[/yellow]",
+                        highlight=False,
+                    )
+
+        # 在页面内用 MutationObserver 等 DOM 静默，避免反复序列化整棵 DOM。
+        settle_reason = page.evaluate(
+            DOM_SETTLE_SCRIPT, [DOM_SETTLE_QUIET_MS, DOM_SETTLE_MAX_MS]
+        )
+        if verbose:
+            CONSOLE.print(
+                f"[cyan]DOM settle finished[/cyan] ({settle_reason})",
+                highlight=False,
+            )
         html = page.content()
+    finally:
         context.close()
-        browser.close()
 
     if verbose:
         CONSOLE.print(
@@ -167,6 +253,36 @@ def render_html(
     return html
 
 
+def render_html(
+    url: str,
+    timeout_ms: int,
+    browser_path: str | None,
+    verbose: bool,
+    wait_network_idle: bool = False,
+) -> str:
+    """使用 Playwright 渲染页面并返回完整 HTML。"""
+
+    if verbose:
+        CONSOLE.print(
+            f"[cyan]Launching browser[/cyan] "
+            f"(strategy=domcontentloaded+load+mutation-quiet, timeout_ms={timeout_ms})",
+            highlight=False,
+        )
+
+    with sync_playwright() as playwright:
+        browser = launch_browser(playwright, browser_path, verbose=verbose)
+        try:
+            return render_page_html(
+                browser,
+                url,
+                timeout_ms=timeout_ms,
+                verbose=verbose,
+                wait_network_idle=wait_network_idle,
+            )
+        finally:
+            browser.close()
+
+
 def extract_content(
     html: str, url: str, output_format: OutputFormat, verbose: bool
 ) -> str:
@@ -195,7 +311,340 @@ def extract_content(
     return content
 
 
-def fetch_agent_markdown(url: str, timeout_ms: int, verbose: bool) -> str | None:
+class ResponseTooLargeError(ValueError):
+    """响应体超过 --max-bytes 上限。"""
+
+
+def _new_content_decompressor(content_encoding: str) -> Any | None:
+    """按 Content-Encoding 创建增量解压器；identity 返回 None。"""
+
+    encoding = content_encoding.strip().lower()
+    if encoding in {"", "identity"}:
+        return None
+    if encoding in {"gzip", "x-gzip"}:
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return zlib.decompressobj()
+    if encoding == "zstd":
+        from compression import zstd
+
+        return zstd.ZstdDecompressor()
+    raise ValueError(f"Unsupported Content-Encoding: {content_encoding}")
+
+
+def read_response_text(
+    response: Any,
+    max_bytes: int,
+    default_charset: str = "utf-8",
+) -> str:
+    """分块读取响应体并增量解压、解码，超过 max_bytes 时提前中止。"""
+
+    content_length = (response.headers.get("Content-Length") or "").strip()
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        raise ResponseTooLargeError(
+            f"Content-Length {content_length} exceeds the {max_bytes} byte limit"
+        )
+
+    decompressor = _new_content_decompressor(
+        response.headers.get("Content-Encoding") or ""
+    )
+    charset = response.headers.get_content_charset() or default_charset
+    try:
+        decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder(default_charset)(errors="replace")
+
+    parts: list[str] = []
+    total = 0
+
+    def feed(data: bytes) -> None:
+        nonlocal total
+        total += len(data)
+        if total > max_bytes:
+            raise ResponseTooLargeError(
+                f"Response body exceeds the {max_bytes} byte limit"
+            )
+        parts.append(decoder.decode(data))
+
+    while chunk := response.read(HTTP_READ_CHUNK_SIZE):
+        if decompressor is None:
+            feed(chunk)
+            continue
+        # max_length 限制单块解压输出，避免压缩炸弹一次性撑爆内存。
+        feed(decompressor.decompress(chunk, max_bytes - total + 1))
+    flush = getattr(decompressor, "flush", None)
+    if flush is not None:
+        feed(flush())
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    """单个 host 的并发上限与令牌桶参数。"""
+
+    max_concurrency: int = 4
+    rate_per_second: float = 4.0
+    burst: int = 4
+
+
+@dataclass
+class _HostState:
+    policy: HostPolicy
+    semaphore: threading.BoundedSemaphore
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+    idle: list[http.client.HTTPConnection] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+@dataclass
+class _Lease:
+    state: _HostState
+    connection: http.client.HTTPConnection
+    response: http.client.HTTPResponse
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """解析 Retry-After（秒数或 HTTP-date），返回需要等待的秒数。"""
+
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max((retry_at - datetime.now(UTC)).total_seconds(), 0.0)
+
+
+class HttpPool:
+    """按 host 复用 keep-alive 连接，并施加并发上限、令牌桶与 Retry-After 退避。"""
+
+    def __init__(
+        self,
+        default_policy: HostPolicy,
+        policies: dict[str, HostPolicy] | None = None,
+    ) -> None:
+        self._default_policy = default_policy
+        self._policies = dict(policies or {})
+        self._states: dict[tuple[str, str, int], _HostState] = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+
+    def _state_for(self, url: str) -> tuple[tuple[str, str, int], _HostState]:
+        parsed = urlsplit(url)
+        scheme = parsed.scheme.lower()
+        host = (parsed.hostname or "").lower()
+        if scheme not in {"http", "https"} or not host:
+            raise URLError(f"unsupported URL: {url}")
+        key = (scheme, host, parsed.port or (443 if scheme == "https" else 80))
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                policy = self._policies.get(host, self._default_policy)
+                state = _HostState(
+                    policy=policy,
+                    semaphore=threading.BoundedSemaphore(policy.max_concurrency),
+                    tokens=float(policy.burst),
+                    updated=monotonic(),
+                )
+                self._states[key] = state
+            return key, state
+
+    def defer(self, url: str, delay: float) -> None:
+        """让该 host 的后续请求至少等待 delay 秒（例如收到 Retry-After 后）。"""
+
+        _key, state = self._state_for(url)
+        with state.lock:
+            state.blocked_until = max(state.blocked_until, monotonic() + delay)
+
+    def limit_host(self, url: str, min_interval: float) -> None:
+        """把该 host 的令牌桶收紧到每 min_interval 秒至多一次请求；只收紧不放宽。"""
+
+        if min_interval <= 0:
+            return
+        _key, state = self._state_for(url)
+        rate = 1.0 / min_interval
+        with state.lock:
+            policy = state.policy
+            if rate >= policy.rate_per_second and policy.burst <= 1:
+                return
+            state.policy = replace(
+                policy, rate_per_second=min(rate, policy.rate_per_second), burst=1
+            )
+            state.tokens = min(state.tokens, 1.0)
+
+    def throttle(self, url: str) -> None:
+        """为不经过连接池、但会访问该 host 的请求（如浏览器渲染）消耗一个令牌。"""
+
+        _key, state = self._state_for(url)
+        self._take_token(state)
+
+    def _take_token(self, state: _HostState) -> None:
+        while True:
+            with state.lock:
+                now = monotonic()
+                if now < state.blocked_until:
+                    wait = state.blocked_until - now
+                else:
+                    policy = state.policy
+                    state.tokens = min(
+                        float(policy.burst),
+                        state.tokens + (now - state.updated) * policy.rate_per_second,
+                    )
+                    state.updated = now
+                    if state.tokens >= 1.0:
+                        state.tokens -= 1.0
+                        return
+                    wait = (1.0 - state.tokens) / policy.rate_per_second
+            sleep(wait)
+
+    def _connect(
+        self, key: tuple[str, str, int], timeout: float
+    ) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(
+                host, port, timeout=timeout, context=self._ssl_context
+            )
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _send(
+        self,
+        key: tuple[str, str, int],
+        state: _HostState,
+        target: str,
+        headers: dict[str, str],
+        timeout: float,
+    ) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        with state.lock:
+            connection = state.idle.pop() if state.idle else None
+        if connection is not None:
+            connection.timeout = timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(timeout)
+            try:
+                connection.request("GET", target, headers=headers)
+                return connection, connection.getresponse()
+            except (ConnectionError, http.client.HTTPException):
+                # 空闲连接可能已被服务端关闭，换新连接重发一次。
+                connection.close()
+
+        connection = self._connect(key, timeout)
+        try:
+            connection.request("GET", target, headers=headers)
+            return connection, connection.getresponse()
+        except http.client.HTTPException as exc:
+            connection.close()
+            raise URLError(exc) from exc
+        except BaseException:
+            connection.close()
+            raise
+
+    def _release(self, lease: _Lease, *, drain: bool = False) -> None:
+        response = lease.response
+        try:
+            if drain and not response.isclosed():
+                response.read(HTTP_DRAIN_LIMIT)
+        except (OSError, http.client.HTTPException):
+            pass
+        state = lease.state
+        if response.isclosed() and not response.will_close:
+            with state.lock:
+                if len(state.idle) < HTTP_MAX_IDLE_PER_HOST:
+                    state.idle.append(lease.connection)
+                    state.semaphore.release()
+                    return
+        lease.connection.close()
+        state.semaphore.release()
+
+    def _request(self, url: str, headers: dict[str, str], timeout: float) -> _Lease:
+        key, state = self._state_for(url)
+        parsed = urlsplit(url)
+        target = urlunsplit(("", "", parsed.path or "/", parsed.query, ""))
+        for attempt in range(HTTP_MAX_ATTEMPTS):
+            self._take_token(state)
+            state.semaphore.acquire()
+            try:
+                connection, response = self._send(key, state, target, headers, timeout)
+            except BaseException:
+                state.semaphore.release()
+                raise
+            lease = _Lease(state=state, connection=connection, response=response)
+            if (
+                response.status not in HTTP_RETRY_STATUSES
+                or attempt + 1 >= HTTP_MAX_ATTEMPTS
+            ):
+                return lease
+            delay = parse_retry_after(response.getheader("Retry-After"))
+            if delay is None:
+                delay = HTTP_RETRY_BASE_DELAY * 2**attempt
+            if delay > HTTP_MAX_RETRY_WAIT:
+                return lease
+            self._release(lease, drain=True)
+            self.defer(url, delay)
+        raise AssertionError("unreachable")
+
+    @contextmanager
+    def open(self, url: str, headers: dict[str, str], timeout: float) -> Iterator[Any]:
+        """发起 GET 请求；跟随重定向，>=400 时抛出 HTTPError，语义与 urlopen 对齐。"""
+
+        scheme = urlsplit(url).scheme.lower()
+        host = urlsplit(url).hostname or ""
+        if getproxies().get(scheme) and not proxy_bypass(host):
+            # 配置了代理时交给 urllib 处理，放弃连接复用。
+            request = Request(url, headers=headers)  # noqa: S310 - 调用方已校验 URL
+            with urlopen(request, timeout=timeout) as response:  # noqa: S310
+                yield response
+            return
+
+        for _redirect in range(HTTP_MAX_REDIRECTS + 1):
+            lease = self._request(url, headers, timeout)
+            response = lease.response
+            location = response.getheader("Location")
+            if response.status in HTTP_REDIRECT_STATUSES and location:
+                self._release(lease, drain=True)
+                url = urljoin(url, location)
+                continue
+            if response.status >= 400:
+                error = HTTPError(
+                    url, response.status, response.reason, response.headers, None
+                )
+                self._release(lease, drain=True)
+                raise error
+            try:
+                yield response
+            finally:
+                self._release(lease)
+            return
+        raise URLError(f"too many redirects: {url}")
+
+
+HTTP_POOL = HttpPool(
+    HostPolicy(),
+    {
+        # Jina Reader 免 key 约 20 RPM，带 key 约 500 RPM。
+        "r.jina.ai": (
+            HostPolicy(max_concurrency=4, rate_per_second=8.0, burst=4)
+            if os.getenv(JINA_API_KEY_ENV, "").strip()
+            else HostPolicy(max_concurrency=2, rate_per_second=20 / 60, burst=2)
+        ),
+    },
+)
+
+
+def fetch_agent_markdown(
+    url: str,
+    timeout_ms: int,
+    verbose: bool,
+    max_bytes: int = DEFAULT_MAX_RESPONSE_BYTES,
+) -> str | None:
     """通过 Accept 协商优先请求 text/markdown，命中则直接返回。"""
 
     if verbose:
@@ -203,15 +652,15 @@ def fetch_agent_markdown(url: str, timeout_ms: int, verbose: bool) -> str | None
             "[cyan]Trying Markdown for Agents negotiation[/cyan]", highlight=False
         )
 
-    request = Request(  # noqa: S310 - 本地 CLI 可信输入, URL 由用户主动提供
-        url,
-        headers={
-            "Accept": "text/markdown, text/html;q=0.9, */*;q=0.1",
-            "User-Agent": "fetch-url/1.0 (+https://github.com/cloudflare/markdown-for-agents)",
-        },
-    )
+    headers = {
+        "Accept": "text/markdown, text/html;q=0.9, */*;q=0.1",
+        "Accept-Encoding": HTTP_ACCEPT_ENCODING,
+        "User-Agent": "fetch-url/1.0 (+https://github.com/cloudflare/markdown-for-agents)",
+    }
     try:
-        with urlopen(request, timeout=max(timeout_ms / 1000.0, 1.0)) as response:  # noqa: S310
+        with HTTP_POOL.open(
+            url, headers=headers, timeout=max(timeout_ms / 1000.0, 1.0)
+        ) as response:
             content_type = response.headers.get_content_type()
             if verbose:
                 CONSOLE.print(
@@ -220,8 +669,7 @@ def fetch_agent_markdown(url: str, timeout_ms: int, verbose: bool) -> str | None
                 )
             if content_type != "text/markdown":
                 return None
-            charset = response.headers.get_content_charset() or "utf-8"
-            markdown = response.read().decode(charset, errors="replace")
+            markdown = read_response_text(response, max_bytes=max_bytes)
             if not markdown.strip():
                 return None
             if verbose:
@@ -230,7 +678,7 @@ def fetch_agent_markdown(url: str, timeout_ms: int, verbose: bool) -> str | None
                     highlight=False,
                 )
             return markdown
-    except (URLError, OSError) as exc:
+    except (URLError, OSError, ValueError) as exc:
         if verbose:
             CONSOLE.print(
                 f"[yellow]Markdown negotiation failed, fallback to browser render[/yellow] ({exc})",
@@ -239,13 +687,19 @@ def fetch_agent_markdown(url: str, timeout_ms: int, verbose: bool) -> str | None
         return None
 
 
-def fetch_jina_reader_markdown(url: str, timeout_ms: int, verbose: bool) -> str | None:
+def fetch_jina_reader_markdown(
+    url: str,
+    timeout_ms: int,
+    verbose: bool,
+    max_bytes: int = DEFAULT_MAX_RESPONSE_BYTES,
+) -> str | None:
     """通过 Jina Reader 获取 Markdown, 命中则直接返回。"""
 
     reader_url = f"{JINA_READER_API_ROOT}{url}"
     api_key = os.getenv(JINA_API_KEY_ENV, "").strip()
     headers = {
         "Accept": "text/markdown, text/plain;q=0.9, */*;q=0.1",
+        "Accept-Encoding": HTTP_ACCEPT_ENCODING,
         "User-Agent": "fetch-url/1.0 (+https://github.com/DCjanus/prompts/tree/master/skills/fetch-url)",
     }
     if api_key:
@@ -258,36 +712,60 @@ def fetch_jina_reader_markdown(url: str, timeout_ms: int, verbose: bool) -> str
             highlight=False,
         )
 
-    request = Request(  # noqa: S310 - 本地 CLI 可信输入, URL 由用户主动提供
-        reader_url,
-        headers=headers,
-    )
-    try:
-        with urlopen(request, timeout=max(timeout_ms / 1000.0, 1.0)) as response:  # noqa: S310
-            charset = response.headers.get_content_charset() or "utf-8"
-            markdown = response.read().decode(charset, errors="replace")
-            if not markdown.strip():
-                return None
-            if is_obvious_jina_block_page(markdown):
-                if verbose:
-                    CONSOLE.print(
-                        "[yellow]Jina Reader returned a probable rate-limit page[/yellow]",
-                        highlight=False,
-                    )
-                return None
+    for attempt in range(HTTP_MAX_ATTEMPTS):
+        try:
+            with HTTP_POOL.open(
+                reader_url, headers=headers, timeout=max(timeout_ms / 1000.0, 1.0)
+            ) as response:
+                content_type = response.headers.get_content_type()
+                if not content_type.startswith("text/"):
+                    if verbose:
+                        CONSOLE.print(
+                            f"[yellow]Jina Reader returned unexpected content-type[/yellow] {content_type}",
+                            highlight=False,
+                        )
+                    return None
+                markdown = read_response_text(response, max_bytes=max_bytes)
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        except (URLError, OSError, ValueError) as exc:
+            if verbose:
+                CONSOLE.print(
+                    f"[yellow]Jina Reader failed[/yellow] ({exc})",
+                    highlight=False,
+                )
+            return None
+
+        if not markdown.strip():
+            return None
+        if not is_obvious_jina_block_page(markdown):
             if verbose:
                 CONSOLE.print(
                     f"[green]Jina Reader hit[/green] {len(markdown)} chars",
                     highlight=False,
                 )
             return markdown
-    except (URLError, OSError) as exc:
+
+        # 200 状态的限流页同样按 Retry-After 退避，并让同 host 的其它请求一起等待。
+        delay = (
+            retry_after
+            if retry_after is not None
+            else HTTP_RETRY_BASE_DELAY * 2**attempt
+        )
+        if attempt + 1 >= HTTP_MAX_ATTEMPTS or delay > HTTP_MAX_RETRY_WAIT:
+            break
         if verbose:
             CONSOLE.print(
-                f"[yellow]Jina Reader failed[/yellow] ({exc})",
+                f"[yellow]Jina Reader returned a probable rate-limit page, retry in {delay:.1f}s[/yellow]",
                 highlight=False,
             )
-        return None
+        HTTP_POOL.defer(reader_url, delay)
+
+    if verbose:
+        CONSOLE.print(
+            "[yellow]Jina Reader returned a probable rate-limit page[/yellow]",
+            highlight=False,
+        )
+    return None
 
 
 def is_obvious_jina_block_page(content: str) -> bool:
@@ -320,7 +798,10 @@ def extract_twitter_status_id(url: str) -> str | None:
 
 
 def fetch_fxtwitter_status(
-    status_id: str, timeout_ms: int, verbose: bool
+    status_id: str,
+    timeout_ms: int,
+    verbose: bool,
+    max_bytes: int = DEFAULT_MAX_RESPONSE_BYTES,
 ) -> dict[str, Any] | None:
     """调用 FxTwitter API 获取结构化推文数据。"""
 
@@ -328,17 +809,20 @@ def fetch_fxtwitter_status(
     if verbose:
         CONSOLE.print(f"[cyan]Fetching FxTwitter API[/cyan] {api_url}", highlight=False)
 
-    request = Request(  # noqa: S310 - 固定 HTTPS API 根地址 + 数字 status id
-        api_url,
-        headers={
-            "Accept": "application/json",
-            "User-Agent": "fetch-url/1.0 (+https://github.com/DCjanus/prompts/tree/master/skills/fetch-url)",
-        },
-    )
+    headers = {
+        "Accept": "application/json",
+        "Accept-Encoding": HTTP_ACCEPT_ENCODING,
+        "User-Agent": "fetch-url/1.0 (+https://github.com/DCjanus/prompts/tree/master/skills/fetch-url)",
+    }
     try:
-        with urlopen(request, timeout=max(timeout_ms / 1000.0, 1.0)) as response:  # noqa: S310
-            payload = json.loads(response.read().decode("utf-8", errors="replace"))
-    except (URLError, OSError, json.JSONDecodeError) as exc:
+        with HTTP_POOL.open(
+            api_url, headers=headers, timeout=max(timeout_ms / 1000.0, 1.0)
+        ) as response:
+            content_type = response.headers.get_content_type()
+            if content_type != "application/json":
+                raise ValueError(f"unexpected content-type {content_type}")
+            payload = json.loads(read_response_text(response, max_bytes=max_bytes))
+    except (URLError, OSError, ValueError) as exc:
         if verbose:
             CONSOLE.print(
                 f"[yellow]FxTwitter API request failed[/yellow] ({exc})",
@@ -358,6 +842,172 @@ def fetch_fxtwitter_status(
     return payload
 
 
+def default_fxtwitter_cache_dir() -> Path:
+    """thread 展开时缓存 status JSON 的默认目录。"""
+
+    cache_root = os.getenv("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_root) / "fetch-url" / "fxtwitter"
+
+
+def _reply_parent_id(status: dict[str, Any]) -> str | None:
+    """兼容不同 FxTwitter payload 形态，读取被回复推文的 id。"""
+
+    value = status.get("replying_to_status")
+    if isinstance(value, dict):
+        value = value.get("id")
+    if not value:
+        replying_to = status.get("replying_to")
+        if isinstance(replying_to, dict):
+            value = replying_to.get("status") or replying_to.get("post")
+    value = str(value or "").strip()
+    return value if value.isdigit() else None
+
+
+def _unresolved_quote_id(status: dict[str, Any]) -> str | None:
+    """quote 只带 id、没有正文时返回其 id，需要额外抓取。"""
+
+    quote = status.get("quote")
+    if not isinstance(quote, dict) or quote.get("text"):
+        return None
+    quote_id = str(quote.get("id") or "").strip()
+    return quote_id if quote_id.isdigit() else None
+
+
+def load_fxtwitter_status(
+    status_id: str,
+    timeout_ms: int,
+    verbose: bool,
+    cache_dir: Path,
+    max_bytes: int = DEFAULT_MAX_RESPONSE_BYTES,
+) -> dict[str, Any] | None:
+    """获取单条推文，优先读取未过期的磁盘缓存（按 id 存放 status JSON）。"""
+
+    cache_path = cache_dir / f"{status_id}.json"
+    try:
+        if time() - cache_path.stat().st_mtime <= FXTWITTER_CACHE_TTL_SECONDS:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            if isinstance(cached, dict):
+                if verbose:
+                    CONSOLE.print(
+                        f"[cyan]Using cached status[/cyan] {status_id}",
+                        highlight=False,
+                    )
+                return cached
+    except (OSError, ValueError):
+        pass
+
+    payload = fetch_fxtwitter_status(
+        status_id, timeout_ms=timeout_ms, verbose=verbose, max_bytes=max_bytes
+    )
+    if payload is None:
+        return None
+    status = payload["status"]
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix(f".{threading.get_ident()}.tmp")
+        temp_path.write_text(json.dumps(status, ensure_ascii=False), encoding="utf-8")
+        temp_path.replace(cache_path)
+    except OSError:
+        pass
+    return status
+
+
+def expand_fxtwitter_thread(
+    payload: dict[str, Any],
+    timeout_ms: int,
+    verbose: bool,
+    cache_dir: Path,
+    max_bytes: int = DEFAULT_MAX_RESPONSE_BYTES,
+    max_statuses: int = FXTWITTER_EXPAND_MAX_STATUSES,
+) -> dict[str, Any]:
+    """补抓回复链与 quote 引用的推文，返回按时间排序整段对话的新 payload。
+
+    FxTwitter 只能从子推文读到父推文 id，回复链在深度上仍需逐层请求；
+    每个新发现的 id 会立即提交到线程池，quote 抓取不会拖慢回复链向上走。
+    """
+
+    root = payload["status"]
+    root_id = str(root.get("id") or "").strip()
+    conversation = {
+        str(entry["id"]): entry
+        for entry in _extract_thread_entries(payload, root_status_id=root_id)
+    }
+    statuses = {root_id: root, **conversation}
+    quotes: dict[str, dict[str, Any]] = {}
+    # id -> 需要它的角色（parent / quote）；同一条推文可能同时是两者。
+    roles: dict[str, set[str]] = {}
+    fetched: dict[str, dict[str, Any] | None] = {}
+    pending: dict[Future[dict[str, Any] | None], str] = {}
+
+    with ThreadPoolExecutor(max_workers=FXTWITTER_EXPAND_WORKERS) as pool:
+
+        def accept(status_id: str, status: dict[str, Any]) -> None:
+            if "quote" in roles[status_id]:
+                quotes[status_id] = status
+            if "parent" in roles[status_id] and status_id not in statuses:
+                statuses[status_id] = status
+                conversation[status_id] = status
+                schedule(status)
+
+        def request(status_id: str, role: str) -> None:
+            if status_id in roles:
+                if role in roles[status_id]:
+                    return
+                roles[status_id].add(role)
+                if fetched.get(status_id) is not None:
+                    accept(status_id, fetched[status_id])
+                return
+            if len(statuses) + len(roles) >= max_statuses:
+                return
+            roles[status_id] = {role}
+            future = pool.submit(
+                load_fxtwitter_status,
+                status_id,
+                timeout_ms=timeout_ms,
+                verbose=verbose,
+                cache_dir=cache_dir,
+                max_bytes=max_bytes,
+            )
+            pending[future] = status_id
+
+        def schedule(status: dict[str, Any]) -> None:
+            parent_id = _reply_parent_id(status)
+            if parent_id and parent_id not in statuses:
+                request(parent_id, "parent")
+            quote_id = _unresolved_quote_id(status)
+            if quote_id:
+                request(quote_id, "quote")
+
+        for status in list(statuses.values()):
+            schedule(status)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                status_id = pending.pop(future)
+                status = future.result()
+                fetched[status_id] = status
+                if status is not None:
+                    accept(status_id, status)
+
+    if verbose:
+        CONSOLE.print(
+            f"[cyan]Expanded thread[/cyan] {len(conversation)} replies, {len(quotes)} quotes",
+            highlight=False,
+        )
+
+    for status in statuses.values():
+        quote_id = _unresolved_quote_id(status)
+        if quote_id in quotes:
+            status["quote"] = quotes[quote_id]
+
+    # Snowflake id 随时间递增，可直接用于还原对话顺序。
+    ordered = sorted(
+        conversation.values(),
+        key=lambda item: int(item_id) if (item_id := str(item["id"])).isdigit() else 0,
+    )
+    return {**payload, "thread": ordered}
+
+
 def _extract_thread_entries(
     payload: dict[str, Any], root_status_id: str
 ) -> list[dict[str, Any]]:
@@ -403,7 +1053,29 @@ def _extract_thread_entries(
     return entries
 
 
-def _render_thread_item_markdown(item: dict[str, Any], index: int) -> list[str]:
+def _render_quote_markdown(quote: dict[str, Any]) -> list[str]:
+    """把 quote 推文渲染为 Markdown 引用块；没有正文时只给出链接。"""
+
+    author = quote.get("author", {})
+    author_name = escape_markdown_text(str(author.get("name") or "Unknown"))
+    screen_name = escape_markdown_text(str(author.get("screen_name") or "unknown"))
+    quote_url = str(quote.get("url") or "").strip()
+    header = f"> Quote: {author_name} (@{screen_name})"
+    if quote_url:
+        header += f" {quote_url}"
+    raw_text = quote.get("raw_text")
+    fallback_text = raw_text.get("text") if isinstance(raw_text, dict) else raw_text
+    text = str(quote.get("text") or fallback_text or "").strip()
+    lines = [header]
+    if text:
+        lines.append(">")
+        lines.extend(f"> {line}" for line in escape_markdown_text(text).splitlines())
+    return lines
+
+
+def _render_thread_item_markdown(
+    item: dict[str, Any], index: int, include_quotes: bool = False
+) -> list[str]:
     author = item.get("author", {})
     author_name = escape_markdown_text(str(author.get("name") or "Unknown"))
     screen_name = escape_markdown_text(str(author.get("screen_name") or "unknown"))
@@ -429,6 +1101,10 @@ def _render_thread_item_markdown(item: dict[str, Any], index: int) -> list[str]:
         lines.append(f"- URL: {item_url}")
     lines.extend(["", safe_text])
 
+    quote = item.get("quote")
+    if include_quotes and isinstance(quote, dict):
+        lines.extend(["", *_render_quote_markdown(quote)])
+
     media = item.get("media")
     if isinstance(media, dict):
         all_media = media.get("all")
@@ -448,8 +1124,10 @@ def _render_thread_item_markdown(item: dict[str, Any], index: int) -> list[str]:
     return lines
 
 
-def render_fxtwitter_markdown(payload: dict[str, Any], source_url: str) -> str:
-    """将 FxTwitter API 响应渲染为 Markdown。"""
+def render_fxtwitter_markdown(
+    payload: dict[str, Any], source_url: str, include_quotes: bool = False
+) -> str:
+    """将 FxTwitter API 响应渲染为 Markdown；`include_quotes` 时附带 quote 推文。"""
 
     status = payload.get("status", {})
     author = status.get("author", {})
@@ -493,6 +1171,10 @@ def render_fxtwitter_markdown(payload: dict[str, Any], source_url: str) -> str:
         safe_text,
     ]
 
+    quote = status.get("quote")
+    if include_quotes and isinstance(quote, dict):
+        lines.extend(["", "## Quote", *_render_quote_markdown(quote)])
+
     media = status.get("media")
     if isinstance(media, dict):
         all_media = media.get("all")
@@ -512,7 +1194,11 @@ def render_fxtwitter_markdown(payload: dict[str, Any], source_url: str) -> str:
     if thread_entries:
         lines.extend(["", "## Thread"])
         for index, thread_item in enumerate(thread_entries, start=1):
-            lines.extend(_render_thread_item_markdown(thread_item, index=index))
+            lines.extend(
+                _render_thread_item_markdown(
+                    thread_item, index=index, include_quotes=include_quotes
+                )
+            )
 
     return "\n".join(lines).strip() + "\n"
 
@@ -538,6 +1224,25 @@ def fetch(
         "auto",
         help="Fetch strategy for markdown: auto, agent, jina, browser.",
     ),
+    max_bytes: int = typer.Option(
+        DEFAULT_MAX_RESPONSE_BYTES,
+        min=1,
+        help="Maximum decoded body size in bytes for HTTP (non-browser) fetches.",
+    ),
+    wait_network_idle: bool = typer.Option(
+        False,
+        "--wait-network-idle",
+        help="Also wait for network idle before checking DOM settle (browser only).",
+    ),
+    expand_thread: bool = typer.Option(
+        False,
+        "--expand-thread",
+        help="Twitter/X only: fetch reply-chain and quoted statuses concurrently.",
+    ),
+    thread_cache_dir: Path | None = typer.Option(
+        None,
+        help="Cache directory for expanded status JSON. Defaults to ~/.cache/fetch-url/fxtwitter.",
+    ),
     verbose: bool = typer.Option(
         False, "--verbose", help="Print progress and diagnostic logs."
     ),
@@ -561,13 +1266,24 @@ def fetch(
                     twitter_status_id,
                     timeout_ms=timeout_ms,
                     verbose=verbose,
+                    max_bytes=max_bytes,
                 )
                 if payload is None:
                     raise ValueError(
                         "FxTwitter API request failed for this Twitter/X URL. "
                         "Use --fetch-strategy agent, jina, or browser to skip this path."
                     )
-                content = render_fxtwitter_markdown(payload, source_url=url)
+                if expand_thread:
+                    payload = expand_fxtwitter_thread(
+                        payload,
+                        timeout_ms=timeout_ms,
+                        verbose=verbose,
+                        cache_dir=thread_cache_dir or default_fxtwitter_cache_dir(),
+                        max_bytes=max_bytes,
+                    )
+                content = render_fxtwitter_markdown(
+                    payload, source_url=url, include_quotes=expand_thread
+                )
                 if verbose:
                     CONSOLE.print(
                         "[green]Using FxTwitter API markdown path[/green]",
@@ -577,17 +1293,24 @@ def fetch(
             if content is None:
                 if fetch_strategy == "auto":
                     content = fetch_agent_markdown(
-                        url, timeout_ms=timeout_ms, verbose=verbose
+                        url,
+                        timeout_ms=timeout_ms,
+                        verbose=verbose,
+                        max_bytes=max_bytes,
                     )
                     if content is None:
                         content = fetch_jina_reader_markdown(
                             url,
                             timeout_ms=timeout_ms,
                             verbose=verbose,
+                            max_bytes=max_bytes,
                         )
                 elif fetch_strategy == "agent":
                     content = fetch_agent_markdown(
-                        url, timeout_ms=timeout_ms, verbose=verbose
+                        url,
+                        timeout_ms=timeout_ms,
+                        verbose=verbose,
+                        max_bytes=max_bytes,
                     )
                     if content is None:
                         raise ValueError(
@@ -596,7 +1319,10 @@ def fetch(
                         )
                 elif fetch_strategy == "jina":
                     content = fetch_jina_reader_markdown(
-                        url, timeout_ms=timeout_ms, verbose=verbose
+                        url,
+                        timeout_ms=timeout_ms,
+                        verbose=verbose,
+                        max_bytes=max_bytes,
                     )
                     if content is None:
                         raise ValueError(
@@ -615,6 +1341,7 @@ def fetch(
                 timeout_ms=timeout_ms,
                 browser_path=resolved_browser_path,
                 verbose=verbose,
+                wait_network_idle=wait_network_idle,
             )
             content = (
                 html
@@ -654,5 +1381,365 @@ def fetch(
         CONSOLE.print(content, markup=False)
 
 
+def normalize_crawl_url(url: str, base_url: str | None = None) -> str | None:
+    """把链接规范化为可去重的绝对 URL；非 http/https 链接返回 None。"""
+
+    candidate = url.strip()
+    if base_url:
+        candidate = urljoin(base_url, candidate)
+    candidate, _fragment = urldefrag(candidate)
+    try:
+        parsed = urlsplit(candidate)
+        port = parsed.port
+    except ValueError:
+        return None
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    if scheme not in {"http", "https"} or not host:
+        return None
+    if ":" in host:
+        host = f"[{host}]"
+    if port is not None and (scheme, port) not in {("http", 80), ("https", 443)}:
+        host = f"{host}:{port}"
+    return urlunsplit((scheme, host, parsed.path or "/", parsed.query, ""))
+
+
+class _LinkCollector(HTMLParser):
+    """收集 HTML 中的 <a href> 与 <base href>。"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.base_href: str | None = None
+        self.hrefs: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        href = dict(attrs).get("href")
+        if not href:
+            return
+        if tag == "a":
+            self.hrefs.append(href)
+        elif tag == "base" and self.base_href is None:
+            self.base_href = href
+
+
+def extract_crawl_links(content: str, base_url: str, *, is_html: bool) -> list[str]:
+    """从渲染后的 HTML 或 Markdown 中提取规范化、去重后的页面链接。"""
+
+    if is_html:
+        collector = _LinkCollector()
+        collector.feed(content)
+        collector.close()
+        if collector.base_href:
+            base_url = urljoin(base_url, collector.base_href)
+        hrefs = collector.hrefs
+    else:
+        hrefs = CRAWL_MARKDOWN_LINK_RE.findall(content)
+
+    links: list[str] = []
+    seen: set[str] = set()
+    for href in hrefs:
+        normalized = normalize_crawl_url(href, base_url)
+        if normalized is None or normalized in seen:
+            continue
+        if urlsplit(normalized).path.lower().endswith(CRAWL_SKIPPED_SUFFIXES):
+            continue
+        seen.add(normalized)
+        links.append(normalized)
+    return links
+
+
+class RobotsCache:
+    """按 origin 缓存 robots.txt 解析结果。"""
+
+    def __init__(self, timeout_ms: int, verbose: bool) -> None:
+        self._timeout_ms = timeout_ms
+        self._verbose = verbose
+        self._parsers: dict[str, RobotFileParser] = {}
+        self._origin_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _parser(self, url: str) -> RobotFileParser:
+        parsed = urlsplit(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        with self._lock:
+            parser = self._parsers.get(origin)
+            if parser is not None:
+                return parser
+            origin_lock = self._origin_locks.setdefault(origin, threading.Lock())
+        # 只按 origin 串行加载，不同 host 的 robots.txt 可以并行抓取。
+        with origin_lock:
+            with self._lock:
+                parser = self._parsers.get(origin)
+            if parser is None:
+                parser = self._load(f"{origin}/robots.txt")
+                with self._lock:
+                    self._parsers[origin] = parser
+        return parser
+
+    def _load(self, robots_url: str) -> RobotFileParser:
+        parser = RobotFileParser(robots_url)
+        headers = {
+            "Accept-Encoding": HTTP_ACCEPT_ENCODING,
+            "User-Agent": CRAWL_USER_AGENT,
+        }
+        try:
+            with HTTP_POOL.open(
+                robots_url, headers=headers, timeout=max(self._timeout_ms / 1000.0, 1.0)
+            ) as response:
+                text = read_response_text(response, max_bytes=CRAWL_MAX_ROBOTS_BYTES)
+        except HTTPError as exc:
+            # 与 urllib.robotparser 一致：401/403 视为全站禁止，其它 4xx 视为不限制。
+            if exc.code in {401, 403}:
+                parser.disallow_all = True
+            elif 400 <= exc.code < 500:
+                parser.allow_all = True
+            else:
+                parser.allow_all = True
+                self._warn(robots_url, exc)
+            return parser
+        except (URLError, OSError, ValueError) as exc:
+            parser.allow_all = True
+            self._warn(robots_url, exc)
+            return parser
+
+        parser.parse(text.splitlines())
+        return parser
+
+    def _warn(self, robots_url: str, exc: Exception) -> None:
+        if self._verbose:
+            CONSOLE.print(
+                f"[yellow]robots.txt unavailable, crawling without it[/yellow] {robots_url} ({exc})",
+                highlight=False,
+            )
+
+    def can_fetch(self, url: str) -> bool:
+        return self._parser(url).can_fetch(CRAWL_USER_AGENT, url)
+
+    def crawl_delay(self, url: str) -> float | None:
+        delay = self._parser(url).crawl_delay(CRAWL_USER_AGENT)
+        return float(delay) if delay is not None else None
+
+
+def _crawl_output_name(index: int, url: str) -> str:
+    parsed = urlsplit(url)
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", f"{parsed.hostname}{parsed.path}").strip("-")
+    return f"{index:04d}-{slug[:80] or 'index'}.md"
+
+
+def _crawl_fetch_http(
+    url: str,
+    *,
+    fetch_strategy: FetchStrategy,
+    robots: RobotsCache,
+    per_host_delay: float,
+    timeout_ms: int,
+    max_bytes: int,
+    verbose: bool,
+) -> dict[str, Any]:
+    """在线程池中执行 robots 检查与非浏览器 Markdown 策略。"""
+
+    if not robots.can_fetch(url):
+        return {"status": "blocked-by-robots"}
+    # 抓取间隔直接收紧到 HTTP_POOL 的 host 令牌桶里，agent 请求由连接池限速。
+    HTTP_POOL.limit_host(url, max(per_host_delay, robots.crawl_delay(url) or 0.0))
+    if fetch_strategy == "browser":
+        return {"status": "pending"}
+
+    if fetch_strategy == "jina":
+        # Jina 代为访问页面，按页面 host 补扣一个令牌。
+        HTTP_POOL.throttle(url)
+    if fetch_strategy in {"auto", "agent"}:
+        markdown = fetch_agent_markdown(
+            url, timeout_ms=timeout_ms, verbose=verbose, max_bytes=max_bytes
+        )
+        if markdown is not None:
+            return {"status": "ok", "source": "agent", "content": markdown}
+    if fetch_strategy in {"auto", "jina"}:
+        markdown = fetch_jina_reader_markdown(
+            url, timeout_ms=timeout_ms, verbose=verbose, max_bytes=max_bytes
+        )
+        if markdown is not None:
+            return {"status": "ok", "source": "jina", "content": markdown}
+    if fetch_strategy == "auto":
+        return {"status": "pending"}
+    return {"status": "error", "error": f"{fetch_strategy} returned no usable content"}
+
+
+@CRAWL_APP.command()
+def crawl(
+    start_url: str = typer.Argument(..., help="Start URL of the crawl."),
+    output_dir: Path = typer.Option(
+        ..., help="Directory for per-page markdown files and manifest.json."
+    ),
+    depth: int = typer.Option(1, min=0, help="Maximum link depth from the start URL."),
+    max_pages: int = typer.Option(50, min=1, help="Maximum number of pages to fetch."),
+    same_host: bool = typer.Option(
+        True, "--same-host/--any-host", help="Only follow links on the start host."
+    ),
+    concurrency: int = typer.Option(
+        4, min=1, help="Concurrent HTTP fetches (browser renders stay serial)."
+    ),
+    per_host_delay: float = typer.Option(
+        1.0,
+        min=0.0,
+        help="Minimum seconds between requests to one host (tightens the shared per-host rate limit); robots.txt Crawl-delay wins if larger.",
+    ),
+    timeout_ms: int = typer.Option(
+        60000, help="Playwright navigation and HTTP timeout in milliseconds."
+    ),
+    browser_path: Path | None = typer.Option(
+        None,
+        help="Optional local Chromium-based browser path. Auto-detected if omitted.",
+    ),
+    fetch_strategy: FetchStrategy = typer.Option(
+        "auto",
+        help="Fetch strategy per page: auto, agent, jina, browser.",
+    ),
+    max_bytes: int = typer.Option(
+        DEFAULT_MAX_RESPONSE_BYTES,
+        min=1,
+        help="Maximum decoded body size in bytes for HTTP (non-browser) fetches.",
+    ),
+    wait_network_idle: bool = typer.Option(
+        False,
+        "--wait-network-idle",
+        help="Also wait for network idle before checking DOM settle (browser only).",
+    ),
+    verbose: bool = typer.Option(
+        False, "--verbose", help="Print progress and diagnostic logs."
+    ),
+) -> None:
+    """从起始 URL 按层抓取同站页面，逐页写出 Markdown 并生成 manifest.json。"""
+    start = normalize_crawl_url(start_url)
+    if start is None:
+        raise typer.BadParameter("Only http or https URLs are supported.")
+    start_host = urlsplit(start).netloc
+    resolved_browser_path = str(browser_path) if browser_path else detect_browser_path()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    robots = RobotsCache(timeout_ms=timeout_ms, verbose=verbose)
+    pages: list[dict[str, Any]] = []
+    seen = {start}
+    frontier = [start]
+    saved_count = 0
+
+    with ExitStack() as stack, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        browser: Any | None = None
+        for current_depth in range(depth + 1):
+            batch = frontier[: max_pages - saved_count]
+            if not batch:
+                break
+            if verbose:
+                CONSOLE.print(
+                    f"[cyan]Crawling depth {current_depth}[/cyan] ({len(batch)} pages)",
+                    highlight=False,
+                )
+            results = pool.map(
+                lambda page_url: _crawl_fetch_http(
+                    page_url,
+                    fetch_strategy=fetch_strategy,
+                    robots=robots,
+                    per_host_delay=per_host_delay,
+                    timeout_ms=timeout_ms,
+                    max_bytes=max_bytes,
+                    verbose=verbose,
+                ),
+                batch,
+            )
+
+            next_frontier: list[str] = []
+            for page_url, result in zip(batch, results):
+                links: list[str] = []
+                if result["status"] == "pending":
+                    # Playwright sync API 绑定当前线程，浏览器渲染在主线程串行复用同一实例。
+                    try:
+                        if browser is None:
+                            playwright = stack.enter_context(sync_playwright())
+                            browser = launch_browser(
+                                playwright, resolved_browser_path, verbose=verbose
+                            )
+                            stack.callback(browser.close)
+                        HTTP_POOL.throttle(page_url)
+                        html = render_page_html(
+                            browser,
+                            page_url,
+                            timeout_ms=timeout_ms,
+                            verbose=verbose,
+                            wait_network_idle=wait_network_idle,
+                        )
+                        links = extract_crawl_links(html, page_url, is_html=True)
+                        result = {
+                            "status": "ok",
+                            "source": "browser",
+                            "content": extract_content(
+                                html, page_url, "markdown", verbose=verbose
+                            ),
+                        }
+                    except (PlaywrightError, ValueError) as exc:
+                        result = {"status": "error", "error": str(exc)}
+                elif result["status"] == "ok":
+                    links = extract_crawl_links(
+                        result["content"], page_url, is_html=False
+                    )
+
+                entry: dict[str, Any] = {
+                    "url": page_url,
+                    "depth": current_depth,
+                    "status": result["status"],
+                }
+                if result["status"] == "ok":
+                    saved_count += 1
+                    file_name = _crawl_output_name(saved_count, page_url)
+                    (output_dir / file_name).write_text(
+                        result["content"], encoding="utf-8"
+                    )
+                    entry.update(
+                        source=result["source"], file=file_name, links=len(links)
+                    )
+                elif "error" in result:
+                    entry["error"] = result["error"]
+                pages.append(entry)
+                CONSOLE.print(
+                    f"[{'green' if result['status'] == 'ok' else 'yellow'}]"
+                    f"{result['status']}[/] {page_url}",
+                    highlight=False,
+                )
+
+                if current_depth >= depth:
+                    continue
+                for link in links:
+                    if link in seen:
+                        continue
+                    if same_host and urlsplit(link).netloc != start_host:
+                        continue
+                    seen.add(link)
+                    next_frontier.append(link)
+            frontier = next_frontier
+
+    manifest = {
+        "start_url": start,
+        "depth": depth,
+        "max_pages": max_pages,
+        "same_host": same_host,
+        "fetched": saved_count,
+        "pages": pages,
+    }
+    (output_dir / "manifest.json").write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+    )
+    CONSOLE.print(
+        f"[green]Saved {saved_count} pages and manifest to[/green] {output_dir}",
+        highlight=False,
+    )
+
+
+def main() -> None:
+    """`crawl` 作为子命令分发，其余参数保持原有单命令 fetch 用法。"""
+    if sys.argv[1:2] == ["crawl"]:
+        CRAWL_APP(args=sys.argv[2:], prog_name=f"{Path(sys.argv[0]).name} crawl")
+    else:
+        APP()
+
+
 if __name__ == "__main__":
-    APP()
+    main()
@@ -13,6 +13,8 @@ from __future__ import annotations
 
 import json
 import subprocess
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import typer
@@ -22,6 +24,25 @@ from rich.table import Table
 console = Console()
 error_console = Console(stderr=True)
 
+# GraphQL Repository 字段到 REST repository 字段的映射；枚举取值两边一致。
+GRAPHQL_SETTING_FIELDS = {
+    "squashMergeAllowed": "allow_squash_merge",
+    "mergeCommitAllowed": "allow_merge_commit",
+    "rebaseMergeAllowed": "allow_rebase_merge",
+    "squashMergeCommitTitle": "squash_merge_commit_title",
+    "squashMergeCommitMessage": "squash_merge_commit_message",
+    "deleteBranchOnMerge": "delete_branch_on_merge",
+}
+GRAPHQL_REPO_FIELDS = " ".join(["nameWithOwner", *GRAPHQL_SETTING_FIELDS])
+GRAPHQL_BATCH_SIZE = 50
+ORG_REPOS_QUERY = (
+    "query($org: String!, $endCursor: String) {"
+    " organization(login: $org) {"
+    " repositories(first: 100, after: $endCursor, isArchived: false) {"
+    f" nodes {{ {GRAPHQL_REPO_FIELDS} }}"
+    " pageInfo { hasNextPage endCursor } } } }"
+)
+
 app = typer.Typer(
     add_completion=False,
     no_args_is_help=True,
@@ -121,14 +142,23 @@ def apply_policy(*, repo: str, cwd: Path, hostname: str | None) -> dict[str, obj
     return response
 
 
+def diff_settings(payload: dict[str, object]) -> dict[str, dict[str, object]]:
+    """列出与预期不一致的字段。"""
+
+    return {
+        key: {"current": payload.get(key), "expected": expected}
+        for key, expected in expected_settings().items()
+        if payload.get(key) != expected
+    }
+
+
 def validate_settings(payload: dict[str, object]) -> None:
     """确认 GitHub repository 配置符合预期。"""
 
-    mismatches: list[str] = []
-    for key, expected in expected_settings().items():
-        actual = payload.get(key)
-        if actual != expected:
-            mismatches.append(f"- {key}: expected {expected!r}, got {actual!r}")
+    mismatches = [
+        f"- {key}: expected {change['expected']!r}, got {change['current']!r}"
+        for key, change in diff_settings(payload).items()
+    ]
 
     if mismatches:
         raise RuntimeError(
@@ -137,6 +167,187 @@ def validate_settings(payload: dict[str, object]) -> None:
         )
 
 
+def parse_json_documents(text: str) -> list[dict[str, object]]:
+    """解析 `gh api --paginate` 输出的多个连续 JSON 文档。"""
+
+    decoder = json.JSONDecoder()
+    documents: list[dict[str, object]] = []
+    index = 0
+    while True:
+        while index < len(text) and text[index].isspace():
+            index += 1
+        if index >= len(text):
+            return documents
+        try:
+            document, index = decoder.raw_decode(text, index)
+        except json.JSONDecodeError as exc:
+            raise RuntimeError("gh api did not return valid JSON") from exc
+        if isinstance(document, dict):
+            documents.append(document)
+
+
+def run_gh_graphql(
+    *,
+    query: str,
+    variables: dict[str, str],
+    cwd: Path,
+    hostname: str | None,
+    paginate: bool = False,
+) -> list[dict[str, object]]:
+    """通过 `gh api graphql` 查询；部分字段报错时仍返回已有的 data。"""
+
+    args = ["gh", "api", "graphql", "-f", f"query={query}"]
+    for name, value in variables.items():
+        args.extend(["-f", f"{name}={value}"])
+    if paginate:
+        args.append("--paginate")
+    if hostname:
+        args.extend(["--hostname", hostname])
+
+    result = subprocess.run(
+        args,
+        cwd=str(cwd),
+        input=None,
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+    documents = parse_json_documents(result.stdout) if result.stdout.strip() else []
+    if result.returncode != 0 and not any("data" in doc for doc in documents):
+        message = result.stderr.strip() or result.stdout.strip() or "gh api failed"
+        raise RuntimeError(message)
+    return documents
+
+
+def settings_from_graphql(node: dict[str, object]) -> dict[str, object]:
+    """把 GraphQL Repository 节点转成 REST 字段名。"""
+
+    return {rest: node.get(field) for field, rest in GRAPHQL_SETTING_FIELDS.items()}
+
+
+def fetch_repo_settings(
+    repos: list[str], *, cwd: Path, hostname: str | None
+) -> dict[str, dict[str, object] | None]:
+    """用带别名的 GraphQL 批量读取 repository 设置；不可见的 repo 映射为 None。"""
+
+    settings: dict[str, dict[str, object] | None] = {}
+    for start in range(0, len(repos), GRAPHQL_BATCH_SIZE):
+        batch = repos[start : start + GRAPHQL_BATCH_SIZE]
+        fields = []
+        for index, repo in enumerate(batch):
+            owner, name = repo.split("/")
+            fields.append(
+                f"r{index}: repository(owner: {json.dumps(owner)}, "
+                f"name: {json.dumps(name)}) {{ {GRAPHQL_REPO_FIELDS} }}"
+            )
+        documents = run_gh_graphql(
+            query="query { " + " ".join(fields) + " }",
+            variables={},
+            cwd=cwd,
+            hostname=hostname,
+        )
+        data = documents[0].get("data") if documents else None
+        if not isinstance(data, dict):
+            data = {}
+        for index, repo in enumerate(batch):
+            node = data.get(f"r{index}")
+            settings[repo] = (
+                settings_from_graphql(node) if isinstance(node, dict) else None
+            )
+    return settings
+
+
+def fetch_org_repo_settings(
+    org: str, *, cwd: Path, hostname: str | None
+) -> dict[str, dict[str, object] | None]:
+    """分页列出组织下未归档的 repository 及其当前设置。"""
+
+    documents = run_gh_graphql(
+        query=ORG_REPOS_QUERY,
+        variables={"org": org},
+        cwd=cwd,
+        hostname=hostname,
+        paginate=True,
+    )
+    settings: dict[str, dict[str, object] | None] = {}
+    for document in documents:
+        data = document.get("data")
+        organization = data.get("organization") if isinstance(data, dict) else None
+        if not isinstance(organization, dict):
+            raise RuntimeError(f"organization not found or not visible: {org}")
+        repositories = organization.get("repositories")
+        nodes = repositories.get("nodes") if isinstance(repositories, dict) else None
+        for node in nodes if isinstance(nodes, list) else []:
+            if isinstance(node, dict) and isinstance(node.get("nameWithOwner"), str):
+                settings[str(node["nameWithOwner"])] = settings_from_graphql(node)
+    return settings
+
+
+def read_repos_file(path: Path) -> list[str]:
+    """读取每行一个 owner/repo 的列表，忽略空行和 `#` 注释并去重。"""
+
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError as exc:
+        raise RuntimeError(f"failed to read repos file {path}: {exc}") from exc
+    repos: list[str] = []
+    for line in lines:
+        value = line.split("#", 1)[0].strip()
+        if value:
+            repo = normalize_repo(value)
+            if repo not in repos:
+                repos.append(repo)
+    return repos
+
+
+def rollout_repo(
+    repo: str,
+    current: dict[str, object] | None,
+    *,
+    cwd: Path,
+    hostname: str | None,
+    dry_run: bool,
+) -> dict[str, object]:
+    """对单个 repo 先比对再按需写入，返回一条结果记录。"""
+
+    if current is None:
+        return {
+            "repo": repo,
+            "status": "failed",
+            "error": "repository not found or not visible",
+        }
+    changes = diff_settings(current)
+    if not changes:
+        return {"repo": repo, "status": "unchanged"}
+    if dry_run:
+        return {"repo": repo, "status": "would_update", "changes": changes}
+    try:
+        apply_policy(repo=repo, cwd=cwd, hostname=hostname)
+    except RuntimeError as exc:
+        return {"repo": repo, "status": "failed", "changes": changes, "error": str(exc)}
+    return {"repo": repo, "status": "updated", "changes": changes}
+
+
+def rollout_policy(
+    settings: dict[str, dict[str, object] | None],
+    *,
+    cwd: Path,
+    hostname: str | None,
+    workers: int,
+    dry_run: bool,
+) -> Iterator[dict[str, object]]:
+    """并发处理多个 repo，按输入顺序产出结果。"""
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(
+            lambda repo, current: rollout_repo(
+                repo, current, cwd=cwd, hostname=hostname, dry_run=dry_run
+            ),
+            settings.keys(),
+            settings.values(),
+        )
+
+
 def print_result(payload: dict[str, object]) -> None:
     """输出 repository merge 配置摘要。"""
 
@@ -157,9 +368,21 @@ def print_result(payload: dict[str, object]) -> None:
 
 @app.command()
 def main(
-    repo: str = typer.Option(
-        ..., "--repo", help="GitHub repository，格式 owner/repo。"
+    repo: str | None = typer.Option(
+        None, "--repo", help="GitHub repository，格式 owner/repo。"
+    ),
+    repos_file: Path | None = typer.Option(
+        None,
+        "--repos-file",
+        exists=True,
+        dir_okay=False,
+        help="批量模式：每行一个 owner/repo。",
     ),
+    org: str | None = typer.Option(
+        None, "--org", help="批量模式：处理组织下所有未归档的 repository。"
+    ),
+    workers: int = typer.Option(8, "--workers", min=1, help="批量模式的并发数。"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="只比对，不写入。"),
     cwd: Path = typer.Option(
         Path.cwd(),
         "--cwd",
@@ -173,6 +396,35 @@ def main(
 ) -> None:
     """应用 squash-only merge policy。"""
 
+    if sum(value is not None for value in (repo, repos_file, org)) != 1:
+        error_console.print("exactly one of --repo, --repos-file, --org is required")
+        raise typer.Exit(code=2)
+
+    if repo is None or dry_run:
+        try:
+            if repo is not None:
+                settings = fetch_repo_settings(
+                    [normalize_repo(repo)], cwd=cwd, hostname=hostname
+                )
+            elif repos_file is not None:
+                settings = fetch_repo_settings(
+                    read_repos_file(repos_file), cwd=cwd, hostname=hostname
+                )
+            else:
+                settings = fetch_org_repo_settings(str(org), cwd=cwd, hostname=hostname)
+        except RuntimeError as exc:
+            error_console.print(str(exc))
+            raise typer.Exit(code=1) from exc
+        failed = False
+        for record in rollout_policy(
+            settings, cwd=cwd, hostname=hostname, workers=workers, dry_run=dry_run
+        ):
+            failed = failed or record["status"] == "failed"
+            typer.echo(json.dumps(record, ensure_ascii=True))
+        if failed:
+            raise typer.Exit(code=1)
+        return
+
     try:
         response = apply_policy(repo=repo, cwd=cwd, hostname=hostname)
     except RuntimeError as exc:
@@ -14,10 +14,15 @@
 
 from __future__ import annotations
 
+import importlib.util
 import json
 import os
+import random
 import re
 import subprocess
+import threading
+import time
+from collections.abc import Callable
 from pathlib import Path, PurePosixPath
 from typing import Annotated, Any, Literal
 from urllib.parse import quote, urlparse
@@ -33,6 +38,13 @@ from rich.table import Table
 API_VERSION = "2022-11-28"
 METADATA_PERMISSIONS = {"ADMIN", "MAINTAIN", "WRITE", "TRIAGE"}
 TEMPLATE_SUFFIXES = {".md", ".yml", ".yaml"}
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUS_CODES = frozenset({500, 502, 503, 504})
+MAX_REQUEST_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_CAP_SECONDS = 60.0
+SECONDARY_RATE_LIMIT_WAIT_SECONDS = 60.0
+RATE_LIMIT_RESERVE = 50
 
 app = typer.Typer(
     add_completion=False,
@@ -196,6 +208,161 @@ def resolve_token(hostname: str) -> str:
     return token
 
 
+def http2_available() -> bool:
+    """`h2` 可导入时才启用 HTTP/2，否则保持 HTTP/1.1 keep-alive。"""
+
+    return importlib.util.find_spec("h2") is not None
+
+
+def request_rate_limit_resource(request: httpx2.Request) -> str:
+    """按请求路径推断其消耗的 rate limit resource。"""
+
+    path = request.url.path
+    if path.endswith("/graphql"):
+        return "graphql"
+    if "/search/" in path:
+        return "search"
+    return "core"
+
+
+def backoff_delay(attempt: int) -> float:
+    """第 `attempt` 次失败后的 full-jitter 指数退避时长。"""
+
+    return random.uniform(
+        0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+    )
+
+
+def header_number(headers: httpx2.Headers, name: str) -> float | None:
+    """读取数值型响应头；缺失或格式不对时返回 None。"""
+
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class RateLimitBudget:
+    """根据 `X-RateLimit-*` 响应头跟踪各 resource 的剩余额度并给出发送前等待时长。"""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state: dict[str, tuple[float, float]] = {}
+
+    def record(self, resource: str, headers: httpx2.Headers) -> None:
+        """记录一次响应携带的剩余额度与重置时间。"""
+
+        remaining = header_number(headers, "x-ratelimit-remaining")
+        reset_at = header_number(headers, "x-ratelimit-reset")
+        if remaining is None or reset_at is None:
+            return
+        resource = headers.get("x-ratelimit-resource") or resource
+        with self._lock:
+            self._state[resource] = (remaining, reset_at)
+
+    def delay(self, resource: str) -> float:
+        """额度耗尽时等到重置；接近耗尽时把剩余额度均摊到重置前的窗口。"""
+
+        with self._lock:
+            state = self._state.get(resource)
+            if state is None:
+                return 0.0
+            remaining, reset_at = state
+            window = reset_at - self._clock()
+            if window <= 0:
+                self._state.pop(resource)
+                return 0.0
+            if remaining <= 0:
+                return window + 1
+            # 并发请求各自占用一份额度，避免同时按同一个 remaining 计算。
+            self._state[resource] = (remaining - 1, reset_at)
+            if remaining < RATE_LIMIT_RESERVE:
+                return window / remaining
+            return 0.0
+
+
+class GitHubTransport(httpx2.BaseTransport):
+    """在连接池之上按 rate limit 额度调度请求，并对可安全重放的失败做退避重试。"""
+
+    def __init__(
+        self,
+        inner: httpx2.BaseTransport,
+        *,
+        budget: RateLimitBudget | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+        max_attempts: int = MAX_REQUEST_ATTEMPTS,
+    ) -> None:
+        self.inner = inner
+        self.budget = budget or RateLimitBudget(clock)
+        self._sleep = sleep
+        self._clock = clock
+        self.max_attempts = max_attempts
+
+    def handle_request(self, request: httpx2.Request) -> httpx2.Response:
+        resource = request_rate_limit_resource(request)
+        attempt = 1
+        while True:
+            self._wait(self.budget.delay(resource), reason=f"{resource} rate limit")
+            try:
+                response = self.inner.handle_request(request)
+            except httpx2.TransportError:
+                if (
+                    attempt >= self.max_attempts
+                    or request.method not in IDEMPOTENT_METHODS
+                ):
+                    raise
+                self._wait(backoff_delay(attempt), reason="transport error")
+                attempt += 1
+                continue
+            self.budget.record(resource, response.headers)
+            delay = self.retry_delay(request, response, attempt)
+            if delay is None or attempt >= self.max_attempts:
+                return response
+            response.close()
+            self._wait(delay, reason=f"HTTP {response.status_code}")
+            attempt += 1
+
+    def retry_delay(
+        self, request: httpx2.Request, response: httpx2.Response, attempt: int
+    ) -> float | None:
+        """返回重试前的等待时长；不应重试时返回 None。"""
+
+        retry_after = header_number(response.headers, "retry-after")
+        if response.status_code in {403, 429}:
+            # 触发 rate limit 的请求不会被 GitHub 处理，任何方法都可以安全重放。
+            if retry_after is not None:
+                return retry_after
+            if header_number(response.headers, "x-ratelimit-remaining") == 0:
+                reset_at = header_number(response.headers, "x-ratelimit-reset")
+                if reset_at is not None:
+                    return max(reset_at - self._clock(), 0) + 1
+            response.read()
+            if "secondary rate limit" in response.text.lower():
+                return SECONDARY_RATE_LIMIT_WAIT_SECONDS
+            return None
+        if (
+            response.status_code in RETRYABLE_STATUS_CODES
+            and request.method in IDEMPOTENT_METHODS
+        ):
+            return retry_after if retry_after is not None else backoff_delay(attempt)
+        return None
+
+    def _wait(self, seconds: float, *, reason: str) -> None:
+        if seconds <= 0:
+            return
+        if seconds >= 1:
+            error_console.print(f"GitHub API: waiting {seconds:.0f}s ({reason})")
+        self._sleep(seconds)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
 class GitHubApi:
     """使用 token 直接调用 GitHub REST 与 GraphQL API。"""
 
@@ -216,6 +383,9 @@ class GitHubApi:
             },
             follow_redirects=True,
             timeout=30.0,
+            transport=GitHubTransport(
+                httpx2.HTTPTransport(http2=http2_available(), retries=2)
+            ),
         )
 
     def close(self) -> None:
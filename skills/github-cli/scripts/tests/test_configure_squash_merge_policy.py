@@ -4,6 +4,8 @@ import importlib.util
 import json
 from pathlib import Path
 
+from typer.testing import CliRunner
+
 
 SCRIPT_PATH = Path(__file__).resolve().parents[1] / "configure_squash_merge_policy.py"
 SPEC = importlib.util.spec_from_file_location(
@@ -150,3 +152,108 @@ def test_validate_settings_reports_mismatch() -> None:
 
     assert "verification failed" in message
     assert "- allow_merge_commit: expected False, got True" in message
+
+
+def test_batch_rollout_reads_once_and_only_updates_mismatched_repos(
+    monkeypatch, tmp_path: Path
+) -> None:
+    calls: list[list[str]] = []
+    matching = {
+        "nameWithOwner": "acme/ok",
+        "squashMergeAllowed": True,
+        "mergeCommitAllowed": False,
+        "rebaseMergeAllowed": False,
+        "squashMergeCommitTitle": "PR_TITLE",
+        "squashMergeCommitMessage": "PR_BODY",
+        "deleteBranchOnMerge": True,
+    }
+    drifted = {**matching, "nameWithOwner": "acme/drift", "mergeCommitAllowed": True}
+
+    class FakeCompletedProcess:
+        def __init__(self, stdout: str, returncode: int = 0) -> None:
+            self.returncode = returncode
+            self.stdout = stdout
+            self.stderr = ""
+
+    def fake_run(args: list[str], **_kwargs: object) -> FakeCompletedProcess:
+        calls.append(args)
+        if args[2] == "graphql":
+            data = {"r0": matching, "r1": drifted, "r2": None}
+            return FakeCompletedProcess(json.dumps({"data": data}), returncode=1)
+        return FakeCompletedProcess(
+            json.dumps(configure_squash_merge_policy.expected_settings())
+        )
+
+    monkeypatch.setattr(configure_squash_merge_policy.subprocess, "run", fake_run)
+    repos_file = tmp_path / "repos.txt"
+    repos_file.write_text(
+        "acme/ok\n# comment\nhttps://github.com/acme/drift.git\n\nacme/gone\nacme/ok\n",
+        encoding="utf-8",
+    )
+
+    settings = configure_squash_merge_policy.fetch_repo_settings(
+        configure_squash_merge_policy.read_repos_file(repos_file),
+        cwd=tmp_path,
+        hostname=None,
+    )
+    records = list(
+        configure_squash_merge_policy.rollout_policy(
+            settings, cwd=tmp_path, hostname=None, workers=4, dry_run=False
+        )
+    )
+
+    assert [(record["repo"], record["status"]) for record in records] == [
+        ("acme/ok", "unchanged"),
+        ("acme/drift", "updated"),
+        ("acme/gone", "failed"),
+    ]
+    assert records[1]["changes"] == {
+        "allow_merge_commit": {"current": True, "expected": False}
+    }
+    assert len([args for args in calls if args[2] == "graphql"]) == 1
+    assert [args[2:5] for args in calls if args[2] != "graphql"] == [
+        ["repos/acme/drift", "--method", "PATCH"],
+        ["repos/acme/drift", "--method", "GET"],
+    ]
+
+
+def test_single_repo_dry_run_only_reads(monkeypatch, tmp_path: Path) -> None:
+    calls: list[list[str]] = []
+    drifted = {
+        "squashMergeAllowed": True,
+        "mergeCommitAllowed": True,
+        "rebaseMergeAllowed": False,
+        "squashMergeCommitTitle": "PR_TITLE",
+        "squashMergeCommitMessage": "PR_BODY",
+        "deleteBranchOnMerge": True,
+    }
+
+    class FakeCompletedProcess:
+        returncode = 0
+        stdout = json.dumps({"data": {"r0": drifted}})
+        stderr = ""
+
+    def fake_run(args: list[str], **_kwargs: object) -> FakeCompletedProcess:
+        calls.append(args)
+        return FakeCompletedProcess()
+
+    monkeypatch.setattr(configure_squash_merge_policy.subprocess, "run", fake_run)
+
+    result = CliRunner().invoke(
+        configure_squash_merge_policy.app,
+        [
+            "--repo",
+            "https://github.com/acme/drift.git",
+            "--dry-run",
+            "--cwd",
+            str(tmp_path),
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == {
+        "repo": "acme/drift",
+        "status": "would_update",
+        "changes": {"allow_merge_commit": {"current": True, "expected": False}},
+    }
+    assert [args[2] for args in calls] == ["graphql"]
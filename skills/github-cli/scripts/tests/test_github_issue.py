@@ -3,6 +3,7 @@ from __future__ import annotations
 import importlib.util
 import sys
 from pathlib import Path
+from typing import Any
 
 import pytest
 
@@ -195,3 +196,84 @@ def test_verify_issue_reports_missing_template_metadata() -> None:
     assert result.ok is False
     assert result.missing_labels == ["triage"]
     assert result.missing_assignees == ["octocat"]
+
+
+def make_transport(responses: list[Any], sleeps: list[float]) -> tuple[Any, list[str]]:
+    calls: list[str] = []
+
+    def handler(request: Any) -> Any:
+        calls.append(f"{request.method} {request.url.path}")
+        return responses.pop(0)
+
+    transport = github_issue.GitHubTransport(
+        github_issue.httpx2.MockTransport(handler),
+        sleep=sleeps.append,
+        clock=lambda: 1000.0,
+    )
+    return transport, calls
+
+
+def test_transport_retries_idempotent_requests_on_server_errors() -> None:
+    httpx2 = github_issue.httpx2
+    sleeps: list[float] = []
+    transport, calls = make_transport(
+        [
+            httpx2.Response(503, headers={"Retry-After": "2"}),
+            httpx2.Response(200, json={"ok": True}),
+            httpx2.Response(502),
+        ],
+        sleeps,
+    )
+    client = httpx2.Client(transport=transport)
+
+    assert client.get("https://api.github.com/repos/a/b").json() == {"ok": True}
+    assert client.post("https://api.github.com/repos/a/b/issues").status_code == 502
+    assert calls == [
+        "GET /repos/a/b",
+        "GET /repos/a/b",
+        "POST /repos/a/b/issues",
+    ]
+    assert sleeps == [2.0]
+
+
+def test_transport_waits_out_rate_limits_before_replaying() -> None:
+    httpx2 = github_issue.httpx2
+    sleeps: list[float] = []
+    transport, calls = make_transport(
+        [
+            httpx2.Response(
+                403,
+                json={"message": "You have exceeded a secondary rate limit."},
+            ),
+            httpx2.Response(
+                201,
+                json={"number": 1},
+                headers={
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": "1010",
+                    "X-RateLimit-Resource": "core",
+                },
+            ),
+            httpx2.Response(200, json={}),
+        ],
+        sleeps,
+    )
+    client = httpx2.Client(transport=transport)
+
+    assert client.post("https://api.github.com/repos/a/b/issues").status_code == 201
+    assert client.get("https://api.github.com/repos/a/b").status_code == 200
+    assert len(calls) == 3
+    assert sleeps == [github_issue.SECONDARY_RATE_LIMIT_WAIT_SECONDS, 11.0]
+
+
+def test_rate_limit_budget_spreads_requests_when_nearly_exhausted() -> None:
+    budget = github_issue.RateLimitBudget(clock=lambda: 1000.0)
+    budget.record(
+        "core",
+        github_issue.httpx2.Headers(
+            {"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "1100"}
+        ),
+    )
+
+    assert budget.delay("core") == 10.0
+    assert budget.delay("graphql") == 0.0
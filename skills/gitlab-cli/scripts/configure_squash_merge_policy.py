@@ -13,6 +13,8 @@ from __future__ import annotations
 
 import json
 import subprocess
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import quote
 
@@ -130,14 +132,23 @@ def apply_policy(*, project: str, cwd: Path, hostname: str | None) -> dict[str,
     return response
 
 
+def diff_settings(payload: dict[str, object]) -> dict[str, dict[str, object]]:
+    """列出与预期不一致的字段。"""
+
+    return {
+        key: {"current": payload.get(key), "expected": expected}
+        for key, expected in expected_settings().items()
+        if payload.get(key) != expected
+    }
+
+
 def validate_settings(payload: dict[str, object]) -> None:
     """确认 GitLab project 配置符合预期。"""
 
-    mismatches: list[str] = []
-    for key, expected in expected_settings().items():
-        actual = payload.get(key)
-        if actual != expected:
-            mismatches.append(f"- {key}: expected {expected!r}, got {actual!r}")
+    mismatches = [
+        f"- {key}: expected {change['expected']!r}, got {change['current']!r}"
+        for key, change in diff_settings(payload).items()
+    ]
 
     if mismatches:
         raise RuntimeError(
@@ -146,6 +157,97 @@ def validate_settings(payload: dict[str, object]) -> None:
         )
 
 
+def parse_json_pages(text: str) -> list[dict[str, object]]:
+    """解析 `glab api --paginate` 输出的多个连续 JSON 数组。"""
+
+    decoder = json.JSONDecoder()
+    items: list[dict[str, object]] = []
+    index = 0
+    while True:
+        while index < len(text) and text[index].isspace():
+            index += 1
+        if index >= len(text):
+            return items
+        try:
+            page, index = decoder.raw_decode(text, index)
+        except json.JSONDecodeError as exc:
+            raise RuntimeError("glab api did not return valid JSON") from exc
+        if not isinstance(page, list):
+            raise RuntimeError("unexpected API response shape")
+        items.extend(item for item in page if isinstance(item, dict))
+
+
+def list_group_projects(
+    *, group: str, cwd: Path, hostname: str | None
+) -> list[dict[str, object]]:
+    """分页列出 group（含子 group）下未归档的 project 及其当前设置。"""
+
+    query = "include_subgroups=true&archived=false&per_page=100"
+    args = [
+        "glab",
+        "api",
+        f"groups/{encode_project(group)}/projects?{query}",
+        "--paginate",
+    ]
+    if hostname:
+        args.extend(["--hostname", hostname])
+
+    result = subprocess.run(
+        args,
+        cwd=str(cwd),
+        input=None,
+        text=True,
+        capture_output=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        message = result.stderr.strip() or result.stdout.strip() or "glab api failed"
+        raise RuntimeError(message)
+    return parse_json_pages(result.stdout)
+
+
+def rollout_project(
+    project: dict[str, object],
+    *,
+    cwd: Path,
+    hostname: str | None,
+    dry_run: bool,
+) -> dict[str, object]:
+    """对单个 project 先比对再按需写入，返回一条结果记录。"""
+
+    name = str(project.get("path_with_namespace") or project.get("id"))
+    record: dict[str, object] = {"project": name, "id": project.get("id")}
+    changes = diff_settings(project)
+    if not changes:
+        return {**record, "status": "unchanged"}
+    if dry_run:
+        return {**record, "status": "would_update", "changes": changes}
+    try:
+        apply_policy(project=str(project.get("id")), cwd=cwd, hostname=hostname)
+    except RuntimeError as exc:
+        return {**record, "status": "failed", "changes": changes, "error": str(exc)}
+    return {**record, "status": "updated", "changes": changes}
+
+
+def rollout_policy(
+    projects: list[dict[str, object]],
+    *,
+    cwd: Path,
+    hostname: str | None,
+    workers: int,
+    dry_run: bool,
+) -> Iterator[dict[str, object]]:
+    """并发处理多个 project，按输入顺序产出结果。"""
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(
+            lambda project: rollout_project(
+                project, cwd=cwd, hostname=hostname, dry_run=dry_run
+            ),
+            projects,
+        )
+
+
 def print_result(payload: dict[str, object]) -> None:
     """输出 project merge / squash 配置摘要。"""
 
@@ -165,9 +267,14 @@ def print_result(payload: dict[str, object]) -> None:
 
 @app.command()
 def main(
-    project: str = typer.Option(
-        ..., "--project", help="GitLab project id 或 group/project。"
+    project: str | None = typer.Option(
+        None, "--project", help="GitLab project id 或 group/project。"
+    ),
+    group: str | None = typer.Option(
+        None, "--group", help="批量模式：处理 group（含子 group）下所有未归档 project。"
     ),
+    workers: int = typer.Option(8, "--workers", min=1, help="批量模式的并发数。"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="只比对，不写入。"),
     cwd: Path = typer.Option(
         Path.cwd(),
         "--cwd",
@@ -181,8 +288,39 @@ def main(
 ) -> None:
     """应用 semi-linear + always squash merge policy。"""
 
+    if (project is None) == (group is None):
+        error_console.print("exactly one of --project, --group is required")
+        raise typer.Exit(code=2)
+
+    if group is not None or dry_run:
+        try:
+            if group is not None:
+                projects = list_group_projects(group=group, cwd=cwd, hostname=hostname)
+            else:
+                projects = [
+                    run_glab_api(
+                        project=str(project),
+                        method="GET",
+                        payload=None,
+                        cwd=cwd,
+                        hostname=hostname,
+                    )
+                ]
+        except RuntimeError as exc:
+            error_console.print(str(exc))
+            raise typer.Exit(code=1) from exc
+        failed = False
+        for record in rollout_policy(
+            projects, cwd=cwd, hostname=hostname, workers=workers, dry_run=dry_run
+        ):
+            failed = failed or record["status"] == "failed"
+            typer.echo(json.dumps(record, ensure_ascii=True))
+        if failed:
+            raise typer.Exit(code=1)
+        return
+
     try:
-        response = apply_policy(project=project, cwd=cwd, hostname=hostname)
+        response = apply_policy(project=str(project), cwd=cwd, hostname=hostname)
     except RuntimeError as exc:
         error_console.print(str(exc))
         raise typer.Exit(code=1) from exc
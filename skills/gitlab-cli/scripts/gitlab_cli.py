@@ -11,12 +11,22 @@
 
 from __future__ import annotations
 
+import hashlib
+import http.client
 import json
+import os
 import re
+import ssl
 import subprocess
+import threading
+import time
+import urllib.request
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal
-from urllib.parse import quote
+from urllib.parse import quote, urlsplit
 
 import typer
 from rich.console import Console
@@ -41,6 +51,40 @@ app.add_typer(mr_app, name="mr")
 app.add_typer(issue_app, name="issue")
 
 ToggleChoice = Literal["true", "false"]
+TransportMode = Literal["auto", "native", "glab"]
+
+HTTP_TIMEOUT_SECONDS = 60.0
+TOKEN_ENV_VARS = ("GITLAB_TOKEN", "GITLAB_ACCESS_TOKEN", "OAUTH_TOKEN")
+HOST_ENV_VARS = ("GITLAB_HOST", "GL_HOST")
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+MR_SOURCE_BRANCH_TTL_SECONDS = 300.0
+CI_LINT_CACHE_TTL_SECONDS = 24 * 3600.0
+ISSUE_BULK_FIELDS = frozenset(
+    {
+        "title",
+        "description",
+        "labels",
+        "assignee_ids",
+        "milestone_id",
+        "confidential",
+        "due_date",
+    }
+)
+MR_BULK_FIELDS = frozenset(
+    {
+        "title",
+        "description",
+        "labels",
+        "source_branch",
+        "target_branch",
+        "reviewer_ids",
+        "assignee_ids",
+        "milestone_id",
+        "remove_source_branch",
+        "squash",
+    }
+)
+CI_INCLUDE_PATTERN = re.compile(r"""['"]?(/?[\w.*/-]+\.ya?ml)['"]?""")
 
 
 class GitLabApiError(RuntimeError):
@@ -71,6 +115,8 @@ class GitLabApiError(RuntimeError):
             lines.append("glab stderr:")
             lines.append(stderr)
         super().__init__("\n".join(lines))
+        self.status_line = status_line
+        self.request_id = request_id
 
 
 def encode_project(project: str) -> str:
@@ -196,6 +242,295 @@ def split_glab_http_response(raw: str) -> tuple[str | None, dict[str, str], str]
     return status_line, headers, body
 
 
+def transport_mode() -> TransportMode:
+    """读取 `GITLAB_CLI_TRANSPORT`：auto（默认）、native 或 glab。"""
+
+    value = os.environ.get("GITLAB_CLI_TRANSPORT", "auto").strip().lower()
+    if value == "native":
+        return "native"
+    if value == "glab":
+        return "glab"
+    return "auto"
+
+
+def glab_config_path() -> Path:
+    """定位 glab 的全局配置文件。"""
+
+    explicit = os.environ.get("GLAB_CONFIG_DIR", "").strip()
+    if explicit:
+        return Path(explicit).expanduser() / "config.yml"
+    config_root = os.environ.get("XDG_CONFIG_HOME") or str(Path.home() / ".config")
+    return Path(config_root) / "glab-cli" / "config.yml"
+
+
+def parse_yaml_scalar(raw: str) -> str:
+    """解析 glab 配置里的单行标量值。"""
+
+    value = raw.strip()
+    if value.startswith("!!"):
+        # 带 YAML tag 的值（如 keyring 占位）无法直接使用。
+        return ""
+    if value[:1] in {"'", '"'}:
+        quote_char = value[0]
+        end = value.find(quote_char, 1)
+        return value[1:end] if end > 0 else value[1:]
+    return value.split(" #", 1)[0].strip()
+
+
+def read_glab_config(path: Path) -> tuple[str, dict[str, dict[str, str]]]:
+    """读取 glab 配置中的默认 host 与 `hosts.<host>.<key>` 标量。
+
+    glab 配置由 glab 自己生成，结构固定；这里只解析需要的这一小部分，
+    避免为此引入 YAML 依赖。
+    """
+
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return "", {}
+
+    default_host = ""
+    hosts: dict[str, dict[str, str]] = {}
+    in_hosts = False
+    host_indent = -1
+    current: dict[str, str] | None = None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        indent = len(line) - len(line.lstrip(" "))
+        key, sep, value = stripped.partition(":")
+        if not sep:
+            continue
+        if indent == 0:
+            in_hosts = key == "hosts"
+            current = None
+            host_indent = -1
+            if key == "host":
+                default_host = parse_yaml_scalar(value)
+            continue
+        if not in_hosts:
+            continue
+        if host_indent < 0 or indent <= host_indent:
+            host_indent = indent
+            current = hosts.setdefault(parse_yaml_scalar(key), {})
+            continue
+        if current is not None and value.strip():
+            current[key.strip()] = parse_yaml_scalar(value)
+    return default_host, hosts
+
+
+def parse_git_remote(url: str) -> tuple[str, str] | None:
+    """从 git remote URL 解析 `(host, project path)`。"""
+
+    url = url.strip()
+    if "://" in url:
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        path = parts.path
+    else:
+        match = re.fullmatch(r"(?:[^@/]+@)?([^:/]+):(.+)", url)
+        if not match:
+            return None
+        host, path = match.group(1), match.group(2)
+    path = path.strip("/").removesuffix(".git")
+    if not host or not path:
+        return None
+    return host, path
+
+
+def current_remote(cwd: Path) -> tuple[str, str] | None:
+    """读取当前仓库 origin 对应的 GitLab host 与 project path。"""
+
+    try:
+        url = run_git(["remote", "get-url", "origin"], cwd=cwd)
+    except (RuntimeError, OSError):
+        return None
+    return parse_git_remote(url)
+
+
+@dataclass(frozen=True)
+class NativeTarget:
+    """进程内 HTTP 调用所需的 GitLab 实例信息。"""
+
+    scheme: str
+    api_host: str
+    token: str
+    ca_cert: str | None
+    project: str | None
+
+
+class GitLabHttpTransport:
+    """复用 glab 已保存的凭据，用线程内 keep-alive 连接直接调用 REST API。"""
+
+    def __init__(self, target: NativeTarget) -> None:
+        self.target = target
+        self._local = threading.local()
+        self._ssl_context = (
+            ssl.create_default_context(cafile=target.ca_cert)
+            if target.scheme == "https"
+            else None
+        )
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            if self.target.scheme == "https":
+                connection = http.client.HTTPSConnection(
+                    self.target.api_host,
+                    timeout=HTTP_TIMEOUT_SECONDS,
+                    context=self._ssl_context,
+                )
+            else:
+                connection = http.client.HTTPConnection(
+                    self.target.api_host, timeout=HTTP_TIMEOUT_SECONDS
+                )
+            self._local.connection = connection
+        return connection
+
+    def _reset(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+        self._local.connection = None
+
+    def send(
+        self, method: str, path: str, body: bytes | None
+    ) -> tuple[int, str, dict[str, str], bytes]:
+        """发送请求；复用的空闲连接被服务端关闭时换新连接重发一次。
+
+        只重发幂等请求：连接断开时服务端可能已处理 POST，重发会重复创建资源。
+        """
+
+        headers = {
+            "Authorization": f"Bearer {self.target.token}",
+            "Accept": "application/json",
+            "User-Agent": "gitlab-cli-skill",
+        }
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        for _attempt in range(2):
+            reused = getattr(self._local, "connection", None) is not None
+            connection = self._connection()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                raw = response.read()
+            except (http.client.HTTPException, OSError) as exc:
+                self._reset()
+                if (
+                    reused
+                    and method in IDEMPOTENT_METHODS
+                    and isinstance(exc, (ConnectionError, http.client.HTTPException))
+                ):
+                    continue
+                raise RuntimeError(
+                    f"GitLab API request failed: {method} {path}: {exc}"
+                ) from exc
+            if response.will_close:
+                self._reset()
+            status_line = f"HTTP/1.1 {response.status} {response.reason}"
+            response_headers = {
+                key.lower(): value for key, value in response.getheaders()
+            }
+            return response.status, status_line, response_headers, raw
+        raise RuntimeError(f"GitLab API connection was closed repeatedly: {path}")
+
+    def request(
+        self, *, endpoint: str, method: str, payload: dict[str, object] | None
+    ) -> dict[str, object]:
+        """调用 REST API 并返回 JSON object。"""
+
+        if ":id" in endpoint.split("/"):
+            if not self.target.project:
+                raise RuntimeError("failed to resolve project from git remote")
+            endpoint = endpoint.replace(":id", encode_project(self.target.project), 1)
+        body = (
+            json.dumps(payload, ensure_ascii=True).encode("utf-8")
+            if payload is not None
+            else None
+        )
+        status, status_line, headers, raw = self.send(
+            method, f"/api/v4/{endpoint.lstrip('/')}", body
+        )
+        text = raw.decode("utf-8", errors="replace").strip()
+        if status >= 400:
+            raise GitLabApiError(
+                endpoint=endpoint,
+                method=method,
+                status_line=status_line,
+                request_id=headers.get("x-request-id"),
+                response_body=text or None,
+                stderr=None,
+                payload=payload,
+            )
+        if not text:
+            return {}
+        try:
+            parsed = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise RuntimeError(
+                f"GitLab API did not return valid JSON for {method} {endpoint}"
+            ) from exc
+        if not isinstance(parsed, dict):
+            raise RuntimeError("unexpected API response shape")
+        return parsed
+
+
+def resolve_native_target(cwd: Path, hostname: str | None) -> NativeTarget | None:
+    """按 glab 的优先级解析 host 与 token；无法完整解析时返回 None。"""
+
+    if urllib.request.getproxies():
+        # 代理、证书等网络细节交给 glab 处理。
+        return None
+    remote = current_remote(cwd)
+    default_host, hosts = read_glab_config(glab_config_path())
+    env_host = next(
+        (os.environ[name] for name in HOST_ENV_VARS if os.environ.get(name)), None
+    )
+    explicit_host = hostname or env_host
+    remote_host = remote[0] if remote else None
+    # 只有 glab 已配置或被显式指定的 remote host 才可信，避免把 token 发给 GitHub 等其他平台。
+    if remote_host and remote_host != explicit_host and remote_host not in hosts:
+        remote_host = None
+    host = explicit_host or remote_host or default_host
+    if not host:
+        return None
+    host_config = hosts.get(host, {})
+    token = next(
+        (os.environ[name] for name in TOKEN_ENV_VARS if os.environ.get(name)),
+        host_config.get("token", ""),
+    )
+    if not token or host_config.get("skip_tls_verify") == "true":
+        return None
+    scheme = host_config.get("api_protocol") or "https"
+    if scheme not in {"https", "http"}:
+        return None
+    project = remote[1] if remote and remote_host == host else None
+    return NativeTarget(
+        scheme=scheme,
+        api_host=host_config.get("api_host") or host,
+        token=token,
+        ca_cert=host_config.get("ca_cert") or None,
+        project=project,
+    )
+
+
+_TRANSPORTS: dict[tuple[str, str | None], GitLabHttpTransport | None] = {}
+_TRANSPORTS_LOCK = threading.Lock()
+
+
+def native_transport(cwd: Path, hostname: str | None) -> GitLabHttpTransport | None:
+    """按 `(cwd, hostname)` 缓存进程内 transport，只解析一次凭据。"""
+
+    key = (str(cwd), hostname)
+    with _TRANSPORTS_LOCK:
+        if key not in _TRANSPORTS:
+            target = resolve_native_target(cwd, hostname)
+            _TRANSPORTS[key] = GitLabHttpTransport(target) if target else None
+        return _TRANSPORTS[key]
+
+
 def run_glab_api(
     *,
     endpoint: str,
@@ -204,7 +539,38 @@ def run_glab_api(
     cwd: Path,
     hostname: str | None,
 ) -> dict[str, object]:
-    """通过 `glab api` 调用 GitLab REST API 并返回 JSON。"""
+    """调用 GitLab REST API 并返回 JSON；优先进程内 HTTP，必要时回退 `glab api`。"""
+
+    mode = transport_mode()
+    if mode != "glab":
+        transport = native_transport(cwd, hostname)
+        if transport is not None and (
+            transport.target.project or ":id" not in endpoint.split("/")
+        ):
+            return transport.request(endpoint=endpoint, method=method, payload=payload)
+        if mode == "native":
+            raise RuntimeError(
+                "GITLAB_CLI_TRANSPORT=native but glab host/token/project "
+                "could not be resolved"
+            )
+    return run_glab_subprocess(
+        endpoint=endpoint,
+        method=method,
+        payload=payload,
+        cwd=cwd,
+        hostname=hostname,
+    )
+
+
+def run_glab_subprocess(
+    *,
+    endpoint: str,
+    method: str,
+    payload: dict[str, object] | None,
+    cwd: Path,
+    hostname: str | None,
+) -> dict[str, object]:
+    """通过 `glab api` 子进程调用 GitLab REST API 并返回 JSON。"""
 
     args = ["glab", "api", endpoint, "--method", method, "--include"]
     if hostname:
@@ -315,6 +681,148 @@ def resolve_merge_request_source_branch(
     return source_branch
 
 
+def cache_disabled() -> bool:
+    """`GITLAB_CLI_CACHE=off` 时关闭本地结果缓存。"""
+
+    value = os.environ.get("GITLAB_CLI_CACHE", "").strip().lower()
+    return value in {"0", "off", "false", "no"}
+
+
+def default_cache_dir() -> Path:
+    """返回本地缓存目录，可用 `GITLAB_CLI_CACHE_DIR` 覆盖。"""
+
+    explicit = os.environ.get("GITLAB_CLI_CACHE_DIR", "").strip()
+    if explicit:
+        return Path(explicit).expanduser()
+    cache_root = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_root) / "gitlab-cli"
+
+
+def cache_entry_path(kind: str, key: dict[str, object]) -> Path:
+    """按缓存类型与 key 的摘要定位缓存文件。"""
+
+    digest = hashlib.sha256(
+        json.dumps(key, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+    return default_cache_dir() / kind / f"{digest}.json"
+
+
+def read_cache_entry(path: Path, ttl_seconds: float) -> dict[str, object] | None:
+    """读取未过期的缓存值；缺失、过期或损坏时返回 None。"""
+
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict):
+        return None
+    stored_at = entry.get("stored_at")
+    value = entry.get("value")
+    if not isinstance(stored_at, (int, float)) or not isinstance(value, dict):
+        return None
+    if time.time() - stored_at > ttl_seconds:
+        return None
+    return value
+
+
+def write_cache_entry(path: Path, value: dict[str, object]) -> None:
+    """原子写入缓存值；缓存目录不可写时静默放弃。"""
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_text(
+            json.dumps({"stored_at": time.time(), "value": value}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        temp_path.replace(path)
+    except OSError:
+        return
+
+
+def project_cache_key(
+    project: str | None, cwd: Path, hostname: str | None
+) -> dict[str, object]:
+    """生成缓存用的项目标识；未显式指定项目时使用 origin remote。"""
+
+    if project:
+        return {"hostname": hostname, "project": project}
+    remote = current_remote(cwd)
+    if remote:
+        return {"hostname": hostname or remote[0], "project": remote[1]}
+    return {"hostname": hostname, "cwd": str(cwd)}
+
+
+def repository_root(cwd: Path) -> Path:
+    """返回 git 仓库根目录；不在仓库内时退回 cwd。"""
+
+    try:
+        return Path(run_git(["rev-parse", "--show-toplevel"], cwd=cwd))
+    except (RuntimeError, OSError):
+        return cwd
+
+
+def hash_ci_content(content: str, repo_root: Path) -> str:
+    """对 CI 配置及其递归引用的本地 include 文件计算摘要。"""
+
+    digest = hashlib.sha256(content.encode("utf-8"))
+    seen: set[Path] = set()
+    included: dict[Path, bytes] = {}
+    pending = [content]
+    while pending:
+        text = pending.pop()
+        for candidate in CI_INCLUDE_PATTERN.findall(text):
+            # 宁可多算：仓库中不存在的路径会被跳过，不影响结果。
+            relative = candidate.lstrip("/")
+            if not relative or ".." in Path(relative).parts:
+                continue
+            for include_path in sorted(repo_root.glob(relative)):
+                if include_path in seen or not include_path.is_file():
+                    continue
+                seen.add(include_path)
+                try:
+                    raw = include_path.read_bytes()
+                except OSError:
+                    continue
+                included[include_path] = raw
+                try:
+                    pending.append(raw.decode("utf-8"))
+                except UnicodeDecodeError:
+                    continue
+    for include_path, raw in sorted(included.items()):
+        digest.update(b"\0" + str(include_path.relative_to(repo_root)).encode())
+        digest.update(b"\0" + raw)
+    return digest.hexdigest()
+
+
+def cached_merge_request_source_branch(
+    *,
+    project: str | None,
+    iid: int,
+    cwd: Path,
+    hostname: str | None,
+    use_cache: bool,
+) -> str:
+    """带短 TTL 缓存地解析 MR source_branch。"""
+
+    if not use_cache:
+        return resolve_merge_request_source_branch(
+            project=project, iid=iid, cwd=cwd, hostname=hostname
+        )
+    cache_path = cache_entry_path(
+        "merge-request-source-branch",
+        {**project_cache_key(project, cwd, hostname), "iid": iid},
+    )
+    cached = read_cache_entry(cache_path, MR_SOURCE_BRANCH_TTL_SECONDS)
+    if cached and isinstance(cached.get("source_branch"), str):
+        return str(cached["source_branch"])
+    source_branch = resolve_merge_request_source_branch(
+        project=project, iid=iid, cwd=cwd, hostname=hostname
+    )
+    write_cache_entry(cache_path, {"source_branch": source_branch})
+    return source_branch
+
+
 def print_resource_result(resource_name: str, payload: dict[str, object]) -> None:
     """输出 MR / Issue 创建或更新结果。"""
 
@@ -339,6 +847,196 @@ def print_resource_result(resource_name: str, payload: dict[str, object]) -> Non
         console.print(web_url)
 
 
+@dataclass(frozen=True)
+class BulkOperation:
+    """NDJSON 中一行对应的一次创建或更新。"""
+
+    line: int
+    project: str | None
+    iid: int | None
+    payload: dict[str, object]
+
+
+@dataclass(frozen=True)
+class BulkResource:
+    """bulk 子命令针对的资源类型。"""
+
+    name: str
+    endpoint: str
+    fields: frozenset[str]
+    required_on_create: tuple[str, ...]
+
+
+ISSUE_BULK_RESOURCE = BulkResource(
+    name="issue",
+    endpoint="issues",
+    fields=ISSUE_BULK_FIELDS,
+    required_on_create=("title",),
+)
+MR_BULK_RESOURCE = BulkResource(
+    name="merge_request",
+    endpoint="merge_requests",
+    fields=MR_BULK_FIELDS,
+    required_on_create=("title", "source_branch", "target_branch"),
+)
+
+
+def parse_bulk_operation(line: int, raw: str, resource: BulkResource) -> BulkOperation:
+    """解析并校验一行 NDJSON；带 `iid` 为更新，否则为创建。"""
+
+    try:
+        record = json.loads(raw)
+    except ValueError as exc:
+        raise RuntimeError(f"invalid JSON: {exc}") from exc
+    if not isinstance(record, dict):
+        raise RuntimeError("expected a JSON object")
+
+    project = record.pop("project", None)
+    if project is not None and not isinstance(project, (str, int)):
+        raise RuntimeError("project must be a string or integer")
+    iid = record.pop("iid", None)
+    if iid is not None and (type(iid) is not int or iid <= 0):
+        raise RuntimeError("iid must be a positive integer")
+    unknown = sorted(set(record) - resource.fields)
+    if unknown:
+        raise RuntimeError(f"unsupported fields: {', '.join(unknown)}")
+
+    labels = record.get("labels")
+    if isinstance(labels, list):
+        record["labels"] = ",".join(str(label) for label in labels)
+    payload = ensure_payload_fields(record)
+    if iid is None:
+        missing = [
+            field for field in resource.required_on_create if not payload.get(field)
+        ]
+        if missing:
+            raise RuntimeError(f"missing required fields: {', '.join(missing)}")
+    return BulkOperation(
+        line=line,
+        project=str(project) if project is not None else None,
+        iid=iid,
+        payload=payload,
+    )
+
+
+def load_bulk_operations(path: Path, resource: BulkResource) -> list[BulkOperation]:
+    """读取 NDJSON 并在执行前校验全部行；任一行无效则整体报错。"""
+
+    operations: list[BulkOperation] = []
+    errors: list[str] = []
+    for line, raw in enumerate(read_text(path).splitlines(), start=1):
+        if not raw.strip():
+            continue
+        try:
+            operations.append(parse_bulk_operation(line, raw, resource))
+        except RuntimeError as exc:
+            errors.append(f"{path}:{line}: {exc}")
+    if errors:
+        raise RuntimeError("\n".join(errors))
+    if not operations:
+        raise RuntimeError(f"no operations found in {path}")
+    return operations
+
+
+def run_bulk_operation(
+    operation: BulkOperation,
+    *,
+    resource: BulkResource,
+    project: str | None,
+    cwd: Path,
+    hostname: str | None,
+) -> dict[str, object]:
+    """执行单条 bulk 操作，返回一条结果记录。"""
+
+    action = "create" if operation.iid is None else "update"
+    record: dict[str, object] = {"line": operation.line, "action": action}
+    if operation.iid is not None:
+        record["iid"] = operation.iid
+    suffix = resource.endpoint
+    if operation.iid is not None:
+        suffix = f"{suffix}/{operation.iid}"
+    try:
+        response = run_glab_api(
+            endpoint=project_endpoint(operation.project or project, suffix),
+            method="POST" if operation.iid is None else "PUT",
+            payload=operation.payload,
+            cwd=cwd,
+            hostname=hostname,
+        )
+    except GitLabApiError as exc:
+        return {
+            **record,
+            "status": "failed",
+            "http_status": exc.status_line,
+            "x_request_id": exc.request_id,
+            "error": str(exc),
+        }
+    except RuntimeError as exc:
+        return {**record, "status": "failed", "error": str(exc)}
+    return {
+        **record,
+        "status": "ok",
+        "iid": response.get("iid", operation.iid),
+        "web_url": response.get("web_url"),
+    }
+
+
+def run_bulk_operations(
+    operations: list[BulkOperation],
+    *,
+    resource: BulkResource,
+    project: str | None,
+    cwd: Path,
+    hostname: str | None,
+    workers: int,
+) -> Iterator[dict[str, object]]:
+    """在有界线程池中并发执行 bulk 操作，按输入顺序产出结果。"""
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(
+            lambda operation: run_bulk_operation(
+                operation,
+                resource=resource,
+                project=project,
+                cwd=cwd,
+                hostname=hostname,
+            ),
+            operations,
+        )
+
+
+def run_bulk_command(
+    *,
+    path: Path,
+    resource: BulkResource,
+    project: str | None,
+    cwd: Path,
+    hostname: str | None,
+    workers: int,
+) -> None:
+    """bulk 子命令的共同流程：先整体校验，再并发执行并逐行输出 NDJSON。"""
+
+    try:
+        operations = load_bulk_operations(path, resource)
+    except RuntimeError as exc:
+        error_console.print(str(exc))
+        raise typer.Exit(code=1) from exc
+
+    failed = False
+    for record in run_bulk_operations(
+        operations,
+        resource=resource,
+        project=project,
+        cwd=cwd,
+        hostname=hostname,
+        workers=workers,
+    ):
+        failed = failed or record["status"] == "failed"
+        print_json(record)
+    if failed:
+        raise typer.Exit(code=1)
+
+
 @ci_app.command("lint")
 def ci_lint(
     path: Path = typer.Argument(Path(".gitlab-ci.yml"), help="要校验的 CI 配置文件。"),
@@ -370,19 +1068,24 @@ def ci_lint(
         False, "--show-merged-yaml", help="同时输出 merged_yaml。"
     ),
     as_json: bool = typer.Option(False, "--json", help="输出原始 JSON。"),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="忽略本地缓存，强制重新请求 GitLab。"
+    ),
 ) -> None:
     """校验本地 `.gitlab-ci.yml`。"""
 
+    use_cache = not no_cache and not cache_disabled()
     try:
         effective_ref = ref
         mr_iid = parse_merge_request_ref(ref) if dry_run and ref else None
         if mr_iid is not None:
             if not source_branch:
-                source_branch = resolve_merge_request_source_branch(
+                source_branch = cached_merge_request_source_branch(
                     project=project,
                     iid=mr_iid,
                     cwd=cwd,
                     hostname=hostname,
+                    use_cache=use_cache,
                 )
             effective_ref = source_branch
             if not as_json:
@@ -390,19 +1093,39 @@ def ci_lint(
                     f"using source branch {effective_ref!r} for MR internal ref {ref!r}"
                 )
 
+        content = read_text(path)
         payload = {
-            "content": read_text(path),
+            "content": content,
             "dry_run": dry_run,
             "include_jobs": include_jobs,
             "ref": effective_ref,
         }
-        response = run_glab_api(
-            endpoint=project_endpoint(project, "ci/lint"),
-            method="POST",
-            payload=ensure_payload_fields(payload),
-            cwd=cwd,
-            hostname=hostname,
-        )
+        cache_path = None
+        response = None
+        if use_cache:
+            cache_path = cache_entry_path(
+                "ci-lint",
+                {
+                    **project_cache_key(project, cwd, hostname),
+                    "content_sha256": hash_ci_content(content, repository_root(cwd)),
+                    "dry_run": dry_run,
+                    "include_jobs": include_jobs,
+                    "ref": effective_ref,
+                },
+            )
+            response = read_cache_entry(cache_path, CI_LINT_CACHE_TTL_SECONDS)
+            if response is not None and not as_json:
+                console.print("using cached CI lint result")
+        if response is None:
+            response = run_glab_api(
+                endpoint=project_endpoint(project, "ci/lint"),
+                method="POST",
+                payload=ensure_payload_fields(payload),
+                cwd=cwd,
+                hostname=hostname,
+            )
+            if cache_path is not None:
+                write_cache_entry(cache_path, response)
     except RuntimeError as exc:
         error_console.print(str(exc))
         if dry_run and ref and ref.startswith("refs/merge-requests/"):
@@ -576,6 +1299,43 @@ def mr_update(
     print_resource_result("merge_request", response)
 
 
+@mr_app.command("bulk")
+def mr_bulk(
+    path: Path = typer.Argument(
+        ...,
+        exists=True,
+        dir_okay=False,
+        resolve_path=True,
+        help="NDJSON 文件：每行一个 MR payload，带 `iid` 为更新，否则为创建。",
+    ),
+    cwd: Path = typer.Option(
+        Path.cwd(),
+        "--cwd",
+        resolve_path=True,
+        file_okay=False,
+        dir_okay=True,
+        help="让 glab 在哪个仓库目录下执行。",
+    ),
+    project: str | None = typer.Option(
+        None,
+        "--project",
+        help="GitLab project id 或 group/project；单行可用 `project` 字段覆盖。",
+    ),
+    hostname: str | None = typer.Option(None, "--hostname", help="GitLab 实例 host。"),
+    workers: int = typer.Option(8, "--workers", min=1, help="并发请求数。"),
+) -> None:
+    """批量创建或更新 MR，逐行输出 NDJSON 结果。"""
+
+    run_bulk_command(
+        path=path,
+        resource=MR_BULK_RESOURCE,
+        project=project,
+        cwd=cwd,
+        hostname=hostname,
+        workers=workers,
+    )
+
+
 @issue_app.command("create")
 def issue_create(
     title: str = typer.Option(..., "--title", help="Issue 标题。"),
@@ -713,5 +1473,42 @@ def issue_update(
     print_resource_result("issue", response)
 
 
+@issue_app.command("bulk")
+def issue_bulk(
+    path: Path = typer.Argument(
+        ...,
+        exists=True,
+        dir_okay=False,
+        resolve_path=True,
+        help="NDJSON 文件：每行一个 Issue payload，带 `iid` 为更新，否则为创建。",
+    ),
+    cwd: Path = typer.Option(
+        Path.cwd(),
+        "--cwd",
+        resolve_path=True,
+        file_okay=False,
+        dir_okay=True,
+        help="让 glab 在哪个仓库目录下执行。",
+    ),
+    project: str | None = typer.Option(
+        None,
+        "--project",
+        help="GitLab project id 或 group/project；单行可用 `project` 字段覆盖。",
+    ),
+    hostname: str | None = typer.Option(None, "--hostname", help="GitLab 实例 host。"),
+    workers: int = typer.Option(8, "--workers", min=1, help="并发请求数。"),
+) -> None:
+    """批量创建或更新 Issue，逐行输出 NDJSON 结果。"""
+
+    run_bulk_command(
+        path=path,
+        resource=ISSUE_BULK_RESOURCE,
+        project=project,
+        cwd=cwd,
+        hostname=hostname,
+        workers=workers,
+    )
+
+
 if __name__ == "__main__":
     app()
@@ -4,6 +4,8 @@ import importlib.util
 import json
 from pathlib import Path
 
+from typer.testing import CliRunner
+
 
 SCRIPT_PATH = Path(__file__).resolve().parents[1] / "configure_squash_merge_policy.py"
 SPEC = importlib.util.spec_from_file_location(
@@ -140,3 +142,96 @@ def test_validate_settings_reports_mismatch() -> None:
 
     assert "verification failed" in message
     assert "- squash_option: expected 'always', got 'default_on'" in message
+
+
+def test_group_rollout_only_updates_drifted_projects(
+    monkeypatch, tmp_path: Path
+) -> None:
+    calls: list[list[str]] = []
+    current = configure_squash_merge_policy.expected_settings()
+    pages = [
+        [{"id": 1, "path_with_namespace": "team/ok", **current}],
+        [
+            {
+                "id": 2,
+                "path_with_namespace": "team/sub/drift",
+                **current,
+                "squash_option": "default_off",
+            }
+        ],
+    ]
+
+    class FakeCompletedProcess:
+        def __init__(self, stdout: str) -> None:
+            self.returncode = 0
+            self.stdout = stdout
+            self.stderr = ""
+
+    def fake_run(args: list[str], **_kwargs: object) -> FakeCompletedProcess:
+        calls.append(args)
+        if "--paginate" in args:
+            return FakeCompletedProcess("\n".join(json.dumps(page) for page in pages))
+        return FakeCompletedProcess(json.dumps(current))
+
+    monkeypatch.setattr(configure_squash_merge_policy.subprocess, "run", fake_run)
+
+    projects = configure_squash_merge_policy.list_group_projects(
+        group="team", cwd=tmp_path, hostname=None
+    )
+    records = list(
+        configure_squash_merge_policy.rollout_policy(
+            projects, cwd=tmp_path, hostname=None, workers=4, dry_run=False
+        )
+    )
+
+    assert [(record["project"], record["status"]) for record in records] == [
+        ("team/ok", "unchanged"),
+        ("team/sub/drift", "updated"),
+    ]
+    assert records[1]["changes"] == {
+        "squash_option": {"current": "default_off", "expected": "always"}
+    }
+    assert calls[0][2] == (
+        "groups/team/projects?include_subgroups=true&archived=false&per_page=100"
+    )
+    assert [args[2:5] for args in calls[1:]] == [
+        ["projects/2", "--method", "PUT"],
+        ["projects/2", "--method", "GET"],
+    ]
+
+
+def test_single_project_dry_run_only_reads(monkeypatch, tmp_path: Path) -> None:
+    calls: list[list[str]] = []
+    current = {
+        **configure_squash_merge_policy.expected_settings(),
+        "id": 7,
+        "path_with_namespace": "team/drift",
+        "squash_option": "default_off",
+    }
+
+    class FakeCompletedProcess:
+        returncode = 0
+        stdout = json.dumps(current)
+        stderr = ""
+
+    def fake_run(args: list[str], **_kwargs: object) -> FakeCompletedProcess:
+        calls.append(args)
+        return FakeCompletedProcess()
+
+    monkeypatch.setattr(configure_squash_merge_policy.subprocess, "run", fake_run)
+
+    result = CliRunner().invoke(
+        configure_squash_merge_policy.app,
+        ["--project", "team/drift", "--dry-run", "--cwd", str(tmp_path)],
+    )
+
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == {
+        "project": "team/drift",
+        "id": 7,
+        "status": "would_update",
+        "changes": {"squash_option": {"current": "default_off", "expected": "always"}},
+    }
+    assert [args[2:5] for args in calls] == [
+        ["projects/team%2Fdrift", "--method", "GET"]
+    ]
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+import http.client
 import importlib.util
+import sys
 from pathlib import Path
 
+import pytest
+
 
 SCRIPT_PATH = Path(__file__).resolve().parents[1] / "gitlab_cli.py"
 SPEC = importlib.util.spec_from_file_location("gitlab_cli", SCRIPT_PATH)
 assert SPEC is not None
 gitlab_cli = importlib.util.module_from_spec(SPEC)
 assert SPEC.loader is not None
+sys.modules[SPEC.name] = gitlab_cli
 SPEC.loader.exec_module(gitlab_cli)
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("GITLAB_CLI_CACHE_DIR", str(tmp_path / "cache"))
+
+
 def test_parse_merge_request_ref() -> None:
     assert gitlab_cli.parse_merge_request_ref("refs/merge-requests/9/head") == 9
     assert gitlab_cli.parse_merge_request_ref("refs/merge-requests/9/merge") == 9
@@ -59,6 +69,7 @@ def test_ci_lint_resolves_merge_request_ref_to_source_branch(
         source_branch=None,
         show_merged_yaml=False,
         as_json=True,
+        no_cache=False,
     )
 
     assert lint_payloads == [
@@ -108,6 +119,7 @@ def test_ci_lint_uses_explicit_source_branch_for_merge_request_ref(
         source_branch="chore/sync-knots-api-master",
         show_merged_yaml=False,
         as_json=True,
+        no_cache=False,
     )
 
     assert lint_payloads == [
@@ -118,3 +130,294 @@ def test_ci_lint_uses_explicit_source_branch_for_merge_request_ref(
             "ref": "chore/sync-knots-api-master",
         }
     ]
+
+
+def test_resolve_native_target_reads_glab_config(monkeypatch, tmp_path: Path) -> None:
+    config_dir = tmp_path / "glab"
+    config_dir.mkdir()
+    (config_dir / "config.yml").write_text(
+        "host: gitlab.com\n"
+        "hosts:\n"
+        "    gitlab.com:\n"
+        "        token: public-token\n"
+        "    gitlab.example.com:\n"
+        '        token: "secret-token" # comment\n'
+        "        api_host: api.gitlab.example.com\n"
+        "        api_protocol: https\n"
+        "no_prompt: false\n",
+        encoding="utf-8",
+    )
+    for name in (*gitlab_cli.TOKEN_ENV_VARS, *gitlab_cli.HOST_ENV_VARS):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("GLAB_CONFIG_DIR", str(config_dir))
+    monkeypatch.setattr(gitlab_cli.urllib.request, "getproxies", lambda: {})
+    monkeypatch.setattr(
+        gitlab_cli,
+        "current_remote",
+        lambda cwd: gitlab_cli.parse_git_remote(
+            "git@gitlab.example.com:team/sub/proj.git"
+        ),
+    )
+
+    target = gitlab_cli.resolve_native_target(tmp_path, None)
+
+    assert target == gitlab_cli.NativeTarget(
+        scheme="https",
+        api_host="api.gitlab.example.com",
+        token="secret-token",
+        ca_cert=None,
+        project="team/sub/proj",
+    )
+
+
+def test_run_glab_api_falls_back_to_glab_without_credentials(
+    monkeypatch, tmp_path: Path
+) -> None:
+    calls: list[str] = []
+
+    def fake_subprocess(**kwargs: object) -> dict[str, object]:
+        calls.append(str(kwargs["endpoint"]))
+        return {"ok": True}
+
+    monkeypatch.setattr(gitlab_cli, "native_transport", lambda cwd, hostname: None)
+    monkeypatch.setattr(gitlab_cli, "run_glab_subprocess", fake_subprocess)
+    monkeypatch.delenv("GITLAB_CLI_TRANSPORT", raising=False)
+
+    response = gitlab_cli.run_glab_api(
+        endpoint="projects/:id/issues",
+        method="GET",
+        payload=None,
+        cwd=tmp_path,
+        hostname=None,
+    )
+
+    assert response == {"ok": True}
+    assert calls == ["projects/:id/issues"]
+
+
+def test_ci_lint_reuses_cached_result_until_includes_change(
+    monkeypatch, tmp_path: Path
+) -> None:
+    repo = tmp_path / "repo"
+    (repo / "ci").mkdir(parents=True)
+    ci_file = repo / ".gitlab-ci.yml"
+    ci_file.write_text("include:\n  - local: /ci/test.yml\n", encoding="utf-8")
+    include_file = repo / "ci" / "test.yml"
+    include_file.write_text("test:\n  script: echo ok\n", encoding="utf-8")
+    calls: list[str] = []
+
+    def fake_run_glab_api(**kwargs: object) -> dict[str, object]:
+        endpoint = str(kwargs["endpoint"])
+        calls.append(endpoint)
+        if endpoint.endswith("merge_requests/9"):
+            return {"source_branch": "feature"}
+        return {"valid": True, "errors": [], "warnings": [], "run": len(calls)}
+
+    monkeypatch.setattr(gitlab_cli, "run_glab_api", fake_run_glab_api)
+    monkeypatch.setattr(gitlab_cli, "repository_root", lambda cwd: repo)
+
+    def lint() -> None:
+        gitlab_cli.ci_lint(
+            path=ci_file,
+            cwd=repo,
+            project="122477",
+            hostname=None,
+            dry_run=True,
+            include_jobs=False,
+            ref="refs/merge-requests/9/head",
+            source_branch=None,
+            show_merged_yaml=False,
+            as_json=True,
+            no_cache=False,
+        )
+
+    lint()
+    lint()
+    assert calls == ["projects/122477/merge_requests/9", "projects/122477/ci/lint"]
+
+    include_file.write_text("test:\n  script: echo changed\n", encoding="utf-8")
+    lint()
+    assert calls == [
+        "projects/122477/merge_requests/9",
+        "projects/122477/ci/lint",
+        "projects/122477/ci/lint",
+    ]
+
+
+def test_hash_ci_content_skips_unreadable_includes(monkeypatch, tmp_path: Path) -> None:
+    (tmp_path / "ci").mkdir()
+    content = "include:\n  - local: /ci/*.yml\n"
+    (tmp_path / "ci" / "locked.yml").write_text("locked: true\n", encoding="utf-8")
+    (tmp_path / "ci" / "test.yml").write_text("test: {}\n", encoding="utf-8")
+    baseline = gitlab_cli.hash_ci_content(content, tmp_path)
+    original_read_bytes = Path.read_bytes
+
+    def read_bytes(path: Path) -> bytes:
+        if path.name == "locked.yml":
+            raise PermissionError(13, "Permission denied", str(path))
+        return original_read_bytes(path)
+
+    monkeypatch.setattr(Path, "read_bytes", read_bytes)
+
+    digest = gitlab_cli.hash_ci_content(content, tmp_path)
+
+    assert digest != baseline
+    (tmp_path / "ci" / "test.yml").write_text("test: {x: 1}\n", encoding="utf-8")
+    assert gitlab_cli.hash_ci_content(content, tmp_path) != digest
+
+
+def test_issue_bulk_streams_results_with_request_id(
+    monkeypatch, tmp_path: Path, capsys
+) -> None:
+    bulk_file = tmp_path / "issues.ndjson"
+    bulk_file.write_text(
+        '{"title": "first", "labels": ["bug", "p1"]}\n'
+        "\n"
+        '{"iid": 7, "description": "updated"}\n'
+        '{"title": "broken", "project": "other/proj"}\n',
+        encoding="utf-8",
+    )
+    requests: list[tuple[str, str, dict[str, object] | None]] = []
+
+    def fake_run_glab_api(**kwargs: object) -> dict[str, object]:
+        endpoint = str(kwargs["endpoint"])
+        payload = kwargs["payload"]
+        assert isinstance(payload, dict)
+        requests.append((str(kwargs["method"]), endpoint, payload))
+        if endpoint.startswith("projects/other%2Fproj/"):
+            raise gitlab_cli.GitLabApiError(
+                endpoint=endpoint,
+                method="POST",
+                status_line="HTTP/1.1 403 Forbidden",
+                request_id="req-123",
+                response_body='{"message":"403 Forbidden"}',
+                stderr=None,
+                payload=payload,
+            )
+        return {"iid": 7 if endpoint.endswith("/7") else 8, "web_url": "https://x"}
+
+    monkeypatch.setattr(gitlab_cli, "run_glab_api", fake_run_glab_api)
+
+    with pytest.raises(gitlab_cli.typer.Exit):
+        gitlab_cli.issue_bulk(
+            path=bulk_file,
+            cwd=tmp_path,
+            project="122477",
+            hostname=None,
+            workers=2,
+        )
+
+    assert sorted(requests, key=lambda item: item[1]) == [
+        ("POST", "projects/122477/issues", {"title": "first", "labels": "bug,p1"}),
+        ("PUT", "projects/122477/issues/7", {"description": "updated"}),
+        ("POST", "projects/other%2Fproj/issues", {"title": "broken"}),
+    ]
+    output = [
+        gitlab_cli.json.loads(line) for line in capsys.readouterr().out.splitlines()
+    ]
+    assert [record["line"] for record in output] == [1, 3, 4]
+    records = {record["line"]: record for record in output}
+    assert records[1]["status"] == "ok"
+    assert records[1]["iid"] == 8
+    assert records[3] == {
+        "line": 3,
+        "action": "update",
+        "iid": 7,
+        "status": "ok",
+        "web_url": "https://x",
+    }
+    assert records[4]["status"] == "failed"
+    assert records[4]["x_request_id"] == "req-123"
+
+
+def test_mr_bulk_validates_every_line_before_sending(tmp_path: Path) -> None:
+    bulk_file = tmp_path / "mrs.ndjson"
+    bulk_file.write_text(
+        '{"title": "ok", "source_branch": "a", "target_branch": "main"}\n'
+        '{"title": "missing branches"}\n'
+        '{"iid": 3, "state_event": "close"}\n'
+        '{"iid": 4}\n',
+        encoding="utf-8",
+    )
+
+    with pytest.raises(RuntimeError) as exc_info:
+        gitlab_cli.load_bulk_operations(bulk_file, gitlab_cli.MR_BULK_RESOURCE)
+
+    assert str(exc_info.value).splitlines() == [
+        f"{bulk_file}:2: missing required fields: source_branch, target_branch",
+        f"{bulk_file}:3: unsupported fields: state_event",
+        f"{bulk_file}:4: no fields to submit",
+    ]
+
+
+def test_resolve_native_target_ignores_non_gitlab_origin(
+    monkeypatch, tmp_path: Path
+) -> None:
+    config_dir = tmp_path / "glab"
+    config_dir.mkdir()
+    (config_dir / "config.yml").write_text(
+        "host: gitlab.com\nhosts:\n    gitlab.com:\n        token: public-token\n",
+        encoding="utf-8",
+    )
+    for name in (*gitlab_cli.TOKEN_ENV_VARS, *gitlab_cli.HOST_ENV_VARS):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("GITLAB_TOKEN", "glpat-secret")
+    monkeypatch.setenv("GLAB_CONFIG_DIR", str(config_dir))
+    monkeypatch.setattr(gitlab_cli.urllib.request, "getproxies", lambda: {})
+    monkeypatch.setattr(
+        gitlab_cli,
+        "current_remote",
+        lambda cwd: gitlab_cli.parse_git_remote("git@github.com:DCjanus/prompts.git"),
+    )
+
+    target = gitlab_cli.resolve_native_target(tmp_path, None)
+
+    assert target is not None
+    assert target.api_host == "gitlab.com"
+    assert target.project is None
+
+    (config_dir / "config.yml").write_text("hosts:\n", encoding="utf-8")
+    assert gitlab_cli.resolve_native_target(tmp_path, None) is None
+
+
+class FakeConnection:
+    def __init__(self, error: Exception | None) -> None:
+        self.error = error
+        self.requests: list[str] = []
+
+    def request(self, method: str, path: str, **kwargs: object) -> None:
+        self.requests.append(method)
+        if self.error is not None:
+            raise self.error
+
+    def getresponse(self) -> object:
+        raise AssertionError("unexpected getresponse")
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ConnectionResetError("reset by peer"),
+        http.client.RemoteDisconnected("closed without response"),
+    ],
+)
+def test_transport_does_not_replay_post_on_reused_connection(error: Exception) -> None:
+    transport = gitlab_cli.GitLabHttpTransport(
+        gitlab_cli.NativeTarget(
+            scheme="http",
+            api_host="gitlab.example.com",
+            token="secret",
+            ca_cert=None,
+            project=None,
+        )
+    )
+    stale = FakeConnection(error)
+    transport._local.connection = stale
+
+    with pytest.raises(RuntimeError, match=str(error)):
+        transport.send("POST", "/api/v4/projects/1/issues", b"{}")
+
+    assert stale.requests == ["POST"]
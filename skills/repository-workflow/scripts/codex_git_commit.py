@@ -14,10 +14,15 @@
 
 from __future__ import annotations
 
+import importlib.util
 import json
 import os
 import shutil
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from types import ModuleType
+from typing import Any, BinaryIO
 
 import typer
 from openai_codex import CodexConfig
@@ -26,6 +31,16 @@ from openai_codex.errors import CodexError
 from pydantic import BaseModel
 
 AGENT_NAME = "Codex"
+BROKER_MODULE_PATH = (
+    Path(__file__).resolve().parents[2]
+    / "codex-session-reader"
+    / "scripts"
+    / "codex_broker.py"
+)
+BROKER_REQUEST_TIMEOUT_SECONDS = 60.0
+ROLLOUT_BLOCK_SIZE = 64 * 1024
+TURN_CONTEXT_MARKER = b'"turn_context"'
+ROLLOUT_INDEX_VERSION = 3
 app = typer.Typer(add_completion=False, help="输出当前 Codex agent/model 的 JSON。")
 
 
@@ -65,53 +80,147 @@ def resolve_codex_bin() -> str:
     )
 
 
+def env_disabled(name: str) -> bool:
+    """环境变量是否显式关闭了某项优化。"""
+
+    return os.environ.get(name, "").strip().lower() in {"0", "off", "false", "no"}
+
+
+def load_broker_module() -> ModuleType | None:
+    """加载同级 codex-session-reader skill 的 broker 约定模块；缺失时提示并返回 None。"""
+
+    if env_disabled("CODEX_APP_SERVER_BROKER"):
+        return None
+    if not BROKER_MODULE_PATH.is_file():
+        typer.echo(
+            f"note: {BROKER_MODULE_PATH} not found; install the codex-session-reader "
+            "skill next to repository-workflow to reuse its app-server broker",
+            err=True,
+        )
+        return None
+    spec = importlib.util.spec_from_file_location("codex_broker", BROKER_MODULE_PATH)
+    if spec is None or spec.loader is None:
+        return None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def read_thread_via_broker(codex_bin: str, thread_id: str) -> ThreadReadResponse | None:
+    """通过常驻 broker 读取 thread；broker 不可用时返回 None。"""
+
+    broker = load_broker_module()
+    if broker is None:
+        return None
+    reply = broker.call_broker(
+        codex_bin,
+        "thread/read",
+        {"threadId": thread_id, "includeTurns": False},
+        timeout=BROKER_REQUEST_TIMEOUT_SECONDS,
+    )
+    if reply is None:
+        return None
+    result = reply.get("result")
+    if isinstance(result, dict):
+        return ThreadReadResponse.model_validate(result)
+    if reply.get("kind") == "codex":
+        raise RuntimeError(
+            f"failed to resolve model via Codex SDK: {reply.get('error')}"
+        )
+    return None
+
+
+def iter_lines_reversed(handle: BinaryIO) -> Iterator[tuple[int, bytes, bool]]:
+    """从文件尾部按块倒序产出 `(行起始偏移, 行内容, 是否以换行结尾)`。"""
+
+    position = handle.seek(0, os.SEEK_END)
+    remainder = b""
+    terminated = False
+    while position > 0:
+        size = min(ROLLOUT_BLOCK_SIZE, position)
+        position -= size
+        handle.seek(position)
+        chunk = handle.read(size) + remainder
+        lines = chunk.split(b"\n")
+        remainder = lines.pop(0)
+        end = len(chunk)
+        for line in reversed(lines):
+            start = end - len(line)
+            yield position + start, line, terminated
+            terminated = True
+            end = start - 1
+    if remainder:
+        yield 0, remainder, terminated
+
+
+def count_lines_before(handle: BinaryIO, offset: int) -> int:
+    """统计偏移之前的换行数，只在报错时用于给出行号。"""
+
+    handle.seek(0)
+    count = 0
+    remaining = offset
+    while remaining > 0:
+        chunk = handle.read(min(ROLLOUT_BLOCK_SIZE, remaining))
+        if not chunk:
+            break
+        count += chunk.count(b"\n")
+        remaining -= len(chunk)
+    return count
+
+
+INVALID_TURN_CONTEXT: dict[str, Any] = {}
+
+
+def parse_turn_context(line: bytes) -> dict[str, Any] | None:
+    """解析可能是 turn_context 的行；无法解析的行返回 `INVALID_TURN_CONTEXT`。"""
+
+    # 先做字节级预筛，只解析可能是 turn_context 的行。
+    if TURN_CONTEXT_MARKER not in line:
+        return None
+    try:
+        item = json.loads(line)
+    except ValueError:
+        return INVALID_TURN_CONTEXT
+    if not isinstance(item, dict) or item.get("type") != "turn_context":
+        return None
+    payload = item.get("payload")
+    return payload if isinstance(payload, dict) else None
+
+
 def read_latest_model_name(rollout_path: Path) -> str:
-    """从 rollout 中读取最后一条完整 turn_context 的模型名。"""
+    """从 rollout 尾部倒序查找最后一条完整 turn_context 的模型名。"""
 
-    model_name = ""
     try:
-        with rollout_path.open(encoding="utf-8") as rollout:
-            for line_number, line in enumerate(rollout, start=1):
-                if not line.strip():
-                    continue
-                try:
-                    item = json.loads(line)
-                except json.JSONDecodeError as exc:
+        with rollout_path.open("rb") as rollout:
+            for offset, line, terminated in iter_lines_reversed(rollout):
+                payload = parse_turn_context(line)
+                if payload is INVALID_TURN_CONTEXT:
                     # 活跃 thread 可能正在追加最后一行，忽略尚未写完的尾部记录。
-                    if not line.endswith("\n"):
-                        break
+                    if not terminated:
+                        continue
+                    line_number = count_lines_before(rollout, offset) + 1
                     raise RuntimeError(
                         f"invalid rollout JSON at line {line_number}: {rollout_path}"
-                    ) from exc
-
-                if item.get("type") != "turn_context":
-                    continue
-                payload = item.get("payload")
-                if not isinstance(payload, dict):
+                    )
+                if payload is None:
                     continue
                 candidate = payload.get("model")
                 if isinstance(candidate, str) and candidate.strip():
-                    model_name = candidate.strip()
+                    return candidate.strip()
     except OSError as exc:
         reason = exc.strerror or str(exc)
         raise RuntimeError(
             f"failed to read Codex rollout {rollout_path}: {reason}"
         ) from exc
 
-    if not model_name:
-        raise RuntimeError(f"failed to resolve model_name from rollout: {rollout_path}")
-    return model_name
-
+    raise RuntimeError(f"failed to resolve model_name from rollout: {rollout_path}")
 
-def resolve_model_name(thread_id: str) -> str:
-    """通过只读 thread 信息解析当前 model 名。"""
 
-    explicit = os.environ.get("CODEX_MODEL_NAME", "").strip()
-    if explicit:
-        return explicit
+def read_thread_via_app_server(codex_bin: str, thread_id: str) -> ThreadReadResponse:
+    """临时启动 app-server 读取 thread 元信息。"""
 
     config = CodexConfig(
-        codex_bin=resolve_codex_bin(),
+        codex_bin=codex_bin,
         client_name="codex-repository-workflow",
         client_title="Codex Repository Workflow",
         experimental_api=False,
@@ -119,7 +228,7 @@ def resolve_model_name(thread_id: str) -> str:
     try:
         with CodexClient(config) as client:
             client.initialize()
-            response = client.request(
+            return client.request(
                 "thread/read",
                 {"threadId": thread_id, "includeTurns": False},
                 response_model=ThreadReadResponse,
@@ -130,10 +239,199 @@ def resolve_model_name(thread_id: str) -> str:
         reason = exc.strerror or str(exc)
         raise RuntimeError(f"failed to start Codex SDK app-server: {reason}") from exc
 
+
+def default_rollout_index_dir() -> Path:
+    """返回 rollout 索引目录，可用 `CODEX_ROLLOUT_INDEX_DIR` 覆盖。"""
+
+    explicit = os.environ.get("CODEX_ROLLOUT_INDEX_DIR", "").strip()
+    if explicit:
+        return Path(explicit).expanduser()
+    cache_root = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_root) / "codex-rollout-index"
+
+
+@dataclass
+class RolloutIndex:
+    """单个 thread 的 rollout 增量索引。
+
+    首次访问从文件尾部倒序定位最新的 turn_context，`scanned_offset` 之前的
+    完整行都视为已扫描；再次访问时只读取追加的字节。
+    """
+
+    thread_id: str
+    rollout_path: str = ""
+    size: int = 0
+    mtime_ns: int = 0
+    scanned_offset: int = 0
+    turn_context: dict[str, Any] | None = None
+
+    @classmethod
+    def load(cls, index_dir: Path, thread_id: str) -> RolloutIndex:
+        """读取索引；缺失、损坏或版本不符时返回空索引。"""
+
+        path = index_dir / f"{thread_id}.json"
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(thread_id=thread_id)
+        if (
+            not isinstance(payload, dict)
+            or payload.pop("version", None) != ROLLOUT_INDEX_VERSION
+            or payload.get("thread_id") != thread_id
+        ):
+            return cls(thread_id=thread_id)
+        try:
+            return cls(**payload)
+        except TypeError:
+            return cls(thread_id=thread_id)
+
+    def save(self, index_dir: Path) -> None:
+        """原子写回索引；缓存目录不可写时静默放弃。"""
+
+        path = index_dir / f"{self.thread_id}.json"
+        payload = {"version": ROLLOUT_INDEX_VERSION, **asdict(self)}
+        try:
+            index_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps(payload), encoding="utf-8")
+            temp_path.replace(path)
+        except OSError:
+            return
+
+    def cached_rollout_path(self) -> Path | None:
+        """返回仍然存在的已知 rollout 路径。"""
+
+        if self.rollout_path and Path(self.rollout_path).is_file():
+            return Path(self.rollout_path)
+        return None
+
+    def refresh(self, rollout_path: Path) -> None:
+        """把 rollout 新追加的完整行并入索引；文件被替换或截断时重建。"""
+
+        try:
+            with rollout_path.open("rb") as rollout:
+                stat = os.fstat(rollout.fileno())
+                if (
+                    self.rollout_path != str(rollout_path)
+                    or stat.st_size < self.scanned_offset
+                    or (stat.st_size == self.size and stat.st_mtime_ns != self.mtime_ns)
+                ):
+                    self.reset(rollout_path)
+                if self.scanned_offset == 0:
+                    self.seed_from_tail(rollout, rollout_path)
+                else:
+                    self.scan_appended(rollout, rollout_path)
+        except OSError as exc:
+            reason = exc.strerror or str(exc)
+            raise RuntimeError(
+                f"failed to read Codex rollout {rollout_path}: {reason}"
+            ) from exc
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+
+    def reset(self, rollout_path: Path) -> None:
+        """丢弃旧扫描结果。"""
+
+        self.rollout_path = str(rollout_path)
+        self.size = 0
+        self.mtime_ns = 0
+        self.scanned_offset = 0
+        self.turn_context = None
+
+    def seed_from_tail(self, rollout: BinaryIO, rollout_path: Path) -> None:
+        """冷启动：倒序找到最新的完整 turn_context，不从头扫描整个文件。"""
+
+        complete_end = 0
+        for offset, line, terminated in iter_lines_reversed(rollout):
+            if not terminated:
+                # 最后一个换行之后的片段（可能为空）尚未写完，完整行到此为止。
+                complete_end = offset
+                continue
+            payload = parse_turn_context(line)
+            if payload is INVALID_TURN_CONTEXT:
+                line_number = count_lines_before(rollout, offset) + 1
+                raise RuntimeError(
+                    f"invalid rollout JSON at line {line_number}: {rollout_path}"
+                )
+            if payload is not None:
+                self.turn_context = payload
+                break
+        self.scanned_offset = complete_end
+
+    def scan_appended(self, rollout: BinaryIO, rollout_path: Path) -> None:
+        """从 `scanned_offset` 开始扫描，只推进到最后一个完整行。
+
+        损坏的 turn_context 只要之后还有合法的新记录就跳过；最新一条损坏时报错。
+        """
+
+        rollout.seek(self.scanned_offset)
+        offset = self.scanned_offset
+        malformed_offset: int | None = None
+        for line in rollout:
+            if not line.endswith(b"\n"):
+                # 活跃 thread 可能正在追加最后一行，留到下次再扫。
+                break
+            line_offset = offset
+            offset += len(line)
+            payload = parse_turn_context(line)
+            if payload is INVALID_TURN_CONTEXT:
+                malformed_offset = line_offset
+                continue
+            if payload is None:
+                continue
+            malformed_offset = None
+            self.turn_context = payload
+        if malformed_offset is not None:
+            line_number = count_lines_before(rollout, malformed_offset) + 1
+            raise RuntimeError(
+                f"invalid rollout JSON at line {line_number}: {rollout_path}"
+            )
+        self.scanned_offset = offset
+
+    def model_name(self) -> str | None:
+        """从最新的 turn_context 中取模型名。"""
+
+        if not self.turn_context:
+            return None
+        candidate = self.turn_context.get("model")
+        if isinstance(candidate, str) and candidate.strip():
+            return candidate.strip()
+        return None
+
+
+def resolve_rollout_path(thread_id: str) -> Path:
+    """通过 broker 或临时 app-server 查询 thread 的 rollout 路径。"""
+
+    codex_bin = resolve_codex_bin()
+    response = read_thread_via_broker(codex_bin, thread_id)
+    if response is None:
+        response = read_thread_via_app_server(codex_bin, thread_id)
+
     rollout_path = str(response.thread.path or "").strip()
     if not rollout_path:
         raise RuntimeError(f"thread {thread_id} does not have a rollout path")
-    return read_latest_model_name(Path(rollout_path))
+    return Path(rollout_path)
+
+
+def resolve_model_name(thread_id: str) -> str:
+    """通过只读 thread 信息解析当前 model 名。"""
+
+    explicit = os.environ.get("CODEX_MODEL_NAME", "").strip()
+    if explicit:
+        return explicit
+
+    if env_disabled("CODEX_ROLLOUT_INDEX"):
+        return read_latest_model_name(resolve_rollout_path(thread_id))
+
+    index_dir = default_rollout_index_dir()
+    index = RolloutIndex.load(index_dir, thread_id)
+    rollout_path = index.cached_rollout_path() or resolve_rollout_path(thread_id)
+    index.refresh(rollout_path)
+    index.save(index_dir)
+    model_name = index.model_name()
+    if not model_name:
+        raise RuntimeError(f"failed to resolve model_name from rollout: {rollout_path}")
+    return model_name
 
 
 @app.command()
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import contextlib
 import importlib.util
+import io
+import json
+import socket
+import sys
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 from types import SimpleNamespace
@@ -11,6 +17,7 @@ SCRIPT_PATH = Path(__file__).parents[1] / "codex_git_commit.py"
 SPEC = importlib.util.spec_from_file_location("codex_git_commit", SCRIPT_PATH)
 assert SPEC is not None and SPEC.loader is not None
 codex_git_commit = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = codex_git_commit
 SPEC.loader.exec_module(codex_git_commit)
 
 
@@ -39,7 +46,11 @@ class ResolveModelNameTest(unittest.TestCase):
                     "resolve_codex_bin",
                     return_value="/usr/bin/codex",
                 ),
-                mock.patch.dict(codex_git_commit.os.environ, {}, clear=True),
+                mock.patch.dict(
+                    codex_git_commit.os.environ,
+                    {"CODEX_ROLLOUT_INDEX_DIR": directory},
+                    clear=True,
+                ),
             ):
                 got = codex_git_commit.resolve_model_name("thread-id")
 
@@ -70,7 +81,9 @@ class ResolveModelNameTest(unittest.TestCase):
         with tempfile.TemporaryDirectory() as directory:
             rollout_path = Path(directory) / "rollout.jsonl"
             rollout_path.write_text(
-                '{"type":"turn_context","payload":{"model":"gpt-old"}}\nnot-json\n',
+                '{"type":"turn_context","payload":{"model":"gpt-old"}}\n'
+                '{"type":"turn_context","payload":\n'
+                '{"type":"event_msg","payload":{}}\n',
                 encoding="utf-8",
             )
 
@@ -83,15 +96,206 @@ class ResolveModelNameTest(unittest.TestCase):
         client.request.return_value = SimpleNamespace(thread=SimpleNamespace(path=None))
 
         with (
+            tempfile.TemporaryDirectory() as directory,
             mock.patch.object(codex_git_commit, "CodexClient", return_value=client),
             mock.patch.object(
                 codex_git_commit, "resolve_codex_bin", return_value="/usr/bin/codex"
             ),
-            mock.patch.dict(codex_git_commit.os.environ, {}, clear=True),
+            mock.patch.dict(
+                codex_git_commit.os.environ,
+                {"CODEX_ROLLOUT_INDEX_DIR": directory},
+                clear=True,
+            ),
             self.assertRaisesRegex(RuntimeError, "does not have a rollout path"),
         ):
             codex_git_commit.resolve_model_name("thread-id")
 
+    def test_uses_running_broker_without_starting_app_server(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            rollout_path = Path(directory) / "rollout.jsonl"
+            rollout_path.write_text(
+                '{"type":"turn_context","payload":{"model":"gpt-broker"}}\n',
+                encoding="utf-8",
+            )
+            socket_path = Path(directory) / "broker.sock"
+            requests: list[dict[str, object]] = []
+
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+                server.bind(str(socket_path))
+                server.listen(1)
+
+                def serve() -> None:
+                    conn, _ = server.accept()
+                    with conn, conn.makefile("rwb") as stream:
+                        requests.append(json.loads(stream.readline()))
+                        reply = {"result": {"thread": {"path": str(rollout_path)}}}
+                        stream.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+                worker = threading.Thread(target=serve)
+                worker.start()
+                with (
+                    mock.patch.object(codex_git_commit, "CodexClient") as client_class,
+                    mock.patch.object(
+                        codex_git_commit,
+                        "resolve_codex_bin",
+                        return_value="/usr/bin/codex",
+                    ),
+                    mock.patch.dict(
+                        codex_git_commit.os.environ,
+                        {
+                            "CODEX_APP_SERVER_BROKER_SOCKET": str(socket_path),
+                            "CODEX_ROLLOUT_INDEX_DIR": directory,
+                        },
+                        clear=True,
+                    ),
+                ):
+                    got = codex_git_commit.resolve_model_name("thread-id")
+                worker.join()
+
+        self.assertEqual(got, "gpt-broker")
+        client_class.assert_not_called()
+        self.assertEqual(
+            requests,
+            [
+                {
+                    "method": "thread/read",
+                    "params": {"threadId": "thread-id", "includeTurns": False},
+                }
+            ],
+        )
+
+    def test_reverse_reader_spans_blocks_and_stops_at_last_match(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            rollout_path = Path(directory) / "rollout.jsonl"
+            filler = '{"type":"event_msg","payload":{"text":"%s"}}\n' % ("x" * 50)
+            rollout_path.write_text(
+                '{"type":"turn_context","payload":{"model":"gpt-old"}}\n'
+                + filler * 20
+                + '{"type":"turn_context","payload":{"model":"gpt-new"}}\n'
+                + filler * 20,
+                encoding="utf-8",
+            )
+
+            with (
+                mock.patch.object(codex_git_commit, "ROLLOUT_BLOCK_SIZE", 37),
+                mock.patch.object(
+                    codex_git_commit.json, "loads", wraps=json.loads
+                ) as loads,
+            ):
+                got = codex_git_commit.read_latest_model_name(rollout_path)
+
+        self.assertEqual(got, "gpt-new")
+        loads.assert_called_once()
+
+    def test_missing_broker_module_is_reported(self) -> None:
+        stderr = io.StringIO()
+        with (
+            tempfile.TemporaryDirectory() as directory,
+            mock.patch.object(
+                codex_git_commit,
+                "BROKER_MODULE_PATH",
+                Path(directory) / "codex_broker.py",
+            ),
+            mock.patch.dict(codex_git_commit.os.environ, {}, clear=True),
+            contextlib.redirect_stderr(stderr),
+        ):
+            module = codex_git_commit.load_broker_module()
+
+        self.assertIsNone(module)
+        self.assertIn("codex-session-reader", stderr.getvalue())
+
+    def test_index_skips_app_server_and_scans_only_appended_lines(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            rollout_path = Path(directory) / "rollout.jsonl"
+            first_line = '{"type":"turn_context","payload":{"model":"gpt-old"}}\n'
+            event_line = '{"type":"event_msg","payload":{}}\n'
+            new_line = '{"type":"turn_context","payload":{"model":"gpt-new"}}\n'
+            rollout_path.write_text(first_line + event_line[:19], "utf-8")
+
+            client = mock.MagicMock()
+            client.__enter__.return_value = client
+            client.request.return_value = SimpleNamespace(
+                thread=SimpleNamespace(path=str(rollout_path))
+            )
+            index_dir = Path(directory) / "index"
+
+            with (
+                mock.patch.object(codex_git_commit, "CodexClient", return_value=client),
+                mock.patch.object(
+                    codex_git_commit,
+                    "resolve_codex_bin",
+                    return_value="/usr/bin/codex",
+                ),
+                mock.patch.dict(
+                    codex_git_commit.os.environ,
+                    {"CODEX_ROLLOUT_INDEX_DIR": str(index_dir)},
+                    clear=True,
+                ),
+            ):
+                first = codex_git_commit.resolve_model_name("thread-id")
+                with rollout_path.open("a", encoding="utf-8") as rollout:
+                    rollout.write(event_line[19:] + new_line)
+                with mock.patch.object(
+                    codex_git_commit.json, "loads", wraps=json.loads
+                ) as loads:
+                    second = codex_git_commit.resolve_model_name("thread-id")
+
+            index = codex_git_commit.RolloutIndex.load(index_dir, "thread-id")
+
+        self.assertEqual((first, second), ("gpt-old", "gpt-new"))
+        client.request.assert_called_once()
+        parsed_lines = [
+            call.args[0]
+            for call in loads.call_args_list
+            if isinstance(call.args[0], bytes)
+        ]
+        self.assertEqual(parsed_lines, [new_line.encode("utf-8")])
+        self.assertEqual(
+            index.scanned_offset, len(first_line) + len(event_line) + len(new_line)
+        )
+        self.assertEqual(index.model_name(), "gpt-new")
+
+    def test_index_seeds_from_tail_and_skips_superseded_malformed_context(
+        self,
+    ) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            rollout_path = Path(directory) / "rollout.jsonl"
+            filler = '{"type":"event_msg","payload":{}}\n'
+            broken_line = '{"type":"turn_context","payload":\n'
+            rollout_path.write_text(
+                broken_line
+                + '{"type":"turn_context","payload":{"model":"gpt-old"}}\n'
+                + filler * 50
+                + '{"type":"turn_context","payload":{"model":"gpt-new"}}\n'
+                + filler,
+                encoding="utf-8",
+            )
+            index = codex_git_commit.RolloutIndex(thread_id="thread-id")
+
+            with mock.patch.object(
+                codex_git_commit.json, "loads", wraps=json.loads
+            ) as loads:
+                index.refresh(rollout_path)
+
+            self.assertEqual(index.model_name(), "gpt-new")
+            loads.assert_called_once()
+            self.assertEqual(index.scanned_offset, rollout_path.stat().st_size)
+
+            with rollout_path.open("a", encoding="utf-8") as rollout:
+                rollout.write(
+                    broken_line
+                    + '{"type":"turn_context","payload":{"model":"gpt-next"}}\n'
+                )
+            index.refresh(rollout_path)
+            self.assertEqual(index.model_name(), "gpt-next")
+
+            with rollout_path.open("a", encoding="utf-8") as rollout:
+                rollout.write(broken_line)
+            with self.assertRaisesRegex(
+                RuntimeError, "invalid rollout JSON at line 57"
+            ):
+                index.refresh(rollout_path)
+
 
 if __name__ == "__main__":
     unittest.main()